@@ -0,0 +1,59 @@
+"""Scaffolding shared by the benchmark scripts (run them as `python benchmarks/<name>.py`)
+
+Every benchmark runs mvw against a throwaway home, so the real config,
+library and posters are never touched, and imports mvw from this checkout.
+"""
+import argparse
+import contextlib
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def mvw_env(home) -> dict:
+    """HOME and the XDG dirs mvw reads, all inside `home`"""
+    return {
+        "HOME": str(home),
+        "XDG_CONFIG_HOME": str(Path(home) / ".config"),
+        "XDG_DATA_HOME": str(Path(home) / ".local" / "share"),
+    }
+
+
+def use_home(home):
+    """Point this process at `home` and import mvw from this checkout (also for worker processes)"""
+    os.environ.update(mvw_env(home))
+    if str(ROOT) not in sys.path:
+        sys.path.insert(0, str(ROOT))
+
+
+@contextlib.contextmanager
+def temporary_home(prefix: str = "mvw-"):
+    """A throwaway home this process uses until the block ends, yields its Path"""
+    with tempfile.TemporaryDirectory(prefix=prefix) as home:
+        use_home(home)
+        yield Path(home)
+
+
+def subprocess_env(home, **extra) -> dict:
+    """Environment of an mvw subprocess using `home` and this checkout"""
+    return {**os.environ, **mvw_env(home), "PYTHONPATH": str(ROOT), **extra}
+
+
+def argument_parser(doc: str) -> argparse.ArgumentParser:
+    """Parser described by the first line of the script's docstring"""
+    return argparse.ArgumentParser(description=doc.splitlines()[0])
+
+
+def timed(step, runs: int = 1):
+    """(result of the last run, median milliseconds over `runs` runs)"""
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = step()
+        times.append((time.perf_counter() - start) * 1000)
+    return result, statistics.median(times)
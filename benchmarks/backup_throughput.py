@@ -0,0 +1,80 @@
+"""Throughput of `mvw export` / `mvw restore` on a synthetic library
+
+Seeds a database with generated movies, exports it to JSONL and CSV,
+restores each export into a fresh database and prints rows per second and
+the peak memory of every step. Fails when an export does not keep its
+memory flat or a restore loses rows.
+
+    python benchmarks/backup_throughput.py                 # 100k rows
+    python benchmarks/backup_throughput.py --rows 20000
+"""
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+from _env import argument_parser, temporary_home
+
+# Peak memory of a streaming export that is still considered flat
+EXPORT_BUDGET_KB = 1024
+
+
+def seed(conn, rows: int):
+    conn.executemany(
+        "INSERT INTO movies (imdbid, title, year, runtime, genre, director, actors, plot, imdbrating, "
+        "imdbvotes, boxoffice, poster_local_path, star, review) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        (
+            (
+                f"tt{i:07d}", f"Movie {i}", str(1950 + i % 75), f"{90 + i % 60} min", "Drama, Sci-Fi",
+                "Jane Doe", "Actor A, Actor B, Actor C", "plot " * 40, (i % 100) / 10, f"{i:,}",
+                f"${i * 1000:,}", "N/A", str(i % 6), "review " * 80,
+            )
+            for i in range(rows)
+        ),
+    )
+    conn.commit()
+
+
+def measure(step):
+    """(result, seconds, peak memory in KB)"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = step()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak / 1024
+
+
+def main():
+    parser = argument_parser(__doc__)
+    parser.add_argument("--rows", type=int, default=100000, help="rows in the seeded database")
+    options = parser.parse_args()
+
+    with temporary_home("mvw-backup-") as home:
+        from mvw.backup import export_movies, restore_movies
+        from mvw.database import DatabaseManager
+
+        source = DatabaseManager(Path(home) / "source.db")
+        seed(source.conn, options.rows)
+
+        failed = False
+        print(f"{'step':<16} {'rows':>8} {'rows/s':>10} {'peak (KB)':>10}  result")
+        for format in ("jsonl", "csv"):
+            export_path = str(Path(home) / f"export.{format}")
+            count, elapsed, peak_kb = measure(lambda: export_movies(source, export_path, format))
+            flat = peak_kb <= EXPORT_BUDGET_KB
+            failed |= not flat
+            print(f"{'export ' + format:<16} {count:>8} {count / elapsed:>10.0f} {peak_kb:>10.0f}  {'ok' if flat else 'NOT FLAT'}")
+
+            target = DatabaseManager(Path(home) / f"restore_{format}.db")
+            count, elapsed, peak_kb = measure(lambda: restore_movies(target, export_path, format))
+            complete = target.conn.execute("SELECT COUNT(*) FROM movies").fetchone()[0] == options.rows
+            failed |= not complete
+            print(f"{'restore ' + format:<16} {count:>8} {count / elapsed:>10.0f} {peak_kb:>10.0f}  {'ok' if complete else 'MISSING ROWS'}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Concurrent preview readers against one writer
+
+Starts one writer process that keeps storing reviews (like `mvw` saving a
+movie) and N reader processes that each open a fresh read-only
+DatabaseManager per lookup (like the `mvw preview` processes fzf spawns).
+Fails when any process hits `database is locked` or another SQLite error.
+
+    python benchmarks/db_stress.py                    # 8 readers for 5 seconds
+    python benchmarks/db_stress.py --readers 32 --seconds 10
+"""
+import multiprocessing
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+from _env import argument_parser, temporary_home, use_home
+
+MOVIE_KEYS = (
+    "title", "year", "rated", "released", "runtime", "genre", "director", "writer",
+    "actors", "plot", "language", "country", "awards", "poster", "metascore",
+    "imdbrating", "imdbvotes", "imdbid", "type", "dvd", "boxoffice", "production", "website",
+)
+
+
+def make_movie(i: int) -> dict:
+    movie = {key: "N/A" for key in MOVIE_KEYS}
+    movie.update({"title": f"Movie {i}", "year": "2010", "imdbrating": 7.5, "imdbid": f"tt{i:07d}"})
+    return movie
+
+
+def writer(home: str, db_path: str, rows: int, deadline: float, results):
+    use_home(home)
+    from mvw import database
+
+    # The manager reports its database errors through moai, count them instead
+    errors = []
+    database.moai.says = lambda message, type=None, **kwargs: type == "error" and errors.append(message)
+    manager = database.DatabaseManager(db_path)
+    writes = 0
+    i = 0
+    while time.time() < deadline:
+        movie = make_movie(i % rows)
+        manager.store_movie_metadata(movie, "N/A", star=i % 6, review=f"review {i}")
+        manager.update_star_review(movie["imdbid"], (i + 1) % 6, f"edited review {i}" * 50)
+        writes += 2
+        i += 1
+    results.put(("writer", writes, len(errors), 0.0))
+
+
+def reader(home: str, db_path: str, rows: int, deadline: float, results):
+    use_home(home)
+    from mvw.database import DatabaseManager
+
+    reads = errors = 0
+    slowest = 0.0
+    i = 0
+    while time.time() < deadline:
+        start = time.perf_counter()
+        try:
+            manager = DatabaseManager(db_path, read_only=True)
+            row = manager.get_movie_metadata_by_title(f"movie {i % rows}")
+            if row is None:
+                raise sqlite3.Error("row is missing")
+            manager.close_db()
+            reads += 1
+        except sqlite3.Error:
+            errors += 1
+        slowest = max(slowest, time.perf_counter() - start)
+        i += 1
+    results.put(("reader", reads, errors, slowest))
+
+
+def main():
+    parser = argument_parser(__doc__)
+    parser.add_argument("--readers", type=int, default=8, help="parallel preview readers")
+    parser.add_argument("--seconds", type=float, default=5, help="how long to run")
+    parser.add_argument("--rows", type=int, default=1000, help="rows in the seeded database")
+    options = parser.parse_args()
+
+    with temporary_home("mvw-stress-") as home:
+        home = str(home)
+        from mvw import database
+
+        database.moai.says = lambda *args, **kwargs: None
+        db_path = str(Path(home) / "stress.db")
+        manager = database.DatabaseManager(db_path)
+        for i in range(options.rows):
+            manager.store_movie_metadata(make_movie(i), "N/A", star=0, review="")
+        manager.close_db()
+
+        results = multiprocessing.Queue()
+        deadline = time.time() + options.seconds
+        processes = [multiprocessing.Process(target=writer, args=(home, db_path, options.rows, deadline, results))]
+        processes += [
+            multiprocessing.Process(target=reader, args=(home, db_path, options.rows, deadline, results))
+            for _ in range(options.readers)
+        ]
+        for process in processes:
+            process.start()
+        outcomes = [results.get() for _ in processes]
+        for process in processes:
+            process.join()
+
+    reads = sum(count for role, count, _, _ in outcomes if role == "reader")
+    writes = sum(count for role, count, _, _ in outcomes if role == "writer")
+    errors = sum(error for _, _, error, _ in outcomes)
+    slowest = max(slow for _, _, _, slow in outcomes)
+    print(f"readers: {options.readers}  reads: {reads}  writes: {writes}  errors: {errors}")
+    print(f"reads/s: {reads / options.seconds:.0f}  slowest read: {slowest * 1000:.1f} ms")
+    sys.exit(1 if errors else 0)
+
+
+if __name__ == "__main__":
+    main()
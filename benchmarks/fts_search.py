@@ -0,0 +1,88 @@
+"""Full-text search latency on a large library
+
+Seeds a database with generated reviews through DatabaseManager (so the
+triggers fill the FTS index) and times `search_movies` for a few queries.
+Fails when a query goes over its budget.
+
+    python benchmarks/fts_search.py                  # 100k rows, 50 ms budget
+    python benchmarks/fts_search.py --rows 20000 --budget 20
+"""
+import random
+import sys
+import time
+from pathlib import Path
+
+from _env import argument_parser, temporary_home, timed
+
+# Generated words with a Zipf-like frequency, the real words sit in the middle of it
+FILLER = [f"w{i}" for i in range(20000)]
+WORDS = (
+    "score soundtrack dream heist desert space memory war love family robot city night "
+    "ocean winter revenge detective music silence storm island train prison ghost"
+).split()
+VOCABULARY = FILLER[:100] + WORDS + FILLER[100:]
+DIRECTORS = ("Denis Villeneuve", "Christopher Nolan", "Greta Gerwig", "Bong Joon Ho", "Hayao Miyazaki")
+QUERIES = ("villeneuve", "score", "dream heist", "christopher nol", "ocean storm ghost")
+
+
+def seed(conn, rows: int):
+    rng = random.Random(42)
+    cum_weights = []
+    total = 0.0
+    for rank in range(len(VOCABULARY)):
+        total += 1 / (rank + 1)
+        cum_weights.append(total)
+
+    def text(k: int) -> str:
+        return " ".join(rng.choices(VOCABULARY, cum_weights=cum_weights, k=k))
+
+    conn.executemany(
+        "INSERT INTO movies (imdbid, title, year, plot, review, actors, director, writer, genre, star) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        (
+            (
+                f"tt{i:07d}",
+                f"Movie {i}",
+                str(1950 + i % 75),
+                text(25),
+                text(60),
+                "Actor A, Actor B",
+                rng.choice(DIRECTORS),
+                "Writer W",
+                "Drama, Sci-Fi",
+                str(i % 6),
+            )
+            for i in range(rows)
+        ),
+    )
+    conn.commit()
+
+
+def main():
+    parser = argument_parser(__doc__)
+    parser.add_argument("--rows", type=int, default=100000, help="rows in the seeded database")
+    parser.add_argument("--budget", type=float, default=50, help="budget per query in ms")
+    options = parser.parse_args()
+
+    with temporary_home("mvw-fts-") as home:
+        from mvw.database import DatabaseManager
+
+        db_path = Path(home) / "fts.db"
+        start = time.perf_counter()
+        seed(DatabaseManager(db_path).conn, options.rows)
+        print(f"seeded {options.rows} rows in {time.perf_counter() - start:.1f} s")
+
+        database = DatabaseManager(db_path, read_only=True)
+        failed = False
+        print(f"{'query':<20} {'hits':>5} {'time (ms)':>10}  result")
+        for query in QUERIES:
+            hits, elapsed_ms = timed(lambda: database.search_movies(query))
+            over = elapsed_ms > options.budget
+            failed |= over
+            print(f"{query:<20} {len(hits):>5} {elapsed_ms:>10.2f}  {'OVER' if over else 'ok'}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Full build and one-edit rebuild of the `mvw export-cards` gallery
+
+Seeds a library whose movies share a few posters, builds the gallery, edits
+one review and builds it again. Fails when the rebuild renders anything but
+the edited card or takes longer than the budget.
+
+    python benchmarks/gallery_rebuild.py               # 500 movies
+    python benchmarks/gallery_rebuild.py --rows 5000   # the full build takes a while
+"""
+import sys
+from pathlib import Path
+
+from _env import argument_parser, temporary_home, timed
+
+# Seconds a rebuild after one edit may take
+REBUILD_BUDGET_S = 5.0
+POSTERS = 8
+
+
+def make_posters(poster_dir: Path) -> list:
+    from PIL import Image
+
+    files = []
+    for index in range(POSTERS):
+        image = Image.new("RGB", (300, 450))
+        image.putdata([((x + index * 30) % 256, (x * y) % 256, y % 256) for y in range(450) for x in range(300)])
+        file_path = poster_dir / f"benchmark_{index}.png"
+        image.save(file_path)
+        files.append(str(file_path))
+    return files
+
+
+def seed(conn, rows: int, posters: list):
+    conn.executemany(
+        "INSERT INTO movies (imdbid, title, year, rated, released, runtime, genre, director, language, "
+        "awards, imdbrating, imdbvotes, boxoffice, poster_local_path, star, review) "
+        "VALUES (?, ?, ?, 'PG-13', '01 Jan 2000', '120 min', 'Drama', 'Jane Doe', 'English', "
+        "'Won 1 Oscar. 3 wins & 5 nominations total', '7.5', '10,000', '$1,000,000', ?, ?, ?)",
+        (
+            (f"tt{i:07d}", f"Movie {i}", str(1950 + i % 75), posters[i % len(posters)], str(i % 6), "review " * 30)
+            for i in range(rows)
+        ),
+    )
+    conn.commit()
+
+
+def main():
+    parser = argument_parser(__doc__)
+    parser.add_argument("--rows", type=int, default=500, help="movies in the seeded library")
+    parser.add_argument("--workers", type=int, default=None, help="processes (default: CPU count)")
+    options = parser.parse_args()
+
+    with temporary_home("mvw-gallery-") as home:
+        from mvw.database import DatabaseManager
+        from mvw.gallery import export_cards
+        from mvw.path import PathManager
+
+        database = DatabaseManager()
+        seed(database.conn, options.rows, make_posters(PathManager().poster_dir))
+        out_dir = Path(home) / "cards"
+
+        print(f"{'build':<10} {'rendered':>9} {'unchanged':>10} {'seconds':>8}")
+        results = {}
+        for label in ("full", "one edit"):
+            if label == "one edit":
+                database.update_star_review("tt0000000", 5, "edited")
+            counts, elapsed_ms = timed(lambda: export_cards(database, out_dir, workers=options.workers))
+            results[label] = (counts, elapsed_ms / 1000)
+            print(f"{label:<10} {counts['rendered']:>9} {counts['unchanged']:>10} {results[label][1]:>8.2f}")
+
+    counts, seconds = results["one edit"]
+    sys.exit(0 if counts["rendered"] == 1 and seconds <= REBUILD_BUDGET_S else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""Cold-start budget for the `mvw` subcommands
+
+Runs every subcommand in a fresh interpreter with `python -X importtime`,
+sums the import time spent after interpreter startup and fails when a
+subcommand goes over its budget or imports a library it should not need.
+
+    python benchmarks/importtime.py            # check the budgets
+    python benchmarks/importtime.py --scale 2  # slower machine, double the budgets
+    python benchmarks/importtime.py --top 10   # also show the slowest imports
+"""
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from _env import ROOT, argument_parser, subprocess_env
+
+# Run with an api key in the config, the others would search OMDb with one
+WITH_API_KEY = {"config+key"}
+
+HEAVY = {"numpy", "PIL", "requests", "bs4", "rich_pixels", "asciify", "iterfzf", "cv2"}
+
+# (label, arguments, budget in ms, libraries that must not be imported)
+SUBCOMMANDS = [
+    ("--help", ["--help"], 250, HEAVY),
+    ("config", ["config"], 250, HEAVY),
+    ("config+key", ["config"], 250, HEAVY),
+    ("preview", ["preview", "-i", "tt0000000"], 300, HEAVY),
+    ("delete", ["delete"], 250, HEAVY),
+    ("poster", ["poster"], 250, HEAVY),
+    ("interactive", ["interactive", "Inception"], 300, HEAVY - {"iterfzf"}),
+]
+
+
+def parse_importtime(stderr: str):
+    """Return [(self_us, cumulative_us, module)] for imports done after interpreter startup"""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        entries.append((int(self_us), int(cumulative_us), name.rstrip()))
+
+    # Everything up to the top level `site` import is interpreter startup
+    for index, (_, _, name) in enumerate(entries):
+        if name == " site":
+            entries = entries[index + 1:]
+            break
+
+    return [(self_us, cumulative_us, name.strip()) for self_us, cumulative_us, name in entries]
+
+
+def set_api_key(config_home: Path, api_key: str):
+    """Write (or clear) the api key of the temporary user.conf"""
+    conf_path = config_home / "mvw" / "user.conf"
+    conf_path.parent.mkdir(parents=True, exist_ok=True)
+    conf_path.write_text(f"[API]\nomdb_api_key = {api_key}\n" if api_key else "")
+
+
+def measure(args: list, env: dict):
+    command = [
+        sys.executable,
+        "-X",
+        "importtime",
+        "-c",
+        "from mvw.main import app; app(prog_name='mvw')",
+        *args,
+    ]
+    result = subprocess.run(
+        command,
+        cwd=ROOT,
+        env=env,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    return parse_importtime(result.stderr)
+
+
+def main():
+    parser = argument_parser(__doc__)
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply every budget")
+    parser.add_argument("--runs", type=int, default=3, help="Runs per subcommand (best one counts)")
+    parser.add_argument("--top", type=int, default=0, help="Show the N slowest imports")
+    options = parser.parse_args()
+
+    failed = False
+    with tempfile.TemporaryDirectory() as home:
+        # Only the subcommands use the home, the importtime of this process must stay clean
+        env = subprocess_env(home, COLUMNS="100")
+
+        print(f"{'subcommand':<12} {'imports':>8} {'time (ms)':>10} {'budget':>8}  result")
+        for label, args, budget_ms, forbidden in SUBCOMMANDS:
+            set_api_key(Path(env["XDG_CONFIG_HOME"]), "benchmark" if label in WITH_API_KEY else "")
+            best = None
+            for _ in range(options.runs):
+                entries = measure(args, env)
+                total_ms = sum(self_us for self_us, _, _ in entries) / 1000
+                if best is None or total_ms < best[0]:
+                    best = (total_ms, entries)
+
+            total_ms, entries = best
+            budget = budget_ms * options.scale
+            loaded = {name.split(".")[0] for _, _, name in entries}
+            unexpected = sorted(loaded & forbidden)
+
+            problems = []
+            if total_ms > budget:
+                problems.append("over budget")
+            if unexpected:
+                problems.append(f"imports {', '.join(unexpected)}")
+            failed = failed or bool(problems)
+
+            result = "; ".join(problems) if problems else "ok"
+            print(f"{label:<12} {len(entries):>8} {total_ms:>10.1f} {budget:>8.0f}  {result}")
+
+            if options.top:
+                for self_us, _, name in sorted(entries, reverse=True)[: options.top]:
+                    print(f"{'':<12} {self_us / 1000:>8.1f} ms  {name}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
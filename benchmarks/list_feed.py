@@ -0,0 +1,74 @@
+"""Memory and time to first line of the `mvw list` feed
+
+Seeds a database with long reviews and compares the streaming projection
+(`iter_movie_list`, what `mvw list` feeds fzf) with loading every row
+(`get_all_movies`). Fails when the feed's peak memory grows with the library.
+
+    python benchmarks/list_feed.py                 # 100k rows
+    python benchmarks/list_feed.py --rows 20000
+"""
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+from _env import argument_parser, temporary_home
+
+# Peak memory of the feed that is still considered flat
+FEED_BUDGET_KB = 512
+
+
+def seed(conn, rows: int):
+    conn.executemany(
+        "INSERT INTO movies (imdbid, title, year, star, plot, review) VALUES (?, ?, ?, ?, ?, ?)",
+        (
+            (f"tt{i:07d}", f"Movie {i}", str(1950 + i % 75), str(i % 6), "plot " * 60, "review " * 200)
+            for i in range(rows)
+        ),
+    )
+    conn.commit()
+
+
+def measure(feed):
+    """(time to the first item in ms, total time in ms, peak memory in KB, items)"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    items = iter(feed())
+    first = next(items, None)
+    first_ms = (time.perf_counter() - start) * 1000
+    count = 0 if first is None else 1
+    for _ in items:
+        count += 1
+    total_ms = (time.perf_counter() - start) * 1000
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return first_ms, total_ms, peak / 1024, count
+
+
+def main():
+    parser = argument_parser(__doc__)
+    parser.add_argument("--rows", type=int, default=100000, help="rows in the seeded database")
+    options = parser.parse_args()
+
+    with temporary_home("mvw-list-") as home:
+        from mvw.database import DatabaseManager
+
+        db_path = Path(home) / "list.db"
+        seed(DatabaseManager(db_path).conn, options.rows)
+        database = DatabaseManager(db_path, read_only=True)
+
+        print(f"{'feed':<16} {'rows':>7} {'first (ms)':>11} {'total (ms)':>11} {'peak (KB)':>10}")
+        results = {}
+        for label, feed in (
+            ("iter_movie_list", database.iter_movie_list),
+            ("get_all_movies", database.get_all_movies),
+        ):
+            results[label] = measure(feed)
+            first_ms, total_ms, peak_kb, count = results[label]
+            print(f"{label:<16} {count:>7} {first_ms:>11.2f} {total_ms:>11.1f} {peak_kb:>10.0f}")
+
+    sys.exit(0 if results["iter_movie_list"][2] <= FEED_BUDGET_KB else 1)
+
+
+if __name__ == "__main__":
+    main()
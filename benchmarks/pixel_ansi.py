@@ -0,0 +1,129 @@
+"""Bytes and time of the pixel renderer's ANSI output
+
+Renders generated posters with the old emission (an escape pair for every
+cell, parsed back with Text.from_ansi and printed through a console) and
+with the run-length one (`lines_ansi`), then prints the bytes written, the
+emission time and the time of reading the output back into Segments (what a
+render cache hit costs: Text.from_ansi before, `read_ansi` now). Fails when
+the run-length output at tolerance 0 does not look the same cell for cell, or
+is bigger than the old one.
+
+    python benchmarks/pixel_ansi.py                    # widths 25 40 60
+    python benchmarks/pixel_ansi.py --widths 25 --runs 20
+"""
+import io
+import sys
+
+from _env import argument_parser, temporary_home, timed
+
+TOLERANCES = (0, 4, 8, 16)
+
+
+def make_posters() -> dict:
+    """A smooth gradient and a noisy photo-like poster"""
+    from PIL import Image, ImageFilter
+
+    gradient = Image.new("RGB", (300, 450))
+    gradient.putdata([(x % 256, (x * y) % 256, y % 256) for y in range(450) for x in range(300)])
+    noise = Image.merge(
+        "RGB", [Image.effect_noise((300, 450), sigma).filter(ImageFilter.GaussianBlur(2)) for sigma in (40, 60, 80)]
+    )
+    return {"gradient": gradient, "photo": noise}
+
+
+def quadrants(image, width: int):
+    """Quadrant arrays of the poster at a width, sized like PixelRenderer does"""
+    import numpy as np
+    from mvw.renderers.pixel import quadrant_blocks
+
+    height = int(width * 2 / (image.width / image.height * 2.3)) // 2 * 2
+    arr = np.array(image.convert("RGBA").resize((width * 2, height)), dtype=np.float32)
+    return quadrant_blocks(arr)
+
+
+def legacy_ansi(q_vals, fgs, bgs, num_opaque, width: int) -> str:
+    """The emission before run-length runs: every cell writes its colors"""
+    from rich.console import Console
+    from rich.text import Text
+    from mvw.renderers.pixel import QUADRANTS
+
+    output_lines = []
+    for q_row, fg_row, bg_row, opaque_row in zip(q_vals.tolist(), fgs.tolist(), bgs.tolist(), num_opaque.tolist()):
+        line_parts = []
+        for q_val, fg, bg, opaque in zip(q_row, fg_row, bg_row, opaque_row):
+            if opaque == 0:
+                line_parts.append("\033[49m ")
+            elif opaque < 4:
+                line_parts.append(f"\033[38;2;{fg[0]};{fg[1]};{fg[2]}m\033[49m{QUADRANTS[q_val]}")
+            else:
+                line_parts.append(
+                    f"\033[38;2;{fg[0]};{fg[1]};{fg[2]}m\033[48;2;{bg[0]};{bg[1]};{bg[2]}m{QUADRANTS[q_val]}"
+                )
+        line_parts.append("\033[0m")
+        output_lines.append("".join(line_parts))
+
+    console = Console(file=io.StringIO(), force_terminal=True, color_system="truecolor", legacy_windows=False, width=width)
+    with console.capture() as capture:
+        console.print(Text.from_ansi("\n".join(output_lines)))
+    return capture.get().rstrip("\n")
+
+
+def cells(ansi: str) -> list:
+    """(glyph, background, foreground of drawn glyphs) of every cell"""
+    from rich.console import Console
+    from rich.text import Text
+
+    console = Console(width=200)
+    rows = []
+    for line in Text.from_ansi(ansi).split("\n"):
+        row = []
+        for segment in line.render(console):
+            style = segment.style
+            for char in segment.text:
+                bg = None if style is None or style.bgcolor is None or style.bgcolor.is_default else style.bgcolor.triplet
+                fg = None if char == " " or style is None or style.color is None else style.color.triplet
+                row.append((char, bg, fg))
+        rows.append(row)
+    return rows
+
+
+def main():
+    parser = argument_parser(__doc__)
+    parser.add_argument("--widths", type=int, nargs="+", default=[25, 40, 60], help="poster widths in cells")
+    parser.add_argument("--runs", type=int, default=10, help="runs of each emission")
+    options = parser.parse_args()
+
+    with temporary_home("mvw-pixel-"):
+        from rich.console import Console
+        from rich.text import Text
+        from mvw.renderers.pixel import poster_lines
+        from mvw.renderers.runs import lines_ansi, read_ansi
+
+        console = Console(file=io.StringIO(), force_terminal=True, color_system="truecolor", width=200)
+        failed = False
+        print(f"{'poster':<10} {'width':>5} {'tolerance':>9} {'bytes':>8} {'saved':>6} {'emit (ms)':>10} {'read (ms)':>10}  result")
+        for name, image in make_posters().items():
+            for width in options.widths:
+                blocks = quadrants(image, width)
+                legacy, emit_ms = timed(lambda: legacy_ansi(*blocks, width), options.runs)
+                _, parse_ms = timed(lambda: list(console.render(Text.from_ansi(legacy))), options.runs)
+                print(f"{name:<10} {width:>5} {'old':>9} {len(legacy.encode()):>8} {'':>6} {emit_ms:>10.2f} {parse_ms:>10.2f}")
+
+                for tolerance in TOLERANCES:
+                    ansi, emit_ms = timed(lambda: lines_ansi(poster_lines(*blocks, tolerance)), options.runs)
+                    _, parse_ms = timed(lambda: list(console.render(read_ansi(ansi))), options.runs)
+                    size = len(ansi.encode())
+                    result = ""
+                    if tolerance == 0:
+                        same = cells(ansi) == cells(legacy)
+                        smaller = size <= len(legacy.encode())
+                        failed |= not (same and smaller)
+                        result = "ok" if same and smaller else ("DIFFERENT CELLS" if not same else "BIGGER")
+                    saved = 1 - size / len(legacy.encode())
+                    print(f"{'':<10} {'':>5} {tolerance:>9} {size:>8} {saved:>6.0%} {emit_ms:>10.2f} {parse_ms:>10.2f}  {result}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
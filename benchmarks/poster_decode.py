@@ -0,0 +1,73 @@
+"""Time of rendering a poster from its thumbnail levels instead of the original
+
+Generates an ordinary poster (300x450) and a huge photo (4000x6000 JPEG),
+then times, for every poster width, the old preparation (decode the whole
+original, enhance it, resize) against the pixel renderer reading the
+nearest stored level. The levels are built once first, that time is
+printed too. Fails when rendering from the levels is not faster.
+
+    python benchmarks/poster_decode.py                  # widths 25 30 40
+    python benchmarks/poster_decode.py --widths 25 --runs 10
+"""
+import sys
+from pathlib import Path
+
+from _env import argument_parser, temporary_home, timed
+
+POSTERS = {"ordinary": (300, 450), "huge": (4000, 6000)}
+
+
+def make_poster(file_path: Path, size: tuple):
+    from PIL import Image, ImageFilter
+
+    small = Image.merge(
+        "RGB", [Image.effect_noise((300, 450), sigma).filter(ImageFilter.GaussianBlur(2)) for sigma in (40, 60, 80)]
+    )
+    small.resize(size).save(file_path, quality=92)
+
+
+def full_decode(poster_path: Path, width: int):
+    """What every render did before the levels: the original decoded and enhanced, then resized"""
+    from PIL import Image
+    from mvw.thumbnails import enhance
+
+    with Image.open(poster_path) as image:
+        image = enhance(image.convert("RGBA"))
+    height = int(width * 2 / (image.width / image.height * 2.3)) // 2 * 2
+    return image.resize((width * 2, height), Image.Resampling.LANCZOS)
+
+
+def main():
+    parser = argument_parser(__doc__)
+    parser.add_argument("--widths", type=int, nargs="+", default=[25, 30, 40], help="poster widths in cells")
+    parser.add_argument("--runs", type=int, default=5, help="runs of each way")
+    options = parser.parse_args()
+
+    with temporary_home("mvw-decode-") as home:
+        from mvw.renderers.pixel import PixelRenderer
+        from mvw.thumbnails import ThumbnailStore
+
+        thumbnail_store = ThumbnailStore()
+        failed = False
+        print(f"{'poster':<10} {'width':>5} {'original (ms)':>14} {'levels (ms)':>12} {'speedup':>8}  result")
+        for name, size in POSTERS.items():
+            poster_path = Path(home) / f"{name}.jpg"
+            make_poster(poster_path, size)
+            _, build_ms = timed(lambda: thumbnail_store.build(poster_path))
+            print(f"{name:<10} {'build':>5} {build_ms:>14.1f}")
+
+            for width in options.widths:
+                _, original_ms = timed(lambda: full_decode(poster_path, width), options.runs)
+                _, levels_ms = timed(lambda: PixelRenderer(poster_path, width).to_ansi(), options.runs)
+                faster = levels_ms < original_ms
+                failed |= not faster
+                print(
+                    f"{'':<10} {width:>5} {original_ms:>14.1f} {levels_ms:>12.1f} {original_ms / levels_ms:>7.1f}x"
+                    f"  {'ok' if faster else 'SLOWER'}"
+                )
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
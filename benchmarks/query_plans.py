@@ -0,0 +1,94 @@
+"""Query plan check for the movies table
+
+Runs the title-based and filtered DatabaseManager methods against a seeded database,
+captures the SQL they execute and fails when `EXPLAIN QUERY PLAN` shows a
+full scan of `movies` for any of them (or for the sort and filter queries).
+
+    python benchmarks/query_plans.py          # check the plans
+    python benchmarks/query_plans.py --rows 100000 --show
+"""
+import sys
+from pathlib import Path
+
+from _env import argument_parser, temporary_home, timed
+
+# Sort and filter queries that must be served by an index
+QUERIES = [
+    ("order by star", "SELECT imdbid FROM movies ORDER BY star DESC", ()),
+    ("filter by year", "SELECT imdbid FROM movies WHERE year = ?", ("2010",)),
+    ("order by imdbrating", "SELECT imdbid FROM movies ORDER BY imdbrating DESC LIMIT 10", ()),
+]
+
+
+def seed(conn, rows: int):
+    """Fill the movies table with generated rows"""
+    conn.executemany(
+        "INSERT INTO movies (imdbid, title, year, imdbrating, star, review) VALUES (?, ?, ?, ?, ?, ?)",
+        (
+            (f"tt{i:07d}", f"Movie {i}", str(1950 + i % 75), (i % 100) / 10, str(i % 6), "")
+            for i in range(rows)
+        ),
+    )
+    conn.commit()
+
+
+def query_plan(conn, sql: str, parameters=()) -> list:
+    return [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", parameters)]
+
+
+def is_scan(plan: list) -> bool:
+    """A full table scan (a SCAN over an index is fine, it is used for ordering)"""
+    return any(step.startswith("SCAN movies") and "INDEX" not in step for step in plan)
+
+
+def main():
+    parser = argument_parser(__doc__)
+    parser.add_argument("--rows", type=int, default=10000, help="rows in the seeded database")
+    parser.add_argument("--show", action="store_true", help="print every query plan")
+    options = parser.parse_args()
+
+    with temporary_home("mvw-plans-") as home:
+        from mvw.database import DatabaseManager
+
+        database = DatabaseManager(Path(home) / "plans.db")
+        seed(database.conn, options.rows)
+        database.conn.execute("ANALYZE")
+
+        # Record what the methods really run
+        statements = []
+        database.conn.set_trace_callback(statements.append)
+        calls = [
+            ("get_movie_metadata_by_title", lambda: database.get_movie_metadata_by_title("movie 42")),
+            ("set_key_value(use_title=True)", lambda: database.set_key_value("MOVIE 42", "poster_local_path", "x", use_title=True)),
+            ("delete_movie_entry_by_title", lambda: database.delete_movie_entry_by_title("Movie 42")),
+            ("list --genre --min-star", lambda: list(database.iter_movie_list(genre="drama", min_star=4))),
+            ("list --director --year", lambda: list(database.iter_movie_list(director="denis villeneuve", year="2010"))),
+            ("list --actor", lambda: list(database.iter_movie_list(actor="Actor 7"))),
+        ]
+        checks = []
+        for label, call in calls:
+            statements.clear()
+            _, elapsed_ms = timed(call)
+            sql = next(s for s in statements if "movies" in s and not s.startswith("DELETE FROM movie_"))
+            checks.append((label, query_plan(database.conn, sql), elapsed_ms))
+        database.conn.set_trace_callback(None)
+
+        for label, sql, parameters in QUERIES:
+            _, elapsed_ms = timed(lambda: database.conn.execute(sql, parameters).fetchall())
+            checks.append((label, query_plan(database.conn, sql, parameters), elapsed_ms))
+
+        failed = False
+        print(f"{'query':<32} {'time (ms)':>10}  result")
+        for label, plan, elapsed_ms in checks:
+            scan = is_scan(plan)
+            failed |= scan
+            print(f"{label:<32} {elapsed_ms:>10.2f}  {'SCAN' if scan else 'ok'}")
+            if options.show or scan:
+                for step in plan:
+                    print(f"    {step}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Time of saving a review card as SVG
+
+Seeds a reviewed movie with a poster, then times `save_display_movie_info`
+(rendered in-process) against a `mvw preview` subprocess, which is what the
+screenshot used to start before re-parsing its ANSI output. Fails when
+saving in-process is not faster than the preview alone.
+
+    python benchmarks/screenshot.py              # 5 runs each
+    python benchmarks/screenshot.py --runs 10
+"""
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from _env import argument_parser, subprocess_env, temporary_home, timed
+
+MOVIE = {
+    "imdbid": "tt1375666", "title": "Inception", "year": "2010", "rated": "PG-13",
+    "released": "16 Jul 2010", "runtime": "148 min", "genre": "Action, Adventure, Sci-Fi",
+    "director": "Christopher Nolan", "writer": "Christopher Nolan", "actors": "Leonardo DiCaprio",
+    "plot": "A thief who steals corporate secrets.", "language": "English, Japanese, French",
+    "country": "United States, United Kingdom", "awards": "Won 4 Oscars. 159 wins & 220 nominations total",
+    "metascore": "74", "imdbrating": "8.8", "imdbvotes": "2,600,000", "type": "movie",
+    "boxoffice": "$292,587,330", "poster": "N/A", "dvd": "N/A", "production": "N/A", "website": "N/A",
+}
+
+
+def make_poster(file_path: Path):
+    from PIL import Image
+
+    image = Image.new("RGB", (300, 450))
+    image.putdata([(x % 256, (x * y) % 256, y % 256) for y in range(450) for x in range(300)])
+    image.save(file_path)
+
+
+def main():
+    parser = argument_parser(__doc__)
+    parser.add_argument("--runs", type=int, default=5, help="runs of each way")
+    options = parser.parse_args()
+
+    with temporary_home("mvw-screenshot-") as home:
+        os.environ["COLUMNS"] = "100"
+        env = subprocess_env(home)
+        from mvw.database import DatabaseManager
+        from mvw.display import DisplayManager
+        from mvw.path import PathManager
+
+        poster_file = PathManager().poster_dir / "benchmark.png"
+        make_poster(poster_file)
+        database = DatabaseManager()
+        database.store_movie_metadata(MOVIE, str(poster_file), star=4.5, review="A dream within a dream. " * 8)
+        movie = database.get_movie_metadata_by_imdbid(MOVIE["imdbid"])
+
+        _, in_process_ms = timed(
+            lambda: DisplayManager(movie, movie["poster_local_path"]).save_display_movie_info(), options.runs
+        )
+
+        command = [sys.executable, "-c", "from mvw.main import app; app(prog_name='mvw')", "preview", "-t", MOVIE["title"]]
+        _, preview_ms = timed(lambda: subprocess.run(command, env=env, capture_output=True, check=True), options.runs)
+
+    print(f"{'way':<22} {'median (ms)':>12}")
+    print(f"{'in-process save':<22} {in_process_ms:>12.1f}")
+    print(f"{'mvw preview subprocess':<22} {preview_ms:>12.1f}")
+    sys.exit(0 if in_process_ms < preview_ms else 1)
+
+
+if __name__ == "__main__":
+    main()
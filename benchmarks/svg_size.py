@@ -0,0 +1,87 @@
+"""Size of a review card SVG: rich's save_svg against the run-merged writer
+
+Renders the card of a movie with a photo-like poster (pixel renderer) and
+writes it with rich's `Console.save_svg`, with `CardSVG`, and with `CardSVG`
+embedding the poster as an image. Prints the bytes, SVG elements and write
+time of each. Fails when the merged SVGs are not smaller than rich's.
+
+    python benchmarks/svg_size.py
+    python benchmarks/svg_size.py --poster-width 40
+"""
+import os
+import re
+import sys
+from pathlib import Path
+
+from _env import argument_parser, temporary_home, timed
+
+MOVIE = {
+    "imdbid": "tt1375666", "title": "Inception", "year": "2010", "rated": "PG-13",
+    "released": "16 Jul 2010", "runtime": "148 min", "genre": "Action, Adventure, Sci-Fi",
+    "director": "Christopher Nolan", "language": "English, Japanese, French",
+    "awards": "Won 4 Oscars. 159 wins & 220 nominations total", "imdbrating": "8.8",
+    "imdbvotes": "2,600,000", "boxoffice": "$292,587,330", "star": "4.5",
+    "review": "A dream within a dream. " * 8,
+}
+
+
+def make_poster(file_path: Path):
+    from PIL import Image
+
+    image = Image.new("RGB", (300, 450))
+    image.putdata([(x % 256, (x * y) % 256, y % 256) for y in range(450) for x in range(300)])
+    image.save(file_path, quality=90)
+
+
+def main():
+    parser = argument_parser(__doc__)
+    parser.add_argument("--poster-width", type=int, default=25, help="poster width in cells")
+    options = parser.parse_args()
+
+    with temporary_home("mvw-svg-") as home:
+        from mvw.config import ConfigManager
+
+        ConfigManager().set_config("UI", "poster_width", str(options.poster_width))
+        from rich.console import Console
+        from rich.segment import Segments
+
+        from mvw.display import SVG_CODE_FORMAT, DisplayManager, console, palette
+        from mvw.svg import CardSVG
+
+        poster_file = Path(home) / "poster.jpg"
+        make_poster(poster_file)
+        display_manager = DisplayManager(MOVIE, str(poster_file))
+
+        def rich_svg(svg_path: Path):
+            lines = console.render_lines(display_manager.movie_card(MOVIE["star"], MOVIE["review"], 100), console.options.update_width(100), pad=False, new_lines=True)
+            recording_console = Console(file=open(os.devnull, "w"), force_terminal=True, soft_wrap=True, color_system="truecolor", record=True, width=100)
+            recording_console.line()
+            for line in lines:
+                recording_console.print(Segments(line), end="")
+            recording_console.line()
+            recording_console.save_svg(str(svg_path), title="MVW (MoVie revieW) 🗿", theme=palette.theme, code_format=SVG_CODE_FORMAT)
+
+        writers = (
+            ("rich save_svg", rich_svg),
+            ("CardSVG", lambda svg_path: display_manager.save_svg(svg_path, 100, echo=False)),
+            ("CardSVG embedded", lambda svg_path: display_manager.save_svg(svg_path, 100, echo=False, embed_poster=True)),
+        )
+        # Warm the render cache so only the SVG writing differs
+        rich_svg(Path(home) / "warm.svg")
+
+        print(f"{'writer':<18} {'bytes':>9} {'elements':>9} {'ms':>7}")
+        sizes = {}
+        for label, write in writers:
+            svg_path = Path(home) / f"{label}.svg"
+            _, elapsed_ms = timed(lambda: write(svg_path))
+            svg = svg_path.read_text(encoding="utf-8")
+            sizes[label] = len(svg.encode())
+            elements = len(re.findall(r"<(?:rect|text|image)\b", svg))
+            print(f"{label:<18} {sizes[label]:>9} {elements:>9} {elapsed_ms:>7.1f}")
+
+    smaller = sizes["CardSVG"] < sizes["rich save_svg"] and sizes["CardSVG embedded"] < sizes["CardSVG"]
+    sys.exit(0 if smaller else 1)
+
+
+if __name__ == "__main__":
+    main()
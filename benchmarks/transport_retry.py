@@ -0,0 +1,143 @@
+"""Retries, backoff and timeouts of mvw/transport.py against a local server
+
+Starts a stand-in HTTP server on 127.0.0.1 that answers 503 and 429 a given
+number of times, always fails, or answers slowly, then sends every case
+through `transport.get` (the shared session). For each case it prints the
+requests the server saw, the status or error mvw got back and the elapsed
+time. Fails when the request count does not follow RETRIES, when the wait
+is shorter than the backoff (or the Retry-After) asks for, or when the
+timeouts are not applied.
+
+    python benchmarks/transport_retry.py
+    python benchmarks/transport_retry.py --read-timeout 0.5
+"""
+import sys
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from _env import argument_parser, temporary_home
+
+hits = Counter()
+hits_lock = threading.Lock()
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """/fail/<status>/<case>?times=n fails n times (every time without it), /slow/<case>?seconds=s answers late"""
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        with hits_lock:
+            hits[url.path] += 1
+            count = hits[url.path]
+
+        if url.path.startswith("/slow"):
+            time.sleep(float(query.get("seconds", 0)))
+            self.answer(200)
+        elif url.path.startswith("/fail/"):
+            times = int(query.get("times", 1 << 30))
+            if count > times:
+                self.answer(200)
+            else:
+                headers = {"Retry-After": query["retry_after"]} if "retry_after" in query else {}
+                self.answer(int(url.path.split("/")[2]), headers)
+        else:
+            self.answer(200)
+
+    def answer(self, status: int, headers: dict = {}):
+        body = b"ok" if status == 200 else b"stand-in failure"
+        try:
+            self.send_response(status)
+            for key, value in headers.items():
+                self.send_header(key, value)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            # The client gave up on a slow answer
+            pass
+
+    def log_message(self, format, *args):
+        pass
+
+
+def backoff(retries: int, factor: float) -> float:
+    """Seconds urllib3 sleeps over `retries` retries (the first one is immediate)"""
+    return sum(factor * 2 ** (attempt - 1) for attempt in range(2, retries + 1))
+
+
+def main():
+    parser = argument_parser(__doc__)
+    parser.add_argument("--read-timeout", type=float, default=0.5, help="read timeout of the slow cases in seconds")
+    options = parser.parse_args()
+
+    with temporary_home("mvw-transport-"):
+        import requests
+        from mvw import transport
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base = f"http://127.0.0.1:{server.server_port}"
+
+        retries, factor = transport.RETRIES, transport.BACKOFF_FACTOR
+        read_timeout = options.read_timeout
+        # (label, path, get kwargs, expected requests, expected result, minimum seconds, maximum seconds)
+        cases = [
+            ("503 once", "/fail/503/once?times=1", {}, 2, 200, 0, 1),
+            ("503 twice", "/fail/503/twice?times=2", {}, 3, 200, backoff(2, factor), backoff(2, factor) + 1),
+            ("502 always", "/fail/502/always", {}, retries + 1, 502, backoff(retries, factor), backoff(retries, factor) + 1),
+            ("429 + Retry-After", "/fail/429/after?times=1&retry_after=1", {}, 2, 200, 1, 2),
+            ("404 (no retry)", "/fail/404/missing", {}, 1, 404, 0, 1),
+            # The default TIMEOUT lets an answer slower than this read timeout through, without retries
+            ("slow < TIMEOUT", f"/slow/default?seconds={read_timeout * 2}", {}, 1, 200, read_timeout * 2, read_timeout * 2 + 1),
+            (
+                "slow > read timeout",
+                f"/slow/late?seconds={read_timeout * 4}",
+                {"timeout": (transport.TIMEOUT[0], read_timeout)},
+                retries + 1,
+                "ReadTimeout",
+                (retries + 1) * read_timeout + backoff(retries, factor),
+                (retries + 1) * read_timeout + backoff(retries, factor) + 1,
+            ),
+        ]
+
+        failed = read_timeout * 2 >= transport.TIMEOUT[1]
+        if failed:
+            print(f"--read-timeout must be under half of the read TIMEOUT ({transport.TIMEOUT[1]}s)")
+        print(f"TIMEOUT {transport.TIMEOUT}, RETRIES {retries}, BACKOFF_FACTOR {factor}")
+        print(f"{'case':<20} {'requests':>8} {'expected':>8} {'result':>12} {'time (s)':>9} {'expected (s)':>13}  check")
+        for label, case_path, kwargs, expected_hits, expected_result, low, high in cases:
+            start = time.perf_counter()
+            try:
+                result = transport.get(base + case_path, **kwargs).status_code
+            except requests.exceptions.ConnectionError as e:
+                # requests reports a read timeout hit on every retry as a ConnectionError
+                result = "ReadTimeout" if "Read timed out" in str(e) else type(e).__name__
+            except requests.exceptions.Timeout:
+                result = "ReadTimeout"
+            elapsed = time.perf_counter() - start
+
+            seen = hits[urlsplit(case_path).path]
+            problems = []
+            if seen != expected_hits:
+                problems.append("REQUESTS")
+            if result != expected_result:
+                problems.append("RESULT")
+            if not low <= elapsed <= high:
+                problems.append("TIME")
+            failed |= bool(problems)
+            print(
+                f"{label:<20} {seen:>8} {expected_hits:>8} {str(result):>12} {elapsed:>9.2f} {f'{low:.1f}-{high:.1f}':>13}"
+                f"  {' '.join(problems) or 'ok'}"
+            )
+
+        server.shutdown()
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,54 @@
-import requests
 import re
-import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from . import transport
 from .moai import Moai
 
 moai = Moai()
 
+OMDB_URL = 'http://www.omdbapi.com/'
+
+class MovieNotFound(Exception):
+    """OMDb answered, but without a movie (the message is the OMDb error)"""
+
 class API:
-    def __init__(self, api_key: str) -> None:
+    def __init__(self, api_key: str, omdb_url: str = OMDB_URL, cache=None, offline: bool = False, limiter=None, budget=None, priority: str = "interactive") -> None:
         self.api_key: str = api_key
-        self.search_movies: dict = {}
         self.selected_movie: dict = {}
-        self.omdb_url = 'http://www.omdbapi.com/'
+        self.omdb_url = omdb_url
+        # Optional ResponseCache, in offline mode only cached responses are used
+        self.cache = cache
+        self.offline = offline
+        # Optional transport.RateLimiter, only requests that reach the network use it
+        self.limiter = limiter
+        # Optional quota.QuotaBudget, the daily requests of the key shared with other processes
+        self.budget = budget
+        self.priority = priority
+
+    def request(self, endpoint: str, parameters: dict) -> dict:
+        """Call OMDb, answering from the response cache when possible"""
+        if self.cache:
+            cached = self.cache.get(endpoint, parameters, offline=self.offline)
+            if cached is not None:
+                return cached
+
+        if self.offline:
+            return {'Response': 'False', 'Error': 'Offline mode, and this request is not cached'}
+
+        if self.budget:
+            self.budget.acquire(self.priority)
+        if self.limiter:
+            self.limiter.acquire()
+        result = transport.get(self.omdb_url, params=parameters).json()
+
+        if self.budget and result.get('Error') == 'Request limit reached!':
+            # Used elsewhere (another machine, the website..), stop asking until tomorrow
+            self.budget.exhaust()
+
+        # Only successful responses are cached
+        if self.cache and result.get('Response') == 'True':
+            self.cache.set(endpoint, parameters, result)
+        return result
 
     def fetch_movie_metadata(self, imdbid:str, plot=None, silent=False):
         """Get all the data movie"""
@@ -20,7 +58,7 @@ class API:
             'r': 'json',
             'apikey': self.api_key
         }
-        result = requests.get(self.omdb_url, params=parameters).json()
+        result = self.request('title', parameters)
 
         if result.pop('Response') == 'False':
             if not silent:
@@ -34,8 +72,28 @@ class API:
 
         return self.selected_movie
 
-    def search_movie(self, title):
-        """Search and return any movies that may relate to the title"""
+    def lookup_movie(self, imdbid: str = "", title: str = "", year: str = "", plot=None) -> dict:
+        """Metadata of a movie by imdbid or by title (and year), with lowercase keys
+
+        Unlike fetch_movie_metadata it returns a new dict, so threads can share the API.
+        """
+        parameters = {'plot': plot, 'r': 'json', 'apikey': self.api_key}
+        if imdbid:
+            parameters['i'] = imdbid
+        else:
+            parameters.update({'t': title, 'y': year, 'type': 'movie'})
+        result = self.request('title', parameters)
+
+        if result.get('Response') == 'False':
+            raise MovieNotFound(result.get('Error', 'Movie not found!'))
+        return {key.lower(): value for key, value in result.items() if key != 'Response'}
+
+    def search_movie(self, title, max_pages: int = 5, prefetch: int = 2):
+        """Search and yield any movies that may relate to the title
+
+        OMDb returns 10 results per page, the next `prefetch` pages are
+        requested in the background while the current one is consumed.
+        """
         # NOTE:
         # "* [cyan]movie[/]         [dim]# standard[/]\n"
         # "* [cyan]imdbid[/]        [dim]# include 'tt'[/]"
@@ -54,28 +112,82 @@ class API:
             parameters['s'] = title
 
         try:
-            result = requests.get(self.omdb_url, params=parameters).json()
+            result = self.request('title' if is_imdb else 'search', parameters)
+        except transport.QuotaExhausted:
+            self.search_error('Request limit reached!')
+            return
         except Exception as e:
             moai.says(f"[indian_red]x Sorry, Connection error: ({e}) occured[/]", type="error")
-            return self.search_movies
+            return
 
         if result.get('Response') == 'False':
-            if str(result['Error']) == "Too many results.":
-                moai.says(
-                    f"[yellow]x Ermm.. actually there many movies with similar names.[/]\n"
-                    "             [dim]Try search with imdbid:[/] [yellow]tt..[/]",
-                    type="nerd"
-                )
-            else:
-                moai.says(f"[indian_red]x Sorry, API error: ({result['Error']}) occured\n[dim]This should not happen, up an issue to the dev[/]", type="error")
-            os.abort()
+            self.search_error(str(result['Error']))
+            return
 
-        for key, value in result.items():
-            key = key.lower()
-            setattr(self, key, value)
-            self.search_movies[key] = value
+        if is_imdb:
+            yield {'Title': result['Title'], 'Year': result['Year'], 'imdbID': result['imdbID']}
+            return
 
-        return self.search_movies
+        total_pages = -(-int(result.get('totalResults', 0)) // 10)
+        last_page = min(total_pages, max_pages)
+
+        def fetch_page(page: int) -> dict:
+            return self.request('search', {**parameters, 'page': page})
+
+        executor = ThreadPoolExecutor(max_workers=max(1, prefetch))
+        try:
+            # Start on the next pages before handing out the first one
+            pending = deque()
+            next_page = 2
+            while next_page <= last_page and len(pending) < prefetch:
+                pending.append(executor.submit(fetch_page, next_page))
+                next_page += 1
+
+            yield from result.get('Search', [])
+
+            while pending:
+                try:
+                    result = pending.popleft().result()
+                except Exception:
+                    # Keep the results we already have
+                    break
+
+                if result.get('Response') == 'False':
+                    break
+
+                if next_page <= last_page:
+                    pending.append(executor.submit(fetch_page, next_page))
+                    next_page += 1
+
+                yield from result.get('Search', [])
+        finally:
+            # The user may pick a movie before every page arrives
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def search_error(self, error: str):
+        """Explain why the search did not return any movie"""
+        if error == "Too many results.":
+            moai.says(
+                f"[yellow]x Ermm.. actually there many movies with similar names.[/]\n"
+                "             [dim]Try search with imdbid:[/] [yellow]tt..[/]",
+                type="nerd"
+            )
+        elif error == "Movie not found!":
+            moai.says(
+                f"[indian_red]x Sorry, The movie could not be found![/]\n"
+                "          [dim]Try use imdbid:[/] [yellow]tt..[/]\n\n"
+                "If still not found..  [dim]v--search here--v[/]\n"
+                "      [underline sky_blue2]https://www.omdb.org/en/us/search[/]",
+                type="error"
+            )
+        elif error == "Request limit reached!":
+            moai.says(
+                f"[yellow]x Ermm.. actually today's OMDb requests are all used up.[/]\n"
+                "             [dim]Cached movies still work, the rest tomorrow (UTC)[/]",
+                type="nerd"
+            )
+        else:
+            moai.says(f"[indian_red]x Sorry, API error: ({error}) occured\n[dim]This should not happen, up an issue to the dev[/]", type="error")
 
 if __name__ == "__main__":
     from .config import ConfigManager
@@ -84,8 +196,7 @@ if __name__ == "__main__":
 
     from iterfzf import iterfzf
 
-    results = api.search_movie("up")
-    movies = results.get('search', [])
+    movies = api.search_movie("up")
 
     movie_map = {f"{m['Title']} ({m['Year']})": m['imdbID'] for m in movies}
 
@@ -0,0 +1,126 @@
+import csv
+import json
+import sys
+import tarfile
+from pathlib import Path
+from typing import Optional
+
+from .database import MOVIE_COLUMNS
+from .path import PathManager
+
+path = PathManager()
+
+FORMATS = ("jsonl", "csv")
+RESTORE_BATCH_SIZE = 1000
+POSTER_ARCHIVE_DIR = "posters"
+
+
+def detect_format(file_path: str, format: Optional[str] = None) -> str:
+    """The format asked for, or the one of the file extension"""
+    if format:
+        return format
+    suffix = Path(file_path).suffix.lower().lstrip(".")
+    return suffix if suffix in FORMATS else "jsonl"
+
+
+def export_movies(database, out_path: str, format: str, poster_archive: Optional[str] = None) -> int:
+    """Stream every movie to JSONL or CSV ("-" is stdout), returns how many were written
+
+    Memory stays flat: the rows come one by one from the cursor, and every
+    poster is written into the optional tar archive as its row goes by.
+    """
+    out = sys.stdout if out_path == "-" else open(out_path, "w", newline="", encoding="utf-8")
+    archive = tarfile.open(poster_archive, "w") if poster_archive else None
+    archived = set()
+    count = 0
+    try:
+        if format == "csv":
+            writer = csv.DictWriter(out, fieldnames=MOVIE_COLUMNS)
+            writer.writeheader()
+            write = writer.writerow
+        else:
+            def write(row):
+                out.write(json.dumps(row, ensure_ascii=False))
+                out.write("\n")
+
+        for movie in database.iter_movies():
+            write(movie)
+            count += 1
+
+            poster_file = Path(movie["poster_local_path"] or "N/A")
+            if archive and poster_file.name not in archived and poster_file.is_file():
+                archive.add(poster_file, arcname=f"{POSTER_ARCHIVE_DIR}/{poster_file.name}")
+                archived.add(poster_file.name)
+    finally:
+        if archive:
+            archive.close()
+        if out is not sys.stdout:
+            out.close()
+    return count
+
+
+def read_export(in_path: str, format: str):
+    """Yield the exported rows back as dicts of MOVIE_COLUMNS"""
+    with open(in_path, newline="", encoding="utf-8") as f:
+        if format == "csv":
+            for row in csv.DictReader(f):
+                # Only a missing column is NULL, an empty review or plot stays empty
+                movie = {column: row.get(column) for column in MOVIE_COLUMNS}
+                # CSV has no NULL, an unrated movie's star was written as an empty string. It is
+                # NULL again like in a JSONL restore, the card shows a dash for it
+                movie["star"] = movie["star"] or None
+                yield movie
+        else:
+            for line in f:
+                if line.strip():
+                    row = json.loads(line)
+                    yield {column: row.get(column) for column in MOVIE_COLUMNS}
+
+
+def extract_posters(poster_archive: str) -> int:
+    """Unpack the posters of an export archive into the posters dir"""
+    count = 0
+    with tarfile.open(poster_archive) as archive:
+        for member in archive:
+            if not member.isfile():
+                continue
+            # Only the file name is trusted, never the path inside the archive
+            target = path.poster_dir / Path(member.name).name
+            source = archive.extractfile(member)
+            if source is None:
+                continue
+            with source, open(target, "wb") as f:
+                for chunk in iter(lambda: source.read(1 << 16), b""):
+                    f.write(chunk)
+            count += 1
+    return count
+
+
+def local_poster_path(poster_local_path: Optional[str]) -> Optional[str]:
+    """Point the poster to the posters dir of this machine when the old path is gone"""
+    if not poster_local_path or poster_local_path == "N/A" or Path(poster_local_path).exists():
+        return poster_local_path
+    local = path.poster_dir / Path(poster_local_path).name
+    return str(local.resolve()) if local.exists() else poster_local_path
+
+
+def restore_movies(database, in_path: str, format: str, poster_archive: Optional[str] = None, batch_size: int = RESTORE_BATCH_SIZE) -> int:
+    """Bulk-load an export (batched upserts), returns how many movies were restored"""
+    if poster_archive:
+        extract_posters(poster_archive)
+
+    batch = []
+    count = 0
+    for row in read_export(in_path, format):
+        if not row["imdbid"]:
+            continue
+        row["poster_local_path"] = local_poster_path(row["poster_local_path"])
+        batch.append(row)
+        if len(batch) >= batch_size:
+            database.restore_movies(batch)
+            count += len(batch)
+            batch.clear()
+    if batch:
+        database.restore_movies(batch)
+        count += len(batch)
+    return count
@@ -0,0 +1,226 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+from .path import PathManager
+
+path = PathManager()
+
+# Bump when the renderers change their output so old entries are ignored
+CACHE_VERSION = "3"
+MAX_CACHE_SIZE = 64 * 1024 * 1024  # 64 MB
+MAX_MEMORY_ENTRIES = 256  # Kept warm in long running processes (preview daemon)
+
+INIT_RESPONSE_TABLES = '''
+        CREATE TABLE IF NOT EXISTS responses (
+            key TEXT PRIMARY KEY,
+            endpoint TEXT,
+            response TEXT,
+            fetched_at REAL
+        );
+        CREATE TABLE IF NOT EXISTS stats (
+            endpoint TEXT PRIMARY KEY,
+            hits INTEGER DEFAULT 0,
+            misses INTEGER DEFAULT 0
+        );
+    '''
+
+
+class RenderCache:
+    """Keep the rendered ANSI of posters on disk so previews skip decoding images"""
+
+    def __init__(self, cache_dir: Path = path.render_cache_dir, max_size: int = MAX_CACHE_SIZE) -> None:
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        self.memory = OrderedDict()
+
+    def make_key(self, image_path: Path, render: str, width: int, charset: str = "", settings: str = "") -> str:
+        """Build the cache key from the poster content and everything that affects the output"""
+        digest = hashlib.blake2b(digest_size=20)
+        with open(image_path, "rb") as f:
+            for chunk in iter(lambda: f.read(65536), b""):
+                digest.update(chunk)
+
+        digest.update(f"|{CACHE_VERSION}|{render}|{width}|{charset}|{settings}".encode())
+        return digest.hexdigest()
+
+    def get(self, key: str):
+        """Return the cached ANSI output, or None if it is not cached"""
+        if key in self.memory:
+            self.memory.move_to_end(key)
+            return self.memory[key]
+
+        file_path = self.cache_dir / f"{key}.ansi"
+        try:
+            ansi = file_path.read_text(encoding="utf-8")
+        except OSError:
+            return None
+
+        # Mark as recently used for the LRU eviction
+        try:
+            os.utime(file_path)
+        except OSError:
+            pass
+        self.remember(key, ansi)
+        return ansi
+
+    def remember(self, key: str, ansi: str):
+        """Keep the ANSI output in memory, dropping the least recently used entry"""
+        self.memory[key] = ansi
+        self.memory.move_to_end(key)
+        if len(self.memory) > MAX_MEMORY_ENTRIES:
+            self.memory.popitem(last=False)
+
+    def set(self, key: str, ansi: str):
+        """Store the ANSI output, then evict the least recently used entries"""
+        self.remember(key, ansi)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        file_path = self.cache_dir / f"{key}.ansi"
+        tmp_path = self.cache_dir / f"{key}.{os.getpid()}.tmp"
+        try:
+            tmp_path.write_text(ansi, encoding="utf-8")
+            os.replace(tmp_path, file_path)
+        except OSError:
+            tmp_path.unlink(missing_ok=True)
+            return
+        self.evict()
+
+    def evict(self):
+        """Remove the least recently used entries until the cache fits in max_size"""
+        entries = []
+        total_size = 0
+        with os.scandir(self.cache_dir) as it:
+            for entry in it:
+                if not entry.name.endswith(".ansi"):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total_size += stat.st_size
+
+        if total_size <= self.max_size:
+            return
+
+        entries.sort()
+        for _, size, entry_path in entries:
+            try:
+                os.remove(entry_path)
+            except OSError:
+                continue
+            total_size -= size
+            if total_size <= self.max_size:
+                break
+
+
+class ResponseCache:
+    """Keep OMDb responses in SQLite so repeated lookups skip the network (and the daily quota)"""
+
+    def __init__(self, ttls: dict, db_path: Path = path.omdb_cache_path) -> None:
+        # Time to live in seconds for each endpoint (eg: {"search": 86400, "title": 604800})
+        self.ttls = ttls
+        self.db_path = db_path
+        self.conn = None
+        self.lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config_manager):
+        """Build the cache with the TTLs set in the CACHE section"""
+        search_ttl = config_manager.get_int("CACHE", "search_ttl_hours", 24) * 3600
+        title_ttl = config_manager.get_int("CACHE", "title_ttl_hours", 168) * 3600
+        return cls({"search": search_ttl, "title": title_ttl, "key_check": title_ttl})
+
+    def connect(self) -> sqlite3.Connection:
+        if self.conn is None:
+            self.conn = sqlite3.connect(self.db_path, timeout=5, check_same_thread=False)
+            self.conn.executescript(INIT_RESPONSE_TABLES)
+            self.conn.commit()
+        return self.conn
+
+    def make_key(self, endpoint: str, parameters: dict) -> str:
+        """Normalize the query parameters into a key, the api key is never part of it"""
+        normalized = {
+            name: " ".join(str(value).lower().split())
+            for name, value in parameters.items()
+            if name != "apikey" and value is not None
+        }
+        return f"{endpoint}:{json.dumps(normalized, sort_keys=True)}"
+
+    def get(self, endpoint: str, parameters: dict, offline: bool = False):
+        """Return the cached response, expired ones are only served in offline mode"""
+        key = self.make_key(endpoint, parameters)
+        with self.lock:
+            conn = self.connect()
+            row = conn.execute(
+                "SELECT response, fetched_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+
+            ttl = self.ttls.get(endpoint, 0)
+            fresh = row is not None and (offline or time.time() - row[1] <= ttl)
+            counter = "hits" if fresh else "misses"
+            conn.execute(
+                f"""
+                INSERT INTO stats (endpoint, {counter}) VALUES (?, 1)
+                ON CONFLICT(endpoint) DO UPDATE SET {counter} = {counter} + 1
+                """,
+                (endpoint,),
+            )
+            conn.commit()
+
+        return json.loads(row[0]) if fresh else None
+
+    def set(self, endpoint: str, parameters: dict, response: dict):
+        """Store the response of a successful request"""
+        key = self.make_key(endpoint, parameters)
+        with self.lock:
+            conn = self.connect()
+            conn.execute(
+                """
+                INSERT INTO responses (key, endpoint, response, fetched_at) VALUES (?, ?, ?, ?)
+                ON CONFLICT(key) DO UPDATE SET
+                    response=excluded.response,
+                    fetched_at=excluded.fetched_at
+                """,
+                (key, endpoint, json.dumps(response), time.time()),
+            )
+            conn.commit()
+
+    def evict(self, expired_only: bool = True) -> int:
+        """Remove the expired responses (or all of them), returns how many were removed"""
+        with self.lock:
+            conn = self.connect()
+            if expired_only:
+                removed = 0
+                now = time.time()
+                for endpoint, ttl in self.ttls.items():
+                    cursor = conn.execute(
+                        "DELETE FROM responses WHERE endpoint = ? AND fetched_at < ?",
+                        (endpoint, now - ttl),
+                    )
+                    removed += cursor.rowcount
+            else:
+                removed = conn.execute("DELETE FROM responses").rowcount
+                conn.execute("DELETE FROM stats")
+            conn.commit()
+        return removed
+
+    def stats(self) -> list:
+        """Entries, hits and misses of each endpoint"""
+        with self.lock:
+            conn = self.connect()
+            return conn.execute(
+                """
+                SELECT endpoint,
+                    (SELECT COUNT(*) FROM responses r WHERE r.endpoint = s.endpoint),
+                    hits,
+                    misses
+                FROM stats s
+                ORDER BY endpoint
+                """
+            ).fetchall()
@@ -0,0 +1,85 @@
+# Tiny fzf preview client that forwards requests to the preview daemon (`mvw daemon`).
+# Keep the imports light, it is started on every cursor move in fzf.
+import json
+import os
+import socket
+import sys
+from pathlib import Path
+
+from platformdirs import user_data_dir
+
+APP_NAME = "mvw"
+SOCKET_NAME = "preview.sock"
+USAGE = "Usage: mvw-preview (-i IMDBID | -t TITLE | -p POSTER [-t TITLE])"
+
+
+def socket_path() -> Path:
+    """Location of the preview daemon socket (inside the mvw data dir)"""
+    return Path(user_data_dir(APP_NAME)) / SOCKET_NAME
+
+
+def send_request(request: dict, timeout: float = 10.0):
+    """Send a single request to the daemon and yield the response in chunks"""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(timeout)
+        client.connect(str(socket_path()))
+        client.sendall(json.dumps(request).encode("utf-8") + b"\n")
+
+        while True:
+            chunk = client.recv(65536)
+            if not chunk:
+                break
+            yield chunk
+
+
+def parse_args(argv: list):
+    """Parse the `-i/--id`, `-t/--title` and `-p/--poster` options of `mvw preview(-poster)`"""
+    options = {"id": None, "title": None, "poster": None}
+    short_names = {"-i": "id", "-t": "title", "-p": "poster"}
+    args = iter(argv)
+    for arg in args:
+        if arg in short_names:
+            options[short_names[arg]] = next(args, None)
+        elif arg.startswith("--") and arg[2:] in options:
+            options[arg[2:]] = next(args, None)
+        elif arg.startswith("--") and "=" in arg and arg[2:].split("=", 1)[0] in options:
+            name, value = arg[2:].split("=", 1)
+            options[name] = value
+    return options["id"], options["title"], options["poster"]
+
+
+def main():
+    argv = sys.argv[1:]
+    imdbid, title, poster = parse_args(argv)
+    if poster is None and not (imdbid or title):
+        print(USAGE, file=sys.stderr)
+        sys.exit(2)
+
+    columns = os.environ.get("FZF_PREVIEW_COLUMNS") or os.environ.get("COLUMNS")
+    request = {
+        "command": "preview" if poster is None else "poster",
+        "imdbid": imdbid,
+        "title": title,
+        "poster": poster,
+        "columns": int(columns) if columns and columns.isdigit() else None,
+    }
+
+    if hasattr(socket, "AF_UNIX"):
+        received = False
+        try:
+            for chunk in send_request(request):
+                sys.stdout.buffer.write(chunk)
+                received = True
+            sys.stdout.flush()
+            return
+        except OSError:
+            if received:
+                return
+            # The daemon is not running, so fall back to the normal preview
+
+    command = "preview" if poster is None else "preview-poster"
+    os.execvp("mvw", ["mvw", command, *argv])
+
+
+if __name__ == "__main__":
+    main()
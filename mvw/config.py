@@ -1,9 +1,10 @@
 from pathlib import Path
 import configparser
+import os
+import threading
 from rich.console import Console
 from rich.table import Table
 from rich.box import ROUNDED
-from importlib.metadata import version, PackageNotFoundError
 
 from .moai import Moai
 from .path import PathManager
@@ -14,25 +15,61 @@ path = PathManager()
 
 
 class ConfigManager:
+    """Process-wide config service (every `ConfigManager()` returns the same instance)
+
+    The user.conf is parsed once and only re-read when its mtime changes,
+    and it is only written by `set_config` and `reset_to_default_config`.
+    """
+
+    _instance = None
+    _lock = threading.Lock()
+
+    def __new__(cls):
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = super().__new__(cls)
+                cls._instance._initialized = False
+        return cls._instance
+
     def __init__(self) -> None:
+        if self._initialized:
+            return
         self.config = configparser.ConfigParser()
         self.base_dir = Path(__file__).parent.parent
         self.user_file = path.user_conf_path
+        self.user_file_mtime = None
+        self.typed_values = {}
         self.load_configs()
-        self.save_user_config()
+        self._initialized = True
 
     def load_configs(self):
         """Loads defaults first, then overrides with user settings"""
+        self.config.clear()
+        self.typed_values.clear()
+
         # Fallback logic if default.conf is missing from the app folder
         self._set_hardcoded_defaults()
 
         # Overrides default config
-        if self.user_file.exists():
+        self.user_file_mtime = self._user_file_mtime()
+        if self.user_file_mtime is not None:
             self.config.read(self.user_file)
 
+    def _user_file_mtime(self):
+        try:
+            stat = self.user_file.stat()
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def reload_if_changed(self):
+        """Re-read user.conf only when another process changed it"""
+        if self._user_file_mtime() != self.user_file_mtime:
+            self.load_configs()
+
     def _set_hardcoded_defaults(self):
         """Fallback if default conf missing"""
-        self.config["API"] = {"omdb_api_key": ""}
+        self.config["API"] = {"omdb_api_key": "", "daily_limit": "1000"}
         self.config["USER"] = {"name": ""}
         self.config["UI"] = {
             "moai": "true",
@@ -43,30 +80,67 @@ class ConfigManager:
             "hide_key": "true",
             "render": "pixel",
             "charset": "minimal",
+            "color_tolerance": "0",
+        }
+        self.config["DATA"] = {"worldwide_boxoffice": "false", "search_max_pages": "5"}
+        self.config["CACHE"] = {
+            "offline": "false",
+            "search_ttl_hours": "24",
+            "title_ttl_hours": "168",
         }
-        self.config["DATA"] = {"worldwide_boxoffice": "false"}
 
     def save_user_config(self):
         """Saves only the current state to the user's config file"""
         self.user_file.parent.mkdir(parents=True, exist_ok=True)
-        with open(self.user_file, "w") as f:
+
+        # Write to a temporary file first so readers never see a half written config
+        tmp_file = self.user_file.with_name(f"{self.user_file.name}.{os.getpid()}.tmp")
+        with open(tmp_file, "w") as f:
             self.config.write(f)
+        os.replace(tmp_file, self.user_file)
+
+        self.user_file_mtime = self._user_file_mtime()
+        self.typed_values.clear()
 
     def get_config(self, section: str, key: str, fallback: str = ""):
         """Get the defined settings in the CONFIG_FILE"""
+        self.reload_if_changed()
         return self.config.get(section, key, fallback=fallback)
 
+    def get_bool(self, section: str, key: str, fallback: bool = False) -> bool:
+        """Get the settings as a boolean ("true" / "false")"""
+        self.reload_if_changed()
+        if (section, key) not in self.typed_values:
+            value = self.config.get(section, key, fallback="")
+            self.typed_values[(section, key)] = (
+                value.lower() == "true" if value else fallback
+            )
+        return self.typed_values[(section, key)]
+
+    def get_int(self, section: str, key: str, fallback: int = 0) -> int:
+        """Get the settings as a whole number"""
+        self.reload_if_changed()
+        if (section, key) not in self.typed_values:
+            try:
+                value = int(self.config.get(section, key, fallback=""))
+            except ValueError:
+                value = fallback
+            self.typed_values[(section, key)] = value
+        return self.typed_values[(section, key)]
+
     def reset_to_default_config(self):
         """Reset any changes made in user.conf"""
         preserved_data_omdb_api_key = self.get_config("API", "omdb_api_key")
+        preserved_data_daily_limit = self.get_config("API", "daily_limit", "1000")
         preserved_data_user_name = self.get_config("USER", "name")
 
         self.config.clear()
-        self.user_file.unlink()
-        self.load_configs()
+        self.typed_values.clear()
+        self._set_hardcoded_defaults()
 
-        self.set_config("API", "omdb_api_key", preserved_data_omdb_api_key)
-        self.set_config("USER", "name", preserved_data_user_name)
+        self.config.set("API", "omdb_api_key", preserved_data_omdb_api_key)
+        self.config.set("API", "daily_limit", preserved_data_daily_limit)
+        self.config.set("USER", "name", preserved_data_user_name)
         self.save_user_config()
         moai.says(
             f"[green]✓ Config [italic]defaulted[/italic] successfully[/]", type="fun"
@@ -74,6 +148,8 @@ class ConfigManager:
 
     def set_config(self, section: str, key: str, value: str = ""):
         """Update the config object and save it to the user.conf file"""
+        # Pick up changes made by other processes before writing
+        self.reload_if_changed()
 
         # Ensure the section exists before setting a value
         if not self.config.has_section(section):
@@ -91,7 +167,7 @@ class ConfigManager:
 
         show_key = False
 
-        if ConfigManager().get_config("UI", "hide_key").lower() == "true":
+        if self.get_bool("UI", "hide_key"):
             show_key = True
 
         # Iterate through the sections and keys
@@ -116,6 +192,8 @@ class ConfigManager:
         )
 
     def get_version(self):
+        from importlib.metadata import version, PackageNotFoundError
+
         try:
             return version("mvw")
         except PackageNotFoundError:
@@ -0,0 +1,146 @@
+import contextlib
+import io
+import json
+import os
+import socket
+import socketserver
+import subprocess
+import sys
+import threading
+
+from .client import socket_path, send_request
+
+
+class PreviewHandler(socketserver.StreamRequestHandler):
+    """Handle a single request sent by `mvw-preview`"""
+
+    def handle(self):
+        try:
+            request = json.loads(self.rfile.readline())
+        except ValueError:
+            return
+
+        if request.get("command") == "stop":
+            self.wfile.write(b"stopped\n")
+            # shutdown() waits for serve_forever(), so it cannot run in this thread
+            threading.Thread(target=self.server.shutdown).start()
+            return
+
+        if request.get("command") == "ping":
+            self.wfile.write(b"pong\n")
+            return
+
+        if request.get("command") == "poster":
+            output = render_poster_preview(
+                poster=request.get("poster") or "",
+                title=request.get("title") or "",
+                columns=request.get("columns"),
+            )
+        else:
+            output = render_preview(
+                imdbid=request.get("imdbid"),
+                title=request.get("title"),
+                columns=request.get("columns"),
+            )
+        try:
+            self.wfile.write(output.encode("utf-8"))
+        except (BrokenPipeError, ConnectionResetError):
+            # fzf killed the preview because the cursor moved on
+            pass
+
+
+def render_preview(imdbid=None, title=None, columns=None) -> str:
+    """Run `mvw preview` inside this process and return everything it printed"""
+    from . import main
+    from .display import console
+
+    if columns:
+        console.width = columns
+
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer):
+        try:
+            main.preview(poster_path="", imdbid=imdbid, title=title)
+        except Exception as e:
+            print(f"The terminal preview is not supported: {e}")
+    return buffer.getvalue()
+
+
+def render_poster_preview(poster: str, title: str, columns=None) -> str:
+    """Run `mvw preview-poster` inside this process and return everything it printed"""
+    from . import main
+    from .display import console
+
+    if columns:
+        console.width = columns
+
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer):
+        try:
+            main.preview_poster(poster=poster, title=title)
+        except Exception as e:
+            print(f"The terminal preview is not supported: {e}")
+    return buffer.getvalue()
+
+
+def is_running() -> bool:
+    """Check whether a daemon is answering on the socket"""
+    try:
+        return b"".join(send_request({"command": "ping"}, timeout=1.0)) == b"pong\n"
+    except OSError:
+        return False
+
+
+def serve():
+    """Serve previews until a stop request arrives (runs in the foreground)"""
+    sock_path = socket_path()
+    if is_running():
+        return
+
+    # Remove the socket left behind by a daemon that did not exit cleanly
+    sock_path.unlink(missing_ok=True)
+
+    # Warm up the database connection, palette and renderer before the first request
+    from . import main
+    from .display import config_manager
+    from .renderers import get_renderer
+
+    main.reader_database_manager.get_instance()
+    get_renderer(config_manager.get_config("UI", "render", "pixel"))
+
+    with socketserver.UnixStreamServer(str(sock_path), PreviewHandler) as server:
+        os.chmod(sock_path, 0o600)
+        try:
+            server.serve_forever()
+        finally:
+            sock_path.unlink(missing_ok=True)
+
+
+def start() -> bool:
+    """Start the daemon in the background, returns False if it was already running"""
+    if is_running():
+        return False
+
+    subprocess.Popen(
+        [sys.executable, "-m", "mvw.daemon"],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+    return True
+
+
+def stop() -> bool:
+    """Ask the running daemon to stop, returns False if it was not running"""
+    try:
+        b"".join(send_request({"command": "stop"}, timeout=1.0))
+        return True
+    except OSError:
+        return False
+
+
+if __name__ == "__main__":
+    if not hasattr(socket, "AF_UNIX"):
+        sys.exit("The preview daemon needs unix socket support")
+    serve()
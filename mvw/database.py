@@ -1,13 +1,15 @@
 import sqlite3
 import atexit
+import time
+from pathlib import Path
 
 from mvw.config import ConfigManager
 
-from .movie import MovieManager
+from .lazy import LazyInstance
 from .moai import Moai
 from .path import PathManager
 
-movie_manager = MovieManager()
+movie_manager = LazyInstance("mvw.movie:MovieManager")
 moai = Moai()
 path = PathManager()
 
@@ -42,66 +44,468 @@ INIT_TABLE = '''
         );
     '''
 
+def parse_number(value, number_type=int):
+    """Number in an OMDb string ("148 min", "$292,576,195", "2,512,367"), None for N/A"""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return number_type(value)
+    text = "".join(c for c in str(value).split(" ")[0] if c.isdigit() or c == ".")
+    try:
+        return number_type(text)
+    except ValueError:
+        return None
+
+# Typed copies of the TEXT columns so they can be sorted, filtered and summed in SQL
+NUMERIC_COLUMNS = {
+    "runtime": ("runtime_minutes", int),
+    "boxoffice": ("boxoffice_usd", int),
+    "imdbvotes": ("imdbvotes_count", int),
+    "metascore": ("metascore_value", int),
+    "star": ("star_value", float),
+}
+BACKFILL_BATCH_SIZE = 500
+
+def backfill_numeric_columns(conn, after_rowid: int):
+    """Fill the typed columns of the next batch of rows, returns its last rowid (None when no row is left)"""
+    text_columns = ", ".join(NUMERIC_COLUMNS)
+    assignments = ", ".join(f"{column} = ?" for column, _ in NUMERIC_COLUMNS.values())
+    rows = conn.execute(
+        f"SELECT rowid, {text_columns} FROM movies WHERE rowid > ? ORDER BY rowid LIMIT ?",
+        (after_rowid, BACKFILL_BATCH_SIZE),
+    ).fetchall()
+    if not rows:
+        return None
+    batch = []
+    for rowid, *values in rows:
+        numbers = [parse_number(value, number_type) for value, (_, number_type) in zip(values, NUMERIC_COLUMNS.values())]
+        batch.append((*numbers, rowid))
+    conn.executemany(f"UPDATE movies SET {assignments} WHERE rowid = ?", batch)
+    return rows[-1][0]
+
+# Comma-joined columns split into join tables: column -> (table, role)
+FACET_COLUMNS = {
+    "genre": ("movie_genres", None),
+    "director": ("movie_people", "director"),
+    "writer": ("movie_people", "writer"),
+    "actors": ("movie_people", "actor"),
+    "language": ("movie_languages", "language"),
+    "country": ("movie_languages", "country"),
+}
+
+def split_names(value):
+    """"Drama, Sci-Fi" -> ["Drama", "Sci-Fi"], nothing for N/A"""
+    if not value or value == "N/A":
+        return []
+    return list(dict.fromkeys(name.strip() for name in str(value).split(",") if name.strip()))
+
+def facet_rows(movie):
+    """Rows of every join table for a movie (or a movies row), keyed by table"""
+    rows = {"movie_genres": [], "movie_people": [], "movie_languages": []}
+    for column, (table, role) in FACET_COLUMNS.items():
+        for name in split_names(movie[column]):
+            if role is None:
+                rows[table].append((movie["imdbid"], name))
+            else:
+                rows[table].append((movie["imdbid"], role, name))
+    return rows
+
+def write_facets(conn, movies):
+    """Replace the join table rows of the movies (the caller commits)"""
+    imdbids = [(movie["imdbid"],) for movie in movies]
+    for table in ("movie_genres", "movie_people", "movie_languages"):
+        conn.executemany(f"DELETE FROM {table} WHERE imdbid = ?", imdbids)
+    genres, people, languages = [], [], []
+    for movie in movies:
+        rows = facet_rows(movie)
+        genres += rows["movie_genres"]
+        people += rows["movie_people"]
+        languages += rows["movie_languages"]
+    conn.executemany("INSERT OR IGNORE INTO movie_genres (imdbid, genre) VALUES (?, ?)", genres)
+    conn.executemany("INSERT OR IGNORE INTO movie_people (imdbid, role, name) VALUES (?, ?, ?)", people)
+    conn.executemany("INSERT OR IGNORE INTO movie_languages (imdbid, kind, name) VALUES (?, ?, ?)", languages)
+
+def backfill_facets(conn, after_rowid: int):
+    """Fill the join tables from the next batch of rows, returns its last rowid (None when no row is left)"""
+    columns = ("rowid", "imdbid", *FACET_COLUMNS)
+    rows = conn.execute(
+        f"SELECT {', '.join(columns)} FROM movies WHERE rowid > ? ORDER BY rowid LIMIT ?",
+        (after_rowid, BACKFILL_BATCH_SIZE),
+    ).fetchall()
+    if not rows:
+        return None
+    write_facets(conn, [dict(zip(columns, row)) for row in rows])
+    return rows[-1][0]
+
+# Full-text search over the reviews, kept in sync with movies by triggers
+SEARCH_INDEX_SCHEMA = '''
+    CREATE VIRTUAL TABLE IF NOT EXISTS movies_fts USING fts5(
+        title, plot, review, actors, director, writer, genre,
+        content='movies', content_rowid='rowid', tokenize='unicode61 remove_diacritics 2'
+    );
+    CREATE TRIGGER IF NOT EXISTS movies_fts_insert AFTER INSERT ON movies BEGIN
+        INSERT INTO movies_fts(rowid, title, plot, review, actors, director, writer, genre)
+        VALUES (new.rowid, new.title, new.plot, new.review, new.actors, new.director, new.writer, new.genre);
+    END;
+    CREATE TRIGGER IF NOT EXISTS movies_fts_delete AFTER DELETE ON movies BEGIN
+        INSERT INTO movies_fts(movies_fts, rowid, title, plot, review, actors, director, writer, genre)
+        VALUES ('delete', old.rowid, old.title, old.plot, old.review, old.actors, old.director, old.writer, old.genre);
+    END;
+    CREATE TRIGGER IF NOT EXISTS movies_fts_update AFTER UPDATE ON movies BEGIN
+        INSERT INTO movies_fts(movies_fts, rowid, title, plot, review, actors, director, writer, genre)
+        VALUES ('delete', old.rowid, old.title, old.plot, old.review, old.actors, old.director, old.writer, old.genre);
+        INSERT INTO movies_fts(rowid, title, plot, review, actors, director, writer, genre)
+        VALUES (new.rowid, new.title, new.plot, new.review, new.actors, new.director, new.writer, new.genre);
+    END;
+'''
+FTS_COLUMNS = "title, plot, review, actors, director, writer, genre"
+
+def build_search_index(conn, after_rowid: int):
+    """Create the full-text index on the first call, then index the next batch of rows
+
+    Returns the last rowid indexed (None when no row is left). No movie is written
+    while the schema is upgraded (every writer upgrades first), so the triggers
+    never index a row the batches also index.
+    """
+    if after_rowid == 0:
+        for statement in split_statements(SEARCH_INDEX_SCHEMA):
+            conn.execute(statement)
+    last_rowid = conn.execute(
+        "SELECT max(rowid) FROM (SELECT rowid FROM movies WHERE rowid > ? ORDER BY rowid LIMIT ?)",
+        (after_rowid, BACKFILL_BATCH_SIZE),
+    ).fetchone()[0]
+    if last_rowid is None:
+        return None
+    conn.execute(
+        f"INSERT INTO movies_fts(rowid, {FTS_COLUMNS}) SELECT rowid, {FTS_COLUMNS} FROM movies WHERE rowid > ? AND rowid <= ?",
+        (after_rowid, last_rowid),
+    )
+    return last_rowid
+
+# The columns a movie is exported with (the typed and join table copies are derived from them)
+MOVIE_COLUMNS = (
+    "imdbid", "title", "year", "rated", "released", "runtime", "genre", "director", "writer",
+    "actors", "plot", "language", "country", "awards", "poster_link", "metascore", "imdbrating",
+    "imdbvotes", "type", "dvd", "boxoffice", "production", "website", "poster_local_path", "star", "review",
+)
+
+# Schema upgrades, applied in order on top of INIT_TABLE (tracked by PRAGMA user_version).
+# A function is a backfill, called with the last rowid done until it returns None
+MIGRATIONS = [
+    # 1: titles are looked up case-insensitively, the rest are used to sort and filter
+    '''
+        CREATE INDEX IF NOT EXISTS idx_movies_title_nocase ON movies(title COLLATE NOCASE);
+        CREATE INDEX IF NOT EXISTS idx_movies_star ON movies(star);
+        CREATE INDEX IF NOT EXISTS idx_movies_year ON movies(year);
+        CREATE INDEX IF NOT EXISTS idx_movies_imdbrating ON movies(imdbrating);
+    ''',
+    # 2: full-text search over the reviews (filled in batches, then kept in sync by triggers)
+    build_search_index,
+    # 3: typed numeric columns (the FTS trigger now ignores updates of other columns)
+    '''
+        ALTER TABLE movies ADD COLUMN runtime_minutes INTEGER;
+        ALTER TABLE movies ADD COLUMN boxoffice_usd INTEGER;
+        ALTER TABLE movies ADD COLUMN imdbvotes_count INTEGER;
+        ALTER TABLE movies ADD COLUMN metascore_value INTEGER;
+        ALTER TABLE movies ADD COLUMN star_value REAL;
+        CREATE INDEX IF NOT EXISTS idx_movies_runtime_minutes ON movies(runtime_minutes);
+        CREATE INDEX IF NOT EXISTS idx_movies_boxoffice_usd ON movies(boxoffice_usd);
+        CREATE INDEX IF NOT EXISTS idx_movies_imdbvotes_count ON movies(imdbvotes_count);
+        CREATE INDEX IF NOT EXISTS idx_movies_metascore_value ON movies(metascore_value);
+        CREATE INDEX IF NOT EXISTS idx_movies_star_value ON movies(star_value);
+        DROP TRIGGER IF EXISTS movies_fts_update;
+        CREATE TRIGGER movies_fts_update
+        AFTER UPDATE OF title, plot, review, actors, director, writer, genre ON movies BEGIN
+            INSERT INTO movies_fts(movies_fts, rowid, title, plot, review, actors, director, writer, genre)
+            VALUES ('delete', old.rowid, old.title, old.plot, old.review, old.actors, old.director, old.writer, old.genre);
+            INSERT INTO movies_fts(rowid, title, plot, review, actors, director, writer, genre)
+            VALUES (new.rowid, new.title, new.plot, new.review, new.actors, new.director, new.writer, new.genre);
+        END;
+    ''',
+    # 4: one committed batch at a time, so a big library never holds the write lock long
+    backfill_numeric_columns,
+    # 5: genres, people and languages as join tables, the primary keys cover the filters
+    '''
+        CREATE TABLE IF NOT EXISTS movie_genres (
+            genre TEXT NOT NULL COLLATE NOCASE,
+            imdbid TEXT NOT NULL,
+            PRIMARY KEY (genre, imdbid)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS movie_people (
+            role TEXT NOT NULL,
+            name TEXT NOT NULL COLLATE NOCASE,
+            imdbid TEXT NOT NULL,
+            PRIMARY KEY (role, name, imdbid)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS movie_languages (
+            kind TEXT NOT NULL,
+            name TEXT NOT NULL COLLATE NOCASE,
+            imdbid TEXT NOT NULL,
+            PRIMARY KEY (kind, name, imdbid)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS idx_movie_genres_imdbid ON movie_genres(imdbid);
+        CREATE INDEX IF NOT EXISTS idx_movie_people_imdbid ON movie_people(imdbid);
+        CREATE INDEX IF NOT EXISTS idx_movie_languages_imdbid ON movie_languages(imdbid);
+        CREATE TRIGGER IF NOT EXISTS movies_facets_delete AFTER DELETE ON movies BEGIN
+            DELETE FROM movie_genres WHERE imdbid = old.imdbid;
+            DELETE FROM movie_people WHERE imdbid = old.imdbid;
+            DELETE FROM movie_languages WHERE imdbid = old.imdbid;
+        END;
+    ''',
+    backfill_facets,
+    # 7: rows of the CSV imports that are done, so an interrupted import resumes
+    '''
+        CREATE TABLE IF NOT EXISTS import_progress (
+            source TEXT NOT NULL,
+            row_key TEXT NOT NULL,
+            imdbid TEXT,
+            status TEXT NOT NULL,
+            PRIMARY KEY (source, row_key)
+        ) WITHOUT ROWID;
+    ''',
+]
+SCHEMA_VERSION = len(MIGRATIONS)
+
+# Last rowid every unfinished backfill got to, an interrupted upgrade resumes from there
+INIT_SCHEMA_PROGRESS = '''
+    CREATE TABLE IF NOT EXISTS schema_progress (
+        step INTEGER PRIMARY KEY,
+        last_rowid INTEGER NOT NULL
+    )
+'''
+
+# Column weights for bm25() in the movies_fts column order, a title hit ranks first
+SEARCH_WEIGHTS = (10.0, 1.0, 2.0, 3.0, 5.0, 3.0, 2.0)
+SEARCH_QUERY = f'''
+    SELECT m.imdbid, m.title, m.year, m.star,
+        snippet(movies_fts, -1, char(2), char(3), '…', 12) AS snippet
+    FROM movies_fts
+    JOIN movies m ON m.rowid = movies_fts.rowid
+    WHERE movies_fts MATCH ?
+    ORDER BY bm25(movies_fts, {", ".join(map(str, SEARCH_WEIGHTS))})
+    LIMIT ?
+'''
+
+# Note: We include poster_local_path, star, and review in the values list
+UPSERT_MOVIE = '''
+    INSERT INTO movies (
+        title, year, rated, released, runtime, genre, director, writer, 
+        actors, plot, language, country, awards, poster_link, metascore, 
+        imdbrating, imdbvotes, imdbid, type, dvd, boxoffice, production, 
+        website, poster_local_path, star, review,
+        runtime_minutes, boxoffice_usd, imdbvotes_count, metascore_value, star_value
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(imdbid) DO UPDATE SET
+        title=excluded.title,
+        year=excluded.year,
+        rated=excluded.rated,
+        released=excluded.released,
+        runtime=excluded.runtime,
+        genre=excluded.genre,
+        director=excluded.director,
+        writer=excluded.writer,
+        actors=excluded.actors,
+        plot=excluded.plot,
+        language=excluded.language,
+        country=excluded.country,
+        awards=excluded.awards,
+        poster_link=excluded.poster_link,
+        metascore=excluded.metascore,
+        imdbrating=excluded.imdbrating,
+        imdbvotes=excluded.imdbvotes,
+        type=excluded.type,
+        dvd=excluded.dvd,
+        boxoffice=excluded.boxoffice,
+        production=excluded.production,
+        website=excluded.website,
+        poster_local_path=excluded.poster_local_path,
+        star=excluded.star,
+        review=excluded.review,
+        runtime_minutes=excluded.runtime_minutes,
+        boxoffice_usd=excluded.boxoffice_usd,
+        imdbvotes_count=excluded.imdbvotes_count,
+        metascore_value=excluded.metascore_value,
+        star_value=excluded.star_value
+'''
+
+def movie_values(movie, poster_local_path: str, star, review: str):
+    """Parameters of UPSERT_MOVIE for an OMDb movie"""
+    return (
+        movie['title'], movie['year'], movie['rated'], movie['released'], 
+        movie['runtime'], movie['genre'], movie['director'], movie['writer'], 
+        movie['actors'], movie['plot'], movie['language'], movie['country'], 
+        movie['awards'], movie['poster'], movie['metascore'], movie['imdbrating'], 
+        movie['imdbvotes'], movie['imdbid'], movie['type'], movie['dvd'], 
+        movie['boxoffice'], movie['production'], movie['website'], poster_local_path, star, review,
+        parse_number(movie['runtime']), parse_number(movie['boxoffice']),
+        parse_number(movie['imdbvotes']), parse_number(movie['metascore']), parse_number(star, float)
+    )
+
+def upsert_movies(conn, movies):
+    """Upsert (movie, poster_local_path, star, review) entries and their join rows (the caller commits)"""
+    conn.executemany(UPSERT_MOVIE, [movie_values(*entry) for entry in movies])
+    write_facets(conn, [movie for movie, _, _, _ in movies])
+
+# WAL lets the fzf preview processes read while another mvw process writes
+BUSY_TIMEOUT_MS = 5000
+CACHE_SIZE_KB = 8 * 1024
+MMAP_SIZE = 64 * 1024 * 1024
+WRITER_PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",  # Durable in WAL mode except on power loss
+    f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}",
+    f"PRAGMA cache_size = -{CACHE_SIZE_KB}",
+    f"PRAGMA mmap_size = {MMAP_SIZE}",
+)
+READER_PRAGMAS = (
+    f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}",
+    f"PRAGMA cache_size = -{CACHE_SIZE_KB}",
+    f"PRAGMA mmap_size = {MMAP_SIZE}",
+)
+
+def schema_version(db_path: Path) -> int:
+    conn = sqlite3.connect(f"{db_path.as_uri()}?mode=ro", uri=True, timeout=BUSY_TIMEOUT_MS / 1000)
+    try:
+        return conn.execute("PRAGMA user_version").fetchone()[0]
+    finally:
+        conn.close()
+
+UPGRADE_POLL_SECONDS = 0.1
+
+def wait_for_upgrade(db_path: Path) -> int:
+    """Wait while another process upgrades the schema, returns the version it got to
+
+    The upgrade commits after every step and batch, so it is running as long
+    as commits keep coming (PRAGMA data_version). The wait ends when the schema
+    is current or nothing was committed for BUSY_TIMEOUT_MS.
+    """
+    conn = sqlite3.connect(f"{db_path.as_uri()}?mode=ro", uri=True, timeout=BUSY_TIMEOUT_MS / 1000)
+    try:
+        data_version = conn.execute("PRAGMA data_version").fetchone()[0]
+        last_commit = time.monotonic()
+        while True:
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version >= SCHEMA_VERSION or time.monotonic() - last_commit > BUSY_TIMEOUT_MS / 1000:
+                return version
+            time.sleep(UPGRADE_POLL_SECONDS)
+            current = conn.execute("PRAGMA data_version").fetchone()[0]
+            if current != data_version:
+                data_version, last_commit = current, time.monotonic()
+    finally:
+        conn.close()
+
+def split_statements(script: str):
+    """The statements of a migration script (trigger bodies keep their inner semicolons)"""
+    statement = ""
+    for part in script.split(";"):
+        statement += part + ";"
+        if sqlite3.complete_statement(statement):
+            if statement.strip(" \n;"):
+                yield statement.strip()
+            statement = ""
+
+def execute_migration_statement(conn, statement: str):
+    """Run one step of a migration, a column that is already there is not an error"""
+    try:
+        conn.execute(statement)
+    except sqlite3.OperationalError as e:
+        if not (statement.upper().startswith("ALTER TABLE") and "duplicate column name" in str(e)):
+            raise
+
 class DatabaseManager:
-    def __init__(self) -> None:
-        self.conn = sqlite3.connect(path.db_path, check_same_thread=False)
+    def __init__(self, db_path=None, read_only: bool = False) -> None:
+        db_path = Path(db_path or path.db_path)
+        self.read_only = read_only and db_path.exists() and self.connect_read_only(db_path)
+        if not self.read_only:
+            self.conn = sqlite3.connect(db_path, timeout=BUSY_TIMEOUT_MS / 1000, check_same_thread=False)
+            for pragma in WRITER_PRAGMAS:
+                self.conn.execute(pragma)
+            self.initialize_db()
         self.conn.row_factory = sqlite3.Row
-        self.initialize_db()
         atexit.register(self.close_db)
 
+    def connect_read_only(self, db_path: Path) -> bool:
+        """Open a read-only connection, False if the database needs a schema upgrade first
+
+        Readers never migrate. When a writer is upgrading the schema they wait
+        until it is done, only an outdated database nobody is upgrading is
+        handed to the writer (which then finds the write lock free).
+        """
+        if schema_version(db_path) < SCHEMA_VERSION and wait_for_upgrade(db_path) < SCHEMA_VERSION:
+            return False
+        self.conn = sqlite3.connect(
+            f"{db_path.as_uri()}?mode=ro", uri=True, timeout=BUSY_TIMEOUT_MS / 1000, check_same_thread=False
+        )
+        for pragma in READER_PRAGMAS:
+            self.conn.execute(pragma)
+        return True
+
     def initialize_db(self):
         cursor = self.conn.cursor()
         cursor.execute(INIT_TABLE)
         self.conn.commit()
+        self.migrate()
+
+    def migrate(self):
+        """Bring an older database up to SCHEMA_VERSION
+
+        Every step, and every batch of a backfill, is its own short transaction
+        under the write lock, so other processes are never held up for the whole
+        upgrade. Processes upgrading at the same time take turns and never apply
+        a step twice.
+        """
+        while self.conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+            self.migrate_step()
+
+    def migrate_step(self):
+        """Apply the next step (or the next batch of a backfill) in one BEGIN IMMEDIATE transaction
 
-    def store_movie_metadata(self, movie, poster_local_path: str, star: float, review: str):
+        user_version and the backfill progress are read again under the lock,
+        and written in the same transaction as the changes they record.
+        """
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            number = self.conn.execute("PRAGMA user_version").fetchone()[0] + 1
+            if number > SCHEMA_VERSION:
+                # Another process finished the upgrade
+                self.conn.rollback()
+                return
+            migration = MIGRATIONS[number - 1]
+            done = True
+            if callable(migration):
+                self.conn.execute(INIT_SCHEMA_PROGRESS)
+                row = self.conn.execute("SELECT last_rowid FROM schema_progress WHERE step = ?", (number,)).fetchone()
+                last_rowid = migration(self.conn, row[0] if row else 0)
+                if last_rowid is None:
+                    self.conn.execute("DELETE FROM schema_progress WHERE step = ?", (number,))
+                else:
+                    self.conn.execute(
+                        "INSERT OR REPLACE INTO schema_progress (step, last_rowid) VALUES (?, ?)", (number, last_rowid)
+                    )
+                    done = False
+            else:
+                # executescript() would commit first, so the statements run one by one
+                for statement in split_statements(migration):
+                    execute_migration_statement(self.conn, statement)
+            if done:
+                self.conn.execute(f"PRAGMA user_version = {number}")
+            self.conn.commit()
+        except BaseException:
+            self.conn.rollback()
+            raise
+
+    def store_movie_metadata(self, movie, poster_local_path: str, star: float, review: str, enrichment=None):
         try:
             cursor = self.conn.cursor()
-            # Note: We include poster_local_path, star, and review in the values list
-            cursor.execute('''
-                INSERT INTO movies (
-                    title, year, rated, released, runtime, genre, director, writer, 
-                    actors, plot, language, country, awards, poster_link, metascore, 
-                    imdbrating, imdbvotes, imdbid, type, dvd, boxoffice, production, 
-                    website, poster_local_path, star, review
-                )
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ON CONFLICT(imdbid) DO UPDATE SET
-                    title=excluded.title,
-                    year=excluded.year,
-                    rated=excluded.rated,
-                    released=excluded.released,
-                    runtime=excluded.runtime,
-                    genre=excluded.genre,
-                    director=excluded.director,
-                    writer=excluded.writer,
-                    actors=excluded.actors,
-                    plot=excluded.plot,
-                    language=excluded.language,
-                    country=excluded.country,
-                    awards=excluded.awards,
-                    poster_link=excluded.poster_link,
-                    metascore=excluded.metascore,
-                    imdbrating=excluded.imdbrating,
-                    imdbvotes=excluded.imdbvotes,
-                    type=excluded.type,
-                    dvd=excluded.dvd,
-                    boxoffice=excluded.boxoffice,
-                    production=excluded.production,
-                    website=excluded.website,
-                    poster_local_path=excluded.poster_local_path,
-                    star=excluded.star,
-                    review=excluded.review
-            ''',(
-                    movie['title'], movie['year'], movie['rated'], movie['released'], 
-                    movie['runtime'], movie['genre'], movie['director'], movie['writer'], 
-                    movie['actors'], movie['plot'], movie['language'], movie['country'], 
-                    movie['awards'], movie['poster'], movie['metascore'], movie['imdbrating'], 
-                    movie['imdbvotes'], movie['imdbid'], movie['type'], movie['dvd'], 
-                    movie['boxoffice'], movie['production'], movie['website'], poster_local_path, star, review
-                )
-            )
-            if ConfigManager().get_config("DATA", "worldwide_boxoffice").lower() == "true":
+            cursor.execute(UPSERT_MOVIE, movie_values(movie, poster_local_path, star, review))
+            write_facets(self.conn, [movie])
+
+            if enrichment is not None and "boxoffice" in enrichment:
+                new_boxoffice = self.set_movie_boxoffice_to_worldwide(movie['imdbid'], enrichment=enrichment)
+                if new_boxoffice:
+                    movie['boxoffice'] = new_boxoffice
+            elif ConfigManager().get_bool("DATA", "worldwide_boxoffice"):
                 new_boxoffice = self.set_movie_boxoffice_to_worldwide(movie['imdbid'])
                 if new_boxoffice:
                     movie['boxoffice'] = new_boxoffice
@@ -113,33 +517,93 @@ class DatabaseManager:
             self.conn.rollback()
             moai.says(f"[indian_red]x Sorry, Database error: ({e}) occured[/]\n[dim]This should not happen, up an issue to the dev[/]", type="error")
 
+    def store_imported_movies(self, source: str, movies, skipped=()):
+        """Save a batch of imported movies and mark their rows done, in one transaction
+
+        movies: (row_key, movie, poster_local_path, star, review)
+        skipped: (row_key, imdbid, status) of the rows that were not imported
+        """
+        with self.conn:
+            upsert_movies(self.conn, [entry[1:] for entry in movies])
+            progress = [(source, row_key, movie["imdbid"], "imported") for row_key, movie, _, _, _ in movies]
+            progress += [(source, row_key, imdbid, status) for row_key, imdbid, status in skipped]
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO import_progress (source, row_key, imdbid, status) VALUES (?, ?, ?, ?)",
+                progress,
+            )
+
+    def restore_movies(self, rows):
+        """Upsert a batch of exported rows (see MOVIE_COLUMNS) in one transaction"""
+        with self.conn:
+            upsert_movies(
+                self.conn,
+                [({**row, "poster": row["poster_link"]}, row["poster_local_path"], row["star"], row["review"]) for row in rows],
+            )
+
+    def iter_movies(self):
+        """Yield every movie as a dict of MOVIE_COLUMNS straight from the cursor"""
+        cursor = self.conn.cursor()
+        cursor.execute(f"SELECT {', '.join(MOVIE_COLUMNS)} FROM movies ORDER BY rowid")
+        for row in cursor:
+            yield dict(row)
+
+    def get_import_progress(self, source: str) -> set:
+        """Row keys of the import source that are already done"""
+        cursor = self.conn.cursor()
+        cursor.execute("SELECT row_key FROM import_progress WHERE source = ?", (source,))
+        return {row[0] for row in cursor.fetchall()}
+
+    def find_imdbid(self, title: str, year: str = ""):
+        """imdbid of a reviewed movie by its title (and year), None if it is not reviewed"""
+        query = "SELECT imdbid FROM movies WHERE title = ? COLLATE NOCASE"
+        parameters = [title]
+        if year:
+            query += " AND year = ?"
+            parameters.append(year)
+        cursor = self.conn.cursor()
+        cursor.execute(query, parameters)
+        row = cursor.fetchone()
+        return row[0] if row else None
+
     def update_star_review(self, imdbid: str, star: float, review: str):
         """Update ONLY the star and review based on the IMDB ID"""
         try:
             cursor = self.conn.cursor()
             cursor.execute('''
                 UPDATE movies 
-                SET star = ?, review = ?
+                SET star = ?, review = ?, star_value = ?
                 WHERE imdbid = ?
-            ''', (star, review, imdbid))
+            ''', (star, review, parse_number(star, float), imdbid))
             self.conn.commit()
         except Exception as e:
             self.conn.rollback()
             moai.says(f"[indian_red]x Sorry, Database error: ({e}) occured[/]\n[dim]This should not happen, up an issue to the dev[/]", type="error")
 
-    def get_all_movies(self):
-        """Get all movies in the database"""
-        query = """
-            SELECT * FROM movies
+    def get_all_movies(self, **filters):
+        """Get all movies in the database (see movie_filters for the filters)"""
+        where, parameters = movie_filters(**filters)
+        query = f"""
+            SELECT * FROM movies m {where}
         """
         cursor = self.conn.cursor()
-        cursor.execute(query)
+        cursor.execute(query, parameters)
         return [dict(row) for row in cursor.fetchall()]
 
+    def iter_movie_list(self, **filters):
+        """Yield (imdbid, title, year, star) of the movies straight from the cursor"""
+        where, parameters = movie_filters(**filters)
+        query = f"""
+            SELECT m.imdbid, m.title, m.year, m.star FROM movies m {where}
+        """
+        cursor = self.conn.cursor()
+        cursor.execute(query, parameters)
+        for row in cursor:
+            yield tuple(row)
+
     def get_movie_metadata_by_title(self, title: str):
-        """Fetch a movie and all its genres in single query"""
+        """Fetch a movie by its title (case-insensitive)"""
         query = """
-            SELECT * FROM movies WHERE title=?
+            SELECT * FROM movies WHERE title = ? COLLATE NOCASE
         """
         cursor = self.conn.cursor()
         cursor.execute(query, (title,))
@@ -147,6 +611,18 @@ class DatabaseManager:
 
         return row
 
+    def search_movies(self, text: str, limit: int = 20):
+        """Full-text search over the reviews, best matches first
+
+        The snippet marks every matched term with \\x02 (start) and \\x03 (end).
+        """
+        query = fts_query(text)
+        if not query:
+            return []
+        cursor = self.conn.cursor()
+        cursor.execute(SEARCH_QUERY, (query, limit))
+        return [dict(row) for row in cursor.fetchall()]
+
     def get_movie_metadata_by_imdbid(self, imdbid: str):
         """Fetch a movie and all its genres in single query"""
         query = """
@@ -158,10 +634,16 @@ class DatabaseManager:
 
         return row
 
+    def poster_in_use(self, poster_local_path: str) -> bool:
+        """Whether a movie still shows this poster file"""
+        cursor = self.conn.cursor()
+        cursor.execute("SELECT 1 FROM movies WHERE poster_local_path = ? LIMIT 1", (poster_local_path,))
+        return cursor.fetchone() is not None
+
     def delete_movie_entry_by_title(self, title: str):
         """Delete the movie entry using its title"""
         query = """
-            DELETE FROM movies WHERE title = ?
+            DELETE FROM movies WHERE title = ? COLLATE NOCASE
         """
         try:
             cursor = self.conn.cursor()
@@ -200,18 +682,25 @@ class DatabaseManager:
             moai.says(f"[indian_red]x Sorry, Database error: ({e}) occured[/]", type="error")
             self.conn.rollback()
 
-    def set_movie_boxoffice_to_worldwide(self, imdbid: str):
-        """Save the worldwide box office"""
-        worldwide_value = movie_manager.fetch_box_office_worldwide(imdbid)
+    def set_movie_boxoffice_to_worldwide(self, imdbid: str, enrichment=None):
+        """Save the worldwide box office (already looked up in the background if enrichment is given)"""
+        if enrichment is not None:
+            try:
+                worldwide_value = enrichment.result("boxoffice")
+            except Exception as e:
+                moai.says(f"[indian_red]x Sorry, Web Scrapping Error ({e}) occured.[/]", type="error")
+                worldwide_value = None
+        else:
+            worldwide_value = movie_manager.fetch_box_office_worldwide(imdbid)
         if not worldwide_value:
             moai.says(f"[indian_red]x Sorry, There is no worldwide boxoffice for this entry", type="error")
             return
         try:
             query = """
-                UPDATE movies SET boxoffice = ? WHERE imdbid = ?
+                UPDATE movies SET boxoffice = ?, boxoffice_usd = ? WHERE imdbid = ?
             """
             cursor = self.conn.cursor()
-            cursor.execute(query, (worldwide_value, imdbid,))
+            cursor.execute(query, (worldwide_value, parse_number(worldwide_value), imdbid,))
             self.conn.commit()
             moai.says(
                     f"[yellow]✓ I just searched (boxofficemojo.com) and found the global boxoffice -> [bold]{worldwide_value}[/bold]\n"
@@ -226,10 +715,19 @@ class DatabaseManager:
     def set_key_value(self, identifier, attribute, value, use_title=False):
         """Set the attribute category in database with value"""
         id_column = "title" if use_title else "imdbid"
-        query = f"UPDATE movies SET {attribute} = ? WHERE {id_column} = ?"
+        collation = " COLLATE NOCASE" if use_title else ""
+        assignments, values = f"{attribute} = ?", [value]
+        if attribute in NUMERIC_COLUMNS:
+            numeric_column, number_type = NUMERIC_COLUMNS[attribute]
+            assignments += f", {numeric_column} = ?"
+            values.append(parse_number(value, number_type))
+        query = f"UPDATE movies SET {assignments} WHERE {id_column} = ?{collation}"
         try:
             cursor = self.conn.cursor()
-            cursor.execute(query, (value, identifier))
+            cursor.execute(query, (*values, identifier))
+            if attribute in FACET_COLUMNS:
+                cursor.execute(f"SELECT * FROM movies WHERE {id_column} = ?{collation}", (identifier,))
+                write_facets(self.conn, cursor.fetchall())
             self.conn.commit()
             moai.says(f"[green]✓ Database ({attribute}: {value}) [italic]updated[/italic] successfully[/]", type="fun")
         except Exception as e:
@@ -239,3 +737,33 @@ class DatabaseManager:
         """Call this when the cli shuts down"""
         if self.conn:
             self.conn.close()
+
+
+def movie_filters(genre=None, director=None, actor=None, min_star=None, year=None):
+    """WHERE clause (on `movies m`) and its parameters, every filter is done by an index"""
+    clauses, parameters = [], []
+    if genre:
+        clauses.append("m.imdbid IN (SELECT imdbid FROM movie_genres WHERE genre = ?)")
+        parameters.append(genre)
+    if director:
+        clauses.append("m.imdbid IN (SELECT imdbid FROM movie_people WHERE role = 'director' AND name = ?)")
+        parameters.append(director)
+    if actor:
+        clauses.append("m.imdbid IN (SELECT imdbid FROM movie_people WHERE role = 'actor' AND name = ?)")
+        parameters.append(actor)
+    if min_star is not None:
+        clauses.append("m.star_value >= ?")
+        parameters.append(min_star)
+    if year:
+        clauses.append("m.year = ?")
+        parameters.append(str(year))
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    return where, parameters
+
+
+def fts_query(text: str) -> str:
+    """Turn free text into an FTS5 query: every word must match, the last one as a prefix"""
+    words = ['"' + word.replace('"', '""') + '"' for word in text.split()]
+    if words:
+        words[-1] += "*"
+    return " ".join(words)
@@ -6,14 +6,18 @@ from rich.text import Text
 from rich.console import Console, Group
 from rich.panel import Panel
 from rich.align import Align
-from rich.ansi import AnsiDecoder
+from rich.segment import Segments
+from rich.style import Style
 from rich import box
 
 from .moai import Moai
 from .config import ConfigManager
 from .path import PathManager
 from .theme import Palette
-from .renderers import get_renderer
+from .renderers import get_reader, get_renderer
+from .renderers.base import SHARPNESS, CONTRAST
+from .cache import RenderCache
+from .svg import POSTER_META, CardSVG
 
 import os
 import sys
@@ -25,129 +29,11 @@ config_manager = ConfigManager()
 path = PathManager()
 moai = Moai()
 palette = Palette(str(config_manager.get_config("UI", "theme")))
+render_cache = RenderCache()
+POSTER_STYLE = Style.from_meta({POSTER_META: True})
 
-
-class DisplayManager:
-    def __init__(self, movie, poster_path) -> None:
-        self.movie = movie
-        self.poster_path = poster_path
-        self.poster_width = int(config_manager.get_config("UI", "poster_width"))
-        self.info_width = 100
-
-    def display_all_color_theme(self, palette: Palette):
-        console.print(str(config_manager.get_config("UI", "theme")))
-        console.print(f"[{palette.style.get('background')}]BACKGROUND[/]")
-        console.print(f"[{palette.style.get('text')}]TEXT[/]")
-        console.print(f"[{palette.style.get('poster_border')}]POSTER_BORDER[/]")
-        console.print(f"[{palette.style.get('movie_data')}]MOVIE_DATA[/]")
-        console.print(f"[{palette.style.get('imdb_data')}]IMDB_DATA[/]")
-        console.print(f"[{palette.style.get('stats_data')}]STATS_DATA[/]")
-        console.print(f"[{palette.style.get('review_text')}]REVIEW_TEXT[/]")
-
-    def display_movie_info(
-        self, star: float = 0.0, review_text: str = "Your review will show here."
-    ):
-        """The Movie Review Card"""
-        if sys.platform == "win32":
-            try:
-                sys.stdout.reconfigure(encoding="utf-8")
-            except AttributeError:
-                os.system("chcp 65001")
-
-        reviewer_name = config_manager.get_config("USER", "name")
-        suffix = "'s" if reviewer_name else ""
-
-        try:
-            current_term_width = console.width
-            poster_panel = self.poster_panel()
-
-            review_header = Text.from_markup(
-                f"[{str(palette.style.get('review_text', 'cyan'))} bold]󰭹 {reviewer_name.upper()}{suffix} REVIEW :[/] [{str(palette.style.get('imdb_gold', 'yellow'))}]{self.iconize_star(float(star))}[/]"
-            )
-            review = Text.from_markup(
-                review_text
-                if review_text != None
-                else "Seems like something [italic]happened[/], Sorry for the inconvenience.",
-                overflow="fold",
-                justify="left",
-                style=str(palette.style.get("text", "white")),
-            )
-            gap = Text.from_markup(" ")
-
-            review_group = Group(gap, review_header, review)
-
-            spacing = Text(" ")
-
-            if config_manager.get_config("UI", "review") == "true":
-                right_group = Group(
-                    spacing,
-                    self.movie_group(),
-                    self.imdb_group(),
-                    self.stats_group(),
-                    review_group,
-                )
-            else:
-                right_group = Group(
-                    spacing, self.movie_group(), self.imdb_group(), self.stats_group()
-                )
-
-            if current_term_width < 70:
-                main_layout = Group(Align.center(poster_panel), Text(" "), right_group)
-            else:
-                body_table = Table.grid(padding=(0, 2))
-                body_table.add_column(width=self.poster_width + 4)
-                body_table.add_column()
-                body_table.add_row(poster_panel, right_group)
-
-                main_group = Table.grid(expand=True)
-                main_group.add_row(body_table)
-
-                main_layout = Panel(main_group, box=box.SIMPLE_HEAD, width=100)
-
-            full_panel = Panel(
-                main_layout, box=box.SIMPLE_HEAD, width=min(100, current_term_width)
-            )
-            console.print(full_panel)
-        except KeyError:
-            moai.says(
-                f"[yellow]x Ermm.. actually TV Shows are currently not supported[/]",
-                type="nerd",
-            )
-            os.abort()
-        except Exception as e:
-            print(f"The terminal preview is not supported: {e}")
-
-    def save_display_movie_info(self):
-        """Save a screenshot of the user's review"""
-        import subprocess
-
-        title_raw = self.movie["title"]
-        year = self.movie["year"]
-        title_clean = re.sub(r"[^\w\s.-]", "_", title_raw)
-        svg_path = path.screenshot_dir / f"{title_clean} ({year}).svg"
-
-        try:
-            command = ["mvw", "preview", "-t", self.movie["title"]]
-            result = subprocess.run(
-                command, capture_output=True, text=True, check=True, encoding="utf-8"
-            )
-
-            console = Console(
-                force_terminal=True,
-                soft_wrap=True,
-                color_system="truecolor",
-                legacy_windows=False,
-                record=True,
-                width=100,
-            )
-            decoder = AnsiDecoder()
-            lines = list(decoder.decode(result.stdout))
-
-            for line in lines:
-                console.print(line)
-
-            # Add nerfont support
-            svg_code_format = """<svg class="rich-terminal" viewBox="0 0 {width} {height}" xmlns="http://www.w3.org/2000/svg">
+# Add nerfont support
+SVG_CODE_FORMAT = """<svg class="rich-terminal" viewBox="0 0 {width} {height}" xmlns="http://www.w3.org/2000/svg">
     <!-- Generated with Rich https://www.textualize.io -->
     <style>
 
@@ -201,12 +87,131 @@ class DisplayManager:
 </svg>
 """
 
-            console.save_svg(
-                str(svg_path),
-                title=f"MVW (MoVie revieW) 🗿",
-                theme=palette.theme,
-                code_format=svg_code_format,
+
+class DisplayManager:
+    def __init__(self, movie, poster_path) -> None:
+        self.movie = movie
+        self.poster_path = poster_path
+        self.poster_width = config_manager.get_int("UI", "poster_width", 25)
+        self.info_width = 100
+        # Tag the poster cells so the SVG writer can swap them for the image
+        self.mark_poster = False
+
+    def display_all_color_theme(self, palette: Palette):
+        console.print(str(config_manager.get_config("UI", "theme")))
+        console.print(f"[{palette.style.get('background')}]BACKGROUND[/]")
+        console.print(f"[{palette.style.get('text')}]TEXT[/]")
+        console.print(f"[{palette.style.get('poster_border')}]POSTER_BORDER[/]")
+        console.print(f"[{palette.style.get('movie_data')}]MOVIE_DATA[/]")
+        console.print(f"[{palette.style.get('imdb_data')}]IMDB_DATA[/]")
+        console.print(f"[{palette.style.get('stats_data')}]STATS_DATA[/]")
+        console.print(f"[{palette.style.get('review_text')}]REVIEW_TEXT[/]")
+
+    def display_movie_info(
+        self, star: float = 0.0, review_text: str = "Your review will show here."
+    ):
+        """The Movie Review Card"""
+        if sys.platform == "win32":
+            try:
+                sys.stdout.reconfigure(encoding="utf-8")
+            except AttributeError:
+                os.system("chcp 65001")
+
+        try:
+            console.print(self.movie_card(star, review_text, console.width))
+        except KeyError:
+            moai.says(
+                f"[yellow]x Ermm.. actually TV Shows are currently not supported[/]",
+                type="nerd",
             )
+            os.abort()
+        except Exception as e:
+            print(f"The terminal preview is not supported: {e}")
+
+    def movie_card(self, star, review_text, current_term_width: int):
+        """The Movie Review Card, laid out for a terminal of the given width"""
+        reviewer_name = config_manager.get_config("USER", "name")
+        suffix = "'s" if reviewer_name else ""
+
+        poster_panel = self.poster_panel()
+
+        review_header = Text.from_markup(
+            f"[{str(palette.style.get('review_text', 'cyan'))} bold]󰭹 {reviewer_name.upper()}{suffix} REVIEW :[/] [{str(palette.style.get('imdb_gold', 'yellow'))}]{self.iconize_star(star)}[/]"
+        )
+        review = Text.from_markup(
+            review_text
+            if review_text != None
+            else "Seems like something [italic]happened[/], Sorry for the inconvenience.",
+            overflow="fold",
+            justify="left",
+            style=str(palette.style.get("text", "white")),
+        )
+        gap = Text.from_markup(" ")
+
+        review_group = Group(gap, review_header, review)
+
+        spacing = Text(" ")
+
+        if config_manager.get_bool("UI", "review"):
+            right_group = Group(
+                spacing,
+                self.movie_group(),
+                self.imdb_group(),
+                self.stats_group(),
+                review_group,
+            )
+        else:
+            right_group = Group(
+                spacing, self.movie_group(), self.imdb_group(), self.stats_group()
+            )
+
+        if current_term_width < 70:
+            main_layout = Group(Align.center(poster_panel), Text(" "), right_group)
+        else:
+            body_table = Table.grid(padding=(0, 2))
+            body_table.add_column(width=self.poster_width + 4)
+            body_table.add_column()
+            body_table.add_row(poster_panel, right_group)
+
+            main_group = Table.grid(expand=True)
+            main_group.add_row(body_table)
+
+            main_layout = Panel(main_group, box=box.SIMPLE_HEAD, width=100)
+
+        return Panel(
+            main_layout, box=box.SIMPLE_HEAD, width=min(100, current_term_width)
+        )
+
+    def save_svg(self, svg_path: Path, term_width: int, echo: bool = True, embed_poster: bool = False):
+        """Save the card (self.movie is the stored row), laid out for the terminal width, as SVG
+
+        With echo the card is shown in the terminal too. With embed_poster the
+        poster is one image in the SVG instead of its colored cells.
+        """
+        self.mark_poster = embed_poster
+        card = self.movie_card(self.movie["star"], self.movie["review"], term_width)
+        lines = console.render_lines(card, console.options.update_width(term_width), pad=False)
+
+        if echo:
+            console.line()
+            for line in lines:
+                console.print(Segments(line))
+            console.line()
+
+        # With the blank lines the `mvw preview` output had around it
+        card_svg = CardSVG(palette.theme, 100, Path(self.poster_path) if embed_poster else None)
+        card_svg.save(svg_path, [[], *lines, []], "MVW (MoVie revieW) 🗿", SVG_CODE_FORMAT)
+
+    def save_display_movie_info(self):
+        """Save a screenshot of the user's review (self.movie is the stored row)"""
+        title_raw = self.movie["title"]
+        year = self.movie["year"]
+        title_clean = re.sub(r"[^\w\s.-]", "_", title_raw)
+        svg_path = path.screenshot_dir / f"{title_clean} ({year}).svg"
+
+        try:
+            # Laid out for this terminal like `mvw preview` would
+            self.save_svg(svg_path, console.width)
             moai.says(
                 f"[green]✓ {self.movie['title']} ({svg_path}) [italic]saved[/italic] successfully[/]\n            [dim]Note that it was in [yellow]`svg`[/yellow] so prefered to use [italic]browser[/italic] to view[/]",
                 type="fun",
@@ -216,8 +221,11 @@ class DisplayManager:
                 f"[indian_red]x Sorry, Screenshot error ({e}) occured.[/]", type="error"
             )
 
-    def iconize_star(self, star: float):
-        star = max(0, min(5, star))
+    def iconize_star(self, star):
+        """The rating as star icons, a dash for an unrated movie (NULL star)"""
+        if star in (None, ""):
+            return "-"
+        star = max(0, min(5, float(star)))
         full_star = int(star)
         has_half_star = (star - full_star) >= 0.5
         empty_star = 5 - full_star - (1 if has_half_star else 0)
@@ -309,7 +317,7 @@ class DisplayManager:
             "style": str(palette.style.get("poster_border", "")),
         }
 
-        if config_manager.get_config("UI", "poster_border") != "true":
+        if not config_manager.get_bool("UI", "poster_border"):
             panel_kwargs.update(
                 {
                     "box": box.SIMPLE_HEAD,
@@ -334,12 +342,37 @@ class DisplayManager:
             return placeholder_panel()
 
         try:
-            renderer_class = get_renderer(render_style)
-            renderer = renderer_class(poster_file, poster_width)
-            test_panel = Panel(renderer, **panel_kwargs)
-
-            if renderer.failed:
+            poster = self.render_poster(poster_file, render_style, poster_width)
+            if poster is None:
                 return placeholder_panel()
-            return test_panel
+            return Panel(poster, **panel_kwargs)
         except Exception:
             return placeholder_panel()
+
+    def render_poster(self, poster_file: Path, render_style: str, poster_width: int):
+        """Render the poster, its ANSI is served from the render cache when possible"""
+        charset = config_manager.get_config("UI", "charset")
+        tolerance = config_manager.get_int("UI", "color_tolerance", 0)
+        key = render_cache.make_key(
+            poster_file,
+            render_style,
+            poster_width,
+            charset,
+            settings=f"{SHARPNESS},{CONTRAST},{tolerance}",
+        )
+
+        ansi = render_cache.get(key)
+        if ansi is None:
+            renderer_class = get_renderer(render_style)
+            renderer = renderer_class(poster_file, poster_width)
+            ansi = renderer.to_ansi()
+            if renderer.failed:
+                return None
+
+            render_cache.set(key, ansi)
+
+        # The pixel renderer's own format is read straight into Segments
+        read = get_reader(render_style)
+        if read is not None:
+            return read(ansi, POSTER_STYLE if self.mark_poster else None)
+        return Text.from_ansi(ansi, no_wrap=True, style=POSTER_STYLE if self.mark_poster else "")
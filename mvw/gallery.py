@@ -0,0 +1,192 @@
+import hashlib
+import html
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Callable, Optional
+
+from .config import ConfigManager
+from .database import MOVIE_COLUMNS
+from .theme import Palette
+
+config_manager = ConfigManager()
+
+# Bump when the card layout changes so every card is rendered again
+GALLERY_VERSION = "3"
+CARD_WIDTH = 100  # Terminal columns the cards are laid out for (the widest card)
+MANIFEST_NAME = "manifest.json"
+INDEX_NAME = "index.html"
+MANIFEST_EVERY = 100  # Cards rendered between two manifest saves
+
+# Settings that change how a card looks
+CARD_SETTINGS = (
+    ("UI", "theme"),
+    ("UI", "poster_width"),
+    ("UI", "poster_border"),
+    ("UI", "render"),
+    ("UI", "charset"),
+    ("UI", "color_tolerance"),
+    ("UI", "review"),
+    ("USER", "name"),
+)
+
+INDEX_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{title}</title>
+<style>
+    body {{ margin: 0; padding: 24px; background: {background}; color: {text}; font-family: sans-serif; }}
+    main {{ display: grid; grid-template-columns: repeat(auto-fill, minmax(480px, 1fr)); gap: 24px; }}
+    figure {{ margin: 0; }}
+    img {{ width: 100%; height: auto; }}
+    figcaption {{ margin-top: 6px; }}
+</style>
+</head>
+<body>
+<h1>{title}</h1>
+<main>
+{cards}
+</main>
+</body>
+</html>
+"""
+
+
+def card_settings(embed_posters: bool = False) -> str:
+    """Everything besides the row and the poster that the cards depend on"""
+    values = [config_manager.get_config(section, key) for section, key in CARD_SETTINGS]
+    return "|".join([GALLERY_VERSION, str(CARD_WIDTH), str(embed_posters), *values])
+
+
+def card_fingerprint(movie: dict, settings: str) -> str:
+    """Changes whenever the card of the movie would look different"""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(json.dumps([movie[column] for column in MOVIE_COLUMNS], ensure_ascii=False).encode())
+    try:
+        # A new poster file, or the same file overwritten by `mvw poster`
+        stat = os.stat(movie["poster_local_path"])
+        digest.update(f"|{stat.st_size}|{stat.st_mtime_ns}".encode())
+    except (OSError, TypeError):
+        digest.update(b"|no poster")
+    digest.update(settings.encode())
+    return digest.hexdigest()
+
+
+def load_manifest(manifest_path: Path) -> dict:
+    """{imdbid: {"fingerprint", "file"}} of the cards already built"""
+    try:
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return manifest.get("cards", {})
+
+
+def save_manifest(manifest_path: Path, cards: dict):
+    tmp_path = manifest_path.with_name(f"{manifest_path.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(json.dumps({"cards": cards}), encoding="utf-8")
+    os.replace(tmp_path, manifest_path)
+
+
+def render_card(movie: dict, svg_path: str, embed_posters: bool = False):
+    """Worker process: save the card of a movie, returns the error or None"""
+    from .display import DisplayManager
+
+    try:
+        DisplayManager(movie, movie["poster_local_path"]).save_svg(
+            Path(svg_path), CARD_WIDTH, echo=False, embed_poster=embed_posters
+        )
+    except Exception as e:
+        return str(e) or type(e).__name__
+    return None
+
+
+def write_index(index_path: Path, entries: list):
+    """Static page showing every card"""
+    palette = Palette(str(config_manager.get_config("UI", "theme")))
+    name = config_manager.get_config("USER", "name")
+    title = html.escape(f"{name}'s reviews" if name else "Reviews")
+    cards = "\n".join(
+        f'<figure><a href="{html.escape(entry["file"])}"><img src="{html.escape(entry["file"])}" loading="lazy" '
+        f'alt="{html.escape(entry["title"])}"></a><figcaption>{html.escape(entry["title"])} ({html.escape(entry["year"])})'
+        f' ★ {html.escape(entry["star"])}</figcaption></figure>'
+        for entry in entries
+    )
+    tmp_path = index_path.with_name(f"{index_path.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(
+        INDEX_TEMPLATE.format(
+            title=title, background=palette.style["background"], text=palette.style["review_text"], cards=cards
+        ),
+        encoding="utf-8",
+    )
+    os.replace(tmp_path, index_path)
+
+
+def export_cards(database, out_dir: Path, workers: Optional[int] = None, force: bool = False, embed_posters: bool = False, progress: Optional[Callable] = None) -> dict:
+    """Render the card of every reviewed movie to SVG plus an index.html, returns the counts
+
+    Only the cards whose row, poster or look changed since the last build are
+    rendered again, spread over a process pool. With embed_posters every poster
+    is one image instead of colored cells. progress(done, total) is called as
+    the cards are rendered.
+    """
+    out_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = out_dir / MANIFEST_NAME
+    cards = {} if force else load_manifest(manifest_path)
+    settings = card_settings(embed_posters)
+
+    entries, jobs = [], []
+    for movie in database.iter_movies():
+        imdbid = movie["imdbid"]
+        entry = {
+            "imdbid": imdbid,
+            "file": f"{imdbid}.svg",
+            "title": str(movie["title"]),
+            "year": str(movie["year"]),
+            # Unrated movies (NULL star) show a dash instead of "None"
+            "star": "-" if movie["star"] in (None, "") else str(movie["star"]),
+            "fingerprint": card_fingerprint(movie, settings),
+        }
+        entries.append(entry)
+        card = cards.get(imdbid)
+        if card is None or card["fingerprint"] != entry["fingerprint"] or not (out_dir / card["file"]).exists():
+            jobs.append((movie, entry))
+
+    # Cards of the deleted movies
+    current = {entry["imdbid"] for entry in entries}
+    removed = [imdbid for imdbid in cards if imdbid not in current]
+    for imdbid in removed:
+        (out_dir / cards.pop(imdbid)["file"]).unlink(missing_ok=True)
+
+    counts = {"rendered": 0, "unchanged": len(entries) - len(jobs), "removed": len(removed), "failed": 0}
+    if jobs:
+        executor = ProcessPoolExecutor(max_workers=min(workers or os.cpu_count() or 1, len(jobs)))
+        try:
+            futures = {
+                executor.submit(render_card, movie, str(out_dir / entry["file"]), embed_posters): entry
+                for movie, entry in jobs
+            }
+            for done, future in enumerate(as_completed(futures), start=1):
+                entry = futures[future]
+                if future.result() is None:
+                    cards[entry["imdbid"]] = {"fingerprint": entry["fingerprint"], "file": entry["file"]}
+                    counts["rendered"] += 1
+                else:
+                    # Not in the manifest, so the next build tries it again
+                    cards.pop(entry["imdbid"], None)
+                    counts["failed"] += 1
+                if progress:
+                    progress(done, len(jobs))
+                if done % MANIFEST_EVERY == 0:
+                    save_manifest(manifest_path, cards)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+            # The cards done so far are kept, even when the build is interrupted
+            save_manifest(manifest_path, cards)
+    else:
+        save_manifest(manifest_path, cards)
+
+    write_index(out_dir / INDEX_NAME, [entry for entry in entries if entry["imdbid"] in cards])
+    return counts
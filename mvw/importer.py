@@ -0,0 +1,215 @@
+import csv
+import hashlib
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+
+from rich.console import Console
+from rich.progress import BarColumn, MofNCompleteColumn, Progress, TextColumn, TimeRemainingColumn
+
+from .api import API, MovieNotFound
+from .cache import ResponseCache
+from .config import ConfigManager
+from .movie import download_poster, poster_file_path
+from .quota import BACKGROUND, QuotaBudget
+from .transport import QuotaExhausted, RateLimiter
+
+console = Console()
+config_manager = ConfigManager()
+
+# OMDb errors that mean the row will never resolve (anything else stops the import)
+NOT_FOUND_ERRORS = {"Movie not found!", "Incorrect IMDb ID."}
+POSTER_MAX_BYTES = 5 * 1024 * 1024
+
+
+class ImportStopped(Exception):
+    """The import cannot go on (quota, offline mode, invalid key..), it can be resumed later"""
+
+
+def source_id(csv_path: Path) -> str:
+    """Identify the export by its content, so a resumed import skips the rows already done"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(csv_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def parse_star(value: str, scale: float = 1.0):
+    try:
+        return round(float(value) / scale * 2) / 2
+    except (TypeError, ValueError):
+        return None
+
+
+def read_rows(csv_path: Path):
+    """Yield {key, imdbid, title, year, star, review} from a Letterboxd or IMDb export"""
+    with open(csv_path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.DictReader(f)
+        fields = set(reader.fieldnames or [])
+        if "Const" in fields:
+            # IMDb ratings export, rated 1 ~ 10
+            for number, row in enumerate(reader, start=2):
+                yield {
+                    "key": str(number),
+                    "imdbid": row["Const"].strip(),
+                    "title": row.get("Title", "").strip(),
+                    "year": row.get("Year", "").strip(),
+                    "star": parse_star(row.get("Your Rating"), scale=2),
+                    "review": "",
+                }
+        elif "Letterboxd URI" in fields:
+            # Letterboxd ratings.csv / reviews.csv, rated 0.5 ~ 5
+            for number, row in enumerate(reader, start=2):
+                yield {
+                    "key": str(number),
+                    "imdbid": "",
+                    "title": row.get("Name", "").strip(),
+                    "year": row.get("Year", "").strip(),
+                    "star": parse_star(row.get("Rating")),
+                    "review": row.get("Review", "") or "",
+                }
+        else:
+            raise ValueError("Not a Letterboxd (ratings/reviews.csv) or IMDb ratings export")
+
+
+class CsvImporter:
+    """Import a Letterboxd / IMDb export into the library"""
+
+    def __init__(self, database, workers: int = 4, rate: float = 5.0, max_requests=None, batch_size: int = 50, posters: bool = True) -> None:
+        self.database = database
+        self.workers = workers
+        self.batch_size = batch_size
+        self.posters = posters
+        # Cached OMDb responses do not go through the limiter or the budget, so they are free
+        self.limiter = RateLimiter(rate, budget=max_requests)
+        # Stops short of the daily limit, so searching still works after a big import
+        self.budget = QuotaBudget.from_config(config_manager)
+        self.api = API(
+            config_manager.get_config("API", "omdb_api_key"),
+            cache=ResponseCache.from_config(config_manager),
+            offline=config_manager.get_bool("CACHE", "offline"),
+            limiter=self.limiter,
+            budget=self.budget,
+            priority=BACKGROUND,
+        )
+
+    def fetch(self, row: dict):
+        """Metadata and poster of a row (runs in the worker threads)"""
+        try:
+            movie = self.api.lookup_movie(imdbid=row["imdbid"], title=row["title"], year=row["year"])
+        except MovieNotFound as e:
+            if str(e) in NOT_FOUND_ERRORS:
+                return None, "N/A"
+            raise ImportStopped(str(e))
+
+        poster_local_path = "N/A"
+        poster_link = movie.get("poster", "N/A")
+        if self.posters and poster_link and poster_link != "N/A":
+            file_path = poster_file_path(poster_link)
+            try:
+                if not file_path.exists():
+                    download_poster(poster_link, file_path, max_bytes=POSTER_MAX_BYTES)
+                poster_local_path = str(file_path.resolve())
+            except Exception:
+                # A broken poster link should not lose the review
+                pass
+        return movie, poster_local_path
+
+    def run(self, csv_path: Path) -> dict:
+        """Import every row that is not done yet, returns how many rows ended in each state
+
+        counts["stopped"] holds the reason when the import stopped early (run it again to resume).
+        """
+        source = source_id(csv_path)
+        done = self.database.get_import_progress(source)
+        total = sum(1 for _ in read_rows(csv_path))
+        counts = {"imported": 0, "exists": 0, "missing": 0, "failed": 0, "resumed": len(done)}
+
+        # {imdbid: entry} of the batch, a movie listed twice is only upserted and counted once
+        movies, skipped = {}, []
+
+        def flush():
+            if movies or skipped:
+                self.database.store_imported_movies(source, list(movies.values()), skipped)
+                movies.clear()
+                skipped.clear()
+
+        def skip(row: dict, imdbid, status: str):
+            skipped.append((row["key"], imdbid, status))
+            counts[status] += 1
+
+        progress = Progress(
+            TextColumn("[bold]Importing"),
+            BarColumn(),
+            MofNCompleteColumn(),
+            TextColumn("[dim]{task.fields[title]}"),
+            TimeRemainingColumn(),
+            console=console,
+        )
+        executor = ThreadPoolExecutor(max_workers=self.workers)
+        in_flight = {}
+        rows = (row for row in read_rows(csv_path) if row["key"] not in done)
+        try:
+            with progress:
+                task = progress.add_task("import", total=total, completed=len(done), title="")
+                more_rows = True
+                while more_rows or in_flight:
+                    # Keep the queue short, so the file is streamed and stopping is quick
+                    while more_rows and len(in_flight) < self.workers * 2:
+                        row = next(rows, None)
+                        if row is None:
+                            more_rows = False
+                            break
+                        # Already reviewed movies keep their review, and cost no request
+                        imdbid = row["imdbid"] or self.database.find_imdbid(row["title"], row["year"])
+                        if imdbid and self.database.get_movie_metadata_by_imdbid(imdbid):
+                            skip(row, imdbid, "exists")
+                            progress.advance(task)
+                            continue
+                        in_flight[executor.submit(self.fetch, row)] = row
+
+                    if not in_flight:
+                        continue
+                    finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        row = in_flight.pop(future)
+                        progress.advance(task)
+                        try:
+                            movie, poster_local_path = future.result()
+                        except (QuotaExhausted, ImportStopped) as e:
+                            # Let the running lookups finish, but start no new one
+                            counts["stopped"] = str(e)
+                            more_rows = False
+                            continue
+                        except Exception:
+                            # Not checkpointed, so the next run tries the row again
+                            counts["failed"] += 1
+                            continue
+
+                        if movie is None:
+                            skip(row, None, "missing")
+                            continue
+                        progress.update(task, title=movie["title"])
+                        if self.database.get_movie_metadata_by_imdbid(movie["imdbid"]):
+                            skip(row, movie["imdbid"], "exists")
+                            continue
+                        entry = (row["key"], movie, poster_local_path, row["star"], row["review"])
+                        earlier = movies.get(movie["imdbid"])
+                        if earlier is None:
+                            counts["imported"] += 1
+                        elif int(earlier[0]) < int(row["key"]):
+                            # The same movie twice in the batch, the row further down the file wins
+                            skip({"key": earlier[0]}, movie["imdbid"], "exists")
+                        else:
+                            # Fetched after a later row of the same movie
+                            skip(row, movie["imdbid"], "exists")
+                            continue
+                        movies[movie["imdbid"]] = entry
+
+                    if len(movies) + len(skipped) >= self.batch_size:
+                        flush()
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+            # Whatever finished is kept, even when the import stops halfway
+            flush()
+        return counts
@@ -0,0 +1,29 @@
+from importlib import import_module
+
+
+def load(target: str):
+    """Import an object from its "module:attribute" path"""
+    module_name, _, attribute = target.partition(":")
+    module = import_module(module_name)
+    return getattr(module, attribute) if attribute else module
+
+
+class LazyInstance:
+    """Stand-in that builds the real instance on first use
+
+    Lets modules keep their global managers while only importing heavy
+    libraries (requests, numpy, Pillow..) for the commands that need them.
+    """
+
+    def __init__(self, target: str, **kwargs) -> None:
+        self._target = target
+        self._kwargs = kwargs
+        self._instance = None
+
+    def get_instance(self):
+        if self._instance is None:
+            self._instance = load(self._target)(**self._kwargs)
+        return self._instance
+
+    def __getattr__(self, name: str):
+        return getattr(self.get_instance(), name)
@@ -1,14 +1,11 @@
 import typer
 import click
-from iterfzf import iterfzf
 from rich.console import Console
 from typing import Optional
 from pathlib import Path
 
 from .config import ConfigManager
-from .display import DisplayManager
-from .movie import MovieManager
-from .database import DatabaseManager
+from .lazy import LazyInstance
 from .moai import Moai
 from .menu import MenuManager
 from .path import PathManager
@@ -17,10 +14,18 @@ app = typer.Typer(
     help="MVW - CLI MoVie revieW",
     context_settings={"help_option_names": ["-h", "--help"]},
 )
+index_app = typer.Typer(
+    help="Local movie title index, so searching needs no OMDb request",
+    context_settings={"help_option_names": ["-h", "--help"]},
+)
+app.add_typer(index_app, name="index")
 
 config_manager = ConfigManager()
-movie_manager = MovieManager()
-database_manager = DatabaseManager()
+# Only created when a command uses them (keeps `mvw config` from importing requests & co)
+movie_manager = LazyInstance("mvw.movie:MovieManager")
+database_manager = LazyInstance("mvw.database:DatabaseManager")
+# Previews only read, and many of them run while another mvw process writes
+reader_database_manager = LazyInstance("mvw.database:DatabaseManager", read_only=True)
 moai = Moai()
 console = Console()
 menu = MenuManager()
@@ -73,6 +78,19 @@ def config(
     charset: Optional[str] = typer.Option(
         None, "--charset", "-c", help="Set ASCII charset (minimal, dots, blocks) for ascii renderer"
         ),
+    offline: Optional[bool] = typer.Option(
+        None,
+        "--offline",
+        "-o",
+        help="Toggle offline mode (only use cached OMDb responses)",
+        show_default=False,
+    ),
+    daily_limit: Optional[int] = typer.Option(
+        None, "--daily-limit", "-dl", min=1, help="Set the OMDb requests per day of your key (free: 1000)"
+    ),
+    color_tolerance: Optional[int] = typer.Option(
+        None, "--color-tolerance", "-ct", min=0, max=255, help="Merge pixel poster colors this close (0: exact)"
+    ),
 ):
     """Config the settings"""
     if reset:
@@ -95,7 +113,7 @@ def config(
         config_manager.set_config("USER", "name", name)
 
     if moai_says:
-        moai_bool = config_manager.get_config("UI", "moai").lower() == "true"
+        moai_bool = config_manager.get_bool("UI", "moai")
 
         if moai_bool:
             moai.says(
@@ -107,7 +125,7 @@ def config(
             moai.says(f"[green]Hi, nice to see you again![/]", type="fun")
 
     if review:
-        review_bool = config_manager.get_config("UI", "review").lower() == "true"
+        review_bool = config_manager.get_bool("UI", "review")
 
         if review_bool:
             moai.says(f"[dim]The review will be hidden[/]", type="sad")
@@ -121,7 +139,7 @@ def config(
 
     if worldwide_boxoffice:
         worldwide_boxoffice_bool = (
-            config_manager.get_config("DATA", "worldwide_boxoffice").lower() == "true"
+            config_manager.get_bool("DATA", "worldwide_boxoffice")
         )
         if worldwide_boxoffice_bool:
             config_manager.set_config("DATA", "worldwide_boxoffice", "false")
@@ -146,7 +164,7 @@ def config(
 
     if poster_border:
         poster_border_bool = (
-            config_manager.get_config("UI", "poster_border").lower() == "true"
+            config_manager.get_bool("UI", "poster_border")
         )
         if poster_border_bool:
             config_manager.set_config("UI", "poster_border", "false")
@@ -156,7 +174,7 @@ def config(
             config_manager.set_config("UI", "poster_border", "true")
 
     if hide_key:
-        hide_key_bool = config_manager.get_config("UI", "hide_key").lower() == "true"
+        hide_key_bool = config_manager.get_bool("UI", "hide_key")
         if hide_key_bool:
             config_manager.set_config("UI", "hide_key", "false")
             moai.says(
@@ -204,18 +222,55 @@ def config(
               type="nerd",
           )
 
+    if offline:
+        offline_bool = config_manager.get_bool("CACHE", "offline")
+        if offline_bool:
+            config_manager.set_config("CACHE", "offline", "false")
+            moai.says(f"[green]Back [italic]online[/italic], OMDb will be used again[/]", type="fun")
+        else:
+            config_manager.set_config("CACHE", "offline", "true")
+            moai.says(
+                f"[yellow]Offline mode, only [italic]cached[/italic] OMDb responses will be used[/]",
+                type="nerd",
+            )
+
+    if daily_limit:
+        config_manager.set_config("API", "daily_limit", str(daily_limit))
+        moai.says(
+            f"[green]✓ The OMDb daily limit ({daily_limit}) [italic]configured[/italic] successfully[/]",
+            type="fun",
+        )
+
+    if color_tolerance is not None:
+        config_manager.set_config("UI", "color_tolerance", str(color_tolerance))
+        moai.says(
+            f"[green]✓ The color tolerance ({color_tolerance}) [italic]configured[/italic] successfully[/]",
+            type="fun",
+        )
+
     config_manager.show_config()
 
+    if config_manager.get_config("API", "omdb_api_key"):
+        from .quota import QuotaBudget
+
+        budget = QuotaBudget.from_config(config_manager)
+        console.print(
+            f"[dim]OMDb requests left today: [/][yellow]{budget.remaining()}[/][dim] / {budget.daily_limit}"
+            f" (imports stop at {budget.reserve} left)[/]"
+        )
+
 
 @app.command(hidden=True)
 def edit(movie, poster_path: str = "", already_reviewed: bool = True):
     """Edit the star and review"""
+    from .display import DisplayManager
+
     if already_reviewed:
         display_manager = DisplayManager(movie, movie["poster_local_path"])
         display_manager.display_movie_info(movie["star"], movie["review"])
 
         moai.says(
-            f"[yellow]It seems like your past rating is {movie['star']}.\n"
+            f"[yellow]It seems like your past rating is {'-' if movie['star'] in (None, '') else movie['star']}.\n"
             f"    [dim]Press [bold]ENTER[/bold] if want to skip it[/]",
             type="nerd",
         )
@@ -293,12 +348,19 @@ def edit(movie, poster_path: str = "", already_reviewed: bool = True):
 @app.command(hidden=True)
 def save(movie, poster_local_path):
     """Save the movie display info"""
-    DisplayManager(movie, poster_local_path).save_display_movie_info()
+    from .display import DisplayManager
+
+    # The card shows the stored star, review and (worldwide) boxoffice
+    stored_movie = database_manager.get_movie_metadata_by_imdbid(movie["imdbid"])
+    DisplayManager(stored_movie, poster_local_path).save_display_movie_info()
 
 
 @app.command()
 def interactive(title: str):
     """(DEFAULT) Search the movie title, star, edit, and save"""
+    from iterfzf import iterfzf
+    from .display import DisplayManager
+
     if config_manager.get_config("API", "omdb_api_key"):
         moai.title()
         moai.says(
@@ -315,49 +377,70 @@ def interactive(title: str):
         if not title:
             title = click.prompt("MVW  ", prompt_suffix="> ")
 
-        search_response = movie_manager.search_movie(title)
-
-        try:
-            search_movies_list = search_response.get("search", [])
-
-            search_movie_map = {
-                f"{m['Title']} ({m['Year']})": m["imdbID"] for m in search_movies_list
-            }
-
-            choice = iterfzf(search_movie_map.keys())
+        from .movie import PosterPrefetcher
+
+        search_movie_map = {}
+        prefetcher = PosterPrefetcher()
+
+        def search_results():
+            # Fed to fzf while the next pages (and the posters) are still loading
+            for m in movie_manager.search_movie(title):
+                poster_file = prefetcher.submit(m.get("Poster", ""))
+                poster_name = poster_file.name if poster_file else ""
+                line = f"{m['Title']} ({m['Year']})\t{poster_name}"
+                if line not in search_movie_map:
+                    search_movie_map[line] = m["imdbID"]
+                    yield line
+
+        choice = iterfzf(
+            search_results(),
+            preview="mvw-preview --title {1} --poster {2}",
+            __extra__=["--delimiter=\t", "--with-nth=1"],
+        )
 
-            if choice:
-                selected_id = search_movie_map[choice]  # pyright: ignore
-            else:
+        if not choice:
+            prefetcher.cancel()
+            if search_movie_map:
                 moai.says(
                     "[yellow]It seems like you did not choose any movie[/]", type="nerd"
                 )
-        except AttributeError:
-            selected_id = search_response["imdbid"]
+            return
 
-        movie: dict = movie_manager.fetch_movie_metadata(imdbid=selected_id)
-        poster_path = movie_manager.fetch_poster()
+        selected_id = search_movie_map[choice]  # pyright: ignore
+        # Runs while the poster is fetched and the review is written
+        enrichment = movie_manager.start_enrichment(selected_id)
+        try:
+            movie: dict = movie_manager.fetch_movie_metadata(imdbid=selected_id)
+            poster_path = movie_manager.fetch_poster(prefetcher)
 
-        if poster_path == None:
-            poster_path = "N/A"
-        else:
-            poster_path = str(poster_path.resolve())
+            if poster_path == None:
+                poster_path = "N/A"
+            else:
+                poster_path = str(poster_path.resolve())
 
-        movie_already_reviewed = database_manager.get_movie_metadata_by_title(
-            movie["title"]
-        )
-        already_reviewed = False
+            # By imdbid, a remake or a title differing only in case is another movie
+            movie_already_reviewed = database_manager.get_movie_metadata_by_imdbid(
+                movie["imdbid"]
+            )
+            already_reviewed = False
 
-        if movie_already_reviewed:
-            movie = movie_already_reviewed
-            already_reviewed = True
+            if movie_already_reviewed:
+                movie = movie_already_reviewed
+                already_reviewed = True
 
-        star_review = edit(movie, poster_path, already_reviewed)
+            star_review = edit(movie, poster_path, already_reviewed)
 
-        # Get the latest update (incase worldwide boxoffice)
-        database_manager.store_movie_metadata(
-            movie, poster_path, star=star_review[0], review=star_review[1]
-        )
+            # Get the latest update (incase worldwide boxoffice)
+            database_manager.store_movie_metadata(
+                movie,
+                poster_path,
+                star=star_review[0],
+                review=star_review[1],
+                enrichment=enrichment,
+            )
+        finally:
+            # A review left halfway does not wait for lookups that never started
+            enrichment.cancel()
 
         moai.says(
             'Do you want to have an [cyan]"image"[/] of your review?\nP/S: To change the theme, try [yellow]`mvw config -t <THEME>`[/]',
@@ -384,19 +467,47 @@ def interactive(title: str):
 
 
 @app.command()
-def list():
+def list(
+    genre: Optional[str] = typer.Option(None, "--genre", "-g", help="Only this genre (e.g. Drama)"),
+    director: Optional[str] = typer.Option(None, "--director", "-d", help="Only this director (full name)"),
+    actor: Optional[str] = typer.Option(None, "--actor", "-a", help="Only movies with this actor (full name)"),
+    min_star: Optional[float] = typer.Option(None, "--min-star", "-s", min=0, max=5, help="Only movies you rated at least this"),
+    year: Optional[str] = typer.Option(None, "--year", "-y", help="Only movies from this year"),
+):
     """List all the reviewed movies"""
-    all_reviewed_movies = database_manager.get_all_movies()
+    from itertools import chain
+    from iterfzf import iterfzf
+    from .database import SCHEMA_VERSION, schema_version
 
-    movie_map = {movie["title"]: movie for movie in all_reviewed_movies}
+    if path.db_path.exists() and schema_version(path.db_path) < SCHEMA_VERSION:
+        # Upgraded once here by the writer, so the preview processes fzf starts only read
+        database_manager.get_instance()
 
-    selected_title = iterfzf(
-        movie_map.keys(), preview="mvw preview -t {}", ansi=True, multi=False
+    movies = reader_database_manager.iter_movie_list(
+        genre=genre, director=director, actor=actor, min_star=min_star, year=year
     )
+    first_movie = next(movies, None)
+    if first_movie is None:
+        moai.says("[yellow]It seems like no reviewed movie matches[/]", type="nerd")
+        return
 
-    if selected_title:
-        metadata = movie_map.get(selected_title)
-        imdbid: str = str(metadata.get("imdbid"))
+    def movie_lines():
+        # Only the shown columns, fed to fzf while the rest is still being read
+        for imdbid, title, movie_year, star in chain([first_movie], movies):
+            # Unrated movies (NULL star) show a dash instead of "None"
+            yield f"{title} ({movie_year})  ★ {'-' if star in (None, '') else star}\t{imdbid}"
+
+    selected = iterfzf(
+        movie_lines(),
+        preview="mvw-preview -i {2}",
+        ansi=True,
+        multi=False,
+        __extra__=["--delimiter=\t", "--with-nth=1"],
+    )
+
+    if selected:
+        # The imdbid is the hidden last field, so movies with the same title stay apart
+        imdbid: str = selected.rsplit("\t", 1)[-1]
 
         movie = database_manager.get_movie_metadata_by_imdbid(imdbid)
 
@@ -429,7 +540,7 @@ def poster(
         None,
         "--title",
         "-t",
-        help="Change the poster for movie with title (for now, need the exact title like in the review (case-sensitive))",
+        help="Change the poster for movie with title (the exact title like in the review, case-insensitive)",
     ),
 ):
     """Change the poster for movies"""
@@ -440,7 +551,6 @@ def poster(
         )
         return
 
-    attribute = "poster_local_path"
     print(poster_path)
 
     if poster_path == "":
@@ -456,13 +566,17 @@ def poster(
         return
 
     if path.valid_image_path(str(new_poster_path)):
+        from .thumbnails import without_building
+
         if imdbid:
-            preview(imdbid=imdbid, poster_path=str(new_poster_path))
+            # Nothing is stored for the new poster until the change is confirmed
+            with without_building():
+                preview(imdbid=imdbid, poster_path=str(new_poster_path))
             change = click.confirm(
                 "MVW  change", default=True, prompt_suffix="? ", show_default=True
             )
             if change:
-                database_manager.set_key_value(imdbid, attribute, new_poster_path)
+                replace_poster(imdbid, str(new_poster_path))
             else:
                 moai.says(
                     f"[yellow]✓ Don't worry, your poster ({imdbid}) [italic]remain[/italic] as before.[/]",
@@ -470,12 +584,13 @@ def poster(
                 )
                 preview(imdbid=imdbid)
         elif title:
-            preview(title=title, poster_path=str(new_poster_path))
+            with without_building():
+                preview(title=title, poster_path=str(new_poster_path))
             change = click.confirm(
                 "MVW  change", default=True, prompt_suffix="? ", show_default=True
             )
             if change:
-                database_manager.set_key_value(title, attribute, new_poster_path)
+                replace_poster(title, str(new_poster_path), use_title=True)
             else:
                 moai.says(
                     f"[yellow]✓ Don't worry, your poster ({title}) [italic]remain[/italic] as before.[/]",
@@ -491,6 +606,33 @@ def poster(
         return
 
 
+def drop_thumbnails(poster_local_path: Optional[str], keep: Optional[str] = None):
+    """Remove the thumbnails of a poster no movie uses anymore (unless it is `keep`)"""
+    if not poster_local_path or poster_local_path == "N/A":
+        return
+    if keep and Path(poster_local_path).resolve() == Path(keep).resolve():
+        return
+    if database_manager.poster_in_use(poster_local_path):
+        return
+    from .thumbnails import ThumbnailStore
+
+    ThumbnailStore().remove(Path(poster_local_path))
+
+
+def replace_poster(identifier: str, new_poster_path: str, use_title: bool = False):
+    """Point the movie to the new poster, build its thumbnails and drop the old poster's"""
+    from .thumbnails import ThumbnailStore
+
+    if use_title:
+        movie = database_manager.get_movie_metadata_by_title(identifier)
+    else:
+        movie = database_manager.get_movie_metadata_by_imdbid(identifier)
+    database_manager.set_key_value(identifier, "poster_local_path", new_poster_path, use_title=use_title)
+    # Decoded once here, every later render reads the thumbnails
+    ThumbnailStore().refresh(Path(new_poster_path))
+    drop_thumbnails(movie["poster_local_path"] if movie else None, keep=new_poster_path)
+
+
 @app.command()
 def preview(
     poster_path: str = "",
@@ -501,10 +643,12 @@ def preview(
         None,
         "--title",
         "-t",
-        help="Preview the review using title (for now, need the exact title like in the review (case-sensitive))",
+        help="Preview the review using title (the exact title like in the review, case-insensitive)",
     ),
 ):
     """Preview reviewed movies"""
+    from .display import DisplayManager
+
     if not (imdbid or title):
         moai.says(
             "Choose either to preview using [cyan]id[/] or [indian_red]title[/], try [yellow]`preview -h`[/]",
@@ -513,9 +657,9 @@ def preview(
         return
 
     if imdbid:
-        previewed_movie = database_manager.get_movie_metadata_by_imdbid(imdbid)
+        previewed_movie = reader_database_manager.get_movie_metadata_by_imdbid(imdbid)
     elif title:
-        previewed_movie = database_manager.get_movie_metadata_by_title(title)
+        previewed_movie = reader_database_manager.get_movie_metadata_by_title(title)
 
     print(poster_path)
     if poster_path == "":
@@ -532,6 +676,19 @@ def preview(
         )
 
 
+@app.command(hidden=True)
+def preview_poster(
+    poster: str = typer.Option("", "--poster", "-p", help="Poster file name in the posters dir"),
+    title: str = typer.Option("", "--title", "-t", help="Title shown under the poster"),
+):
+    """Preview a poster of the search results (before it is reviewed)"""
+    from .display import DisplayManager, console as display_console
+
+    poster_file = path.poster_dir / Path(poster).name if poster.strip() else ""
+    display_manager = DisplayManager({"title": title.strip()}, poster_file)
+    display_console.print(display_manager.poster_panel())
+
+
 @app.command()
 def delete(
     imdbid: Optional[str] = typer.Option(
@@ -541,7 +698,7 @@ def delete(
         None,
         "--title",
         "-t",
-        help="Delete the review movie using title (for now, need the exact title like in the review (case-sensitive))",
+        help="Delete the review movie using title (the exact title like in the review, case-insensitive)",
     ),
 ):
     """Delete reviewed movies"""
@@ -562,7 +719,9 @@ def delete(
             "MVW  delete", default=True, prompt_suffix="? ", show_default=True
         )
         if delete:
+            movie = database_manager.get_movie_metadata_by_imdbid(imdbid)
             database_manager.delete_movie_entry_by_id(imdbid)
+            drop_thumbnails(movie["poster_local_path"] if movie else None)
     elif title:
         preview(imdbid=None, title=title, poster_path="")
         moai.says(
@@ -573,7 +732,287 @@ def delete(
             "MVW  delete", default=True, prompt_suffix="? ", show_default=True
         )
         if delete:
+            movie = database_manager.get_movie_metadata_by_title(title)
             database_manager.delete_movie_entry_by_title(title)
+            drop_thumbnails(movie["poster_local_path"] if movie else None)
+
+
+@app.command(name="import")
+def import_reviews(
+    csv_path: Path = typer.Argument(..., exists=True, dir_okay=False, help="Letterboxd ratings.csv / reviews.csv or IMDb ratings export"),
+    workers: int = typer.Option(4, "--workers", "-w", min=1, help="Movies fetched at the same time"),
+    rate: float = typer.Option(5.0, "--rate", "-r", min=0.1, help="Maximum OMDb requests per second"),
+    max_requests: Optional[int] = typer.Option(None, "--max-requests", "-m", min=1, help="Stop after this many OMDb requests (default: what is left of today's budget)"),
+    posters: bool = typer.Option(True, "--posters/--no-posters", help="Download the posters too"),
+):
+    """Import your ratings and reviews from Letterboxd or IMDb (resumes where it stopped)"""
+    if not config_manager.get_config("API", "omdb_api_key"):
+        moai.says(
+            "Hi, I could [indian_red]not found[/] your [bold]API key[/], try [italic yellow]`mvw config --help`[/]",
+            type="info",
+        )
+        return
+
+    from .importer import CsvImporter
+
+    importer = CsvImporter(
+        database_manager.get_instance(),
+        workers=workers,
+        rate=rate,
+        max_requests=max_requests,
+        posters=posters,
+    )
+    try:
+        counts = importer.run(csv_path)
+    except ValueError as e:
+        moai.says(f"[indian_red]x Sorry, {e}[/]", type="error")
+        return
+
+    moai.says(
+        f"[green]✓ {counts['imported']} movies [italic]imported[/italic][/]\n"
+        f"[dim]{counts['exists']} already reviewed, {counts['missing']} not found on OMDb, "
+        f"{counts['failed']} failed, {counts['resumed']} done in an earlier run[/]",
+        type="fun",
+    )
+    if "stopped" in counts or counts["failed"]:
+        reason = f"The import stopped early ({counts['stopped']})" if "stopped" in counts else "Some movies could not be fetched"
+        moai.says(
+            f"[yellow]{reason}\n"
+            f"[dim]Run [yellow]`mvw import {csv_path}`[/yellow] again later to continue[/]",
+            type="nerd",
+        )
+
+
+@app.command()
+def export(
+    out_path: str = typer.Argument(..., help="File to write (.jsonl or .csv), or - for stdout"),
+    format: Optional[str] = typer.Option(None, "--format", "-f", help="jsonl or csv (default: from the file extension)"),
+    poster_archive: Optional[str] = typer.Option(None, "--posters", "-p", help="Also bundle the posters into this tar file"),
+):
+    """Export every review to JSONL or CSV"""
+    from .backup import FORMATS, detect_format, export_movies
+
+    format = detect_format(out_path, format)
+    if format not in FORMATS:
+        moai.says(f"[indian_red]x Sorry, the format must be one of: {', '.join(FORMATS)}[/]", type="error")
+        return
+
+    count = export_movies(reader_database_manager.get_instance(), out_path, format, poster_archive)
+    if out_path != "-":
+        moai.says(f"[green]✓ {count} movies [italic]exported[/italic] to {out_path}[/]", type="fun")
+
+
+@app.command()
+def restore(
+    in_path: Path = typer.Argument(..., exists=True, dir_okay=False, help="File written by `mvw export`"),
+    format: Optional[str] = typer.Option(None, "--format", "-f", help="jsonl or csv (default: from the file extension)"),
+    poster_archive: Optional[Path] = typer.Option(None, "--posters", "-p", exists=True, dir_okay=False, help="Tar file of posters written by `mvw export`"),
+):
+    """Restore the reviews of an export (the existing ones are updated)"""
+    from .backup import FORMATS, detect_format, restore_movies
+
+    format = detect_format(str(in_path), format)
+    if format not in FORMATS:
+        moai.says(f"[indian_red]x Sorry, the format must be one of: {', '.join(FORMATS)}[/]", type="error")
+        return
+
+    try:
+        count = restore_movies(database_manager.get_instance(), str(in_path), format, poster_archive and str(poster_archive))
+    except (ValueError, KeyError) as e:
+        moai.says(f"[indian_red]x Sorry, this is not an `mvw export` file ({e})[/]", type="error")
+        return
+    moai.says(f"[green]✓ {count} movies [italic]restored[/italic] successfully[/]", type="fun")
+
+
+@app.command(name="export-cards")
+def export_cards(
+    out_dir: Optional[Path] = typer.Argument(None, file_okay=False, help="Folder of the gallery (default: mvw-cards in your pictures)"),
+    workers: Optional[int] = typer.Option(None, "--workers", "-w", min=1, help="Cards rendered at the same time (default: CPU count)"),
+    force: bool = typer.Option(False, "--force", "-f", help="Render every card again, even the unchanged ones"),
+    embed_posters: bool = typer.Option(False, "--embed-posters", "-e", help="Embed the posters as images (much smaller files)"),
+):
+    """Save the card of every review as SVG, with an index.html gallery"""
+    from rich.progress import BarColumn, MofNCompleteColumn, Progress, TextColumn, TimeRemainingColumn
+    from .gallery import INDEX_NAME, export_cards as build_gallery
+
+    out_dir = out_dir or path.screenshot_dir / "mvw-cards"
+    progress = Progress(
+        TextColumn("[bold]Rendering"),
+        BarColumn(),
+        MofNCompleteColumn(),
+        TimeRemainingColumn(),
+        console=console,
+    )
+    task = progress.add_task("cards", total=None)
+
+    def report(done: int, total: int):
+        progress.update(task, completed=done, total=total)
+
+    with progress:
+        counts = build_gallery(reader_database_manager.get_instance(), out_dir, workers=workers, force=force, embed_posters=embed_posters, progress=report)
+    moai.says(
+        f"[green]✓ {counts['rendered']} cards [italic]rendered[/italic] to {out_dir / INDEX_NAME}[/]\n"
+        f"[dim]{counts['unchanged']} unchanged, {counts['removed']} removed, {counts['failed']} failed[/]",
+        type="fun",
+    )
+
+
+def highlight_snippet(snippet: str):
+    """Text of a search snippet with the terms between \\x02 and \\x03 highlighted"""
+    import re
+    from rich.text import Text
+
+    highlighted = Text()
+    style = None
+    for part in re.split(r"([\x02\x03])", snippet):
+        if part == "\x02":
+            style = "bold yellow"
+        elif part == "\x03":
+            style = None
+        elif part:
+            highlighted.append(part, style=style)
+    return highlighted
+
+
+@app.command()
+def search(
+    text: str = typer.Argument(..., help="Words to find in the plots, reviews, actors, directors.."),
+    limit: int = typer.Option(20, "--limit", "-l", help="Maximum number of results"),
+):
+    """Full-text search through the reviewed movies"""
+    from rich.markup import escape
+    from rich.table import Table
+    from rich.box import ROUNDED
+
+    results = reader_database_manager.search_movies(text, limit=limit)
+    if not results:
+        moai.says(f"[indian_red]x Sorry, nothing matches [italic]{escape(text)}[/italic][/]", type="error")
+        return
+
+    table = Table(title=f"[light_steel_blue3]Search: {escape(text)}[/]", box=ROUNDED)
+    table.add_column("Title", style="cyan")
+    table.add_column("IMDB ID", style="dim")
+    table.add_column("Star", style="yellow", justify="right")
+    table.add_column("Match")
+
+    for movie in results:
+        snippet = highlight_snippet(movie["snippet"] or "")
+        table.add_row(
+            escape(f"{movie['title']} ({movie['year']})"),
+            movie["imdbid"],
+            str(movie["star"] or ""),
+            snippet,
+        )
+
+    console.print(" ")
+    console.print(table)
+    console.print(" ")
+
+
+@index_app.command("build")
+def index_build(
+    basics: Path = typer.Argument(..., exists=True, dir_okay=False, help="title.basics.tsv.gz from https://datasets.imdbws.com"),
+    ratings: Optional[Path] = typer.Option(None, "--ratings", "-r", exists=True, dir_okay=False, help="title.ratings.tsv.gz, popular movies are listed first"),
+):
+    """Build the title index from IMDb's datasets"""
+    from rich.progress import BarColumn, DownloadColumn, Progress, TextColumn, TimeRemainingColumn
+    from .title_index import TitleIndex
+
+    progress = Progress(
+        TextColumn("[bold]{task.description}"),
+        BarColumn(),
+        DownloadColumn(),
+        TimeRemainingColumn(),
+        console=console,
+    )
+    tasks = {}
+
+    def report(dataset: str, done: int, total: int):
+        if dataset not in tasks:
+            tasks[dataset] = progress.add_task(dataset, total=total)
+        progress.update(tasks[dataset], completed=done)
+
+    with progress:
+        count = TitleIndex().build(basics, ratings, progress=report)
+    moai.says(
+        f"[green]✓ {count} movies [italic]indexed[/italic] successfully[/]\n"
+        "[dim]Searching now lists them without any OMDb request[/]",
+        type="fun",
+    )
+
+
+@index_app.command("remove")
+def index_remove():
+    """Remove the title index (searching goes back to OMDb)"""
+    from .title_index import TitleIndex
+
+    if TitleIndex().remove():
+        moai.says(f"[green]✓ Title index [italic]removed[/italic][/]", type="fun")
+    else:
+        moai.says(f"[yellow]There is no title index yet, try [italic]`mvw index build`[/italic][/]", type="nerd")
+
+
+@app.command()
+def cache(
+    clear: bool = typer.Option(
+        False, "--clear", "-c", help="Remove every cached OMDb response"
+    ),
+    expired: bool = typer.Option(
+        False, "--expired", "-e", help="Remove only the expired OMDb responses"
+    ),
+):
+    """Show or evict the cached OMDb responses"""
+    from rich.table import Table
+    from rich.box import ROUNDED
+    from .cache import ResponseCache
+
+    response_cache = ResponseCache.from_config(config_manager)
+
+    if clear or expired:
+        removed = response_cache.evict(expired_only=not clear)
+        moai.says(
+            f"[green]✓ {removed} cached responses [italic]removed[/italic] successfully[/]",
+            type="fun",
+        )
+
+    table = Table(title="[light_steel_blue3]OMDb Response Cache[/]", box=ROUNDED)
+    table.add_column("Endpoint", style="cyan")
+    table.add_column("Entries", style="yellow", justify="right")
+    table.add_column("Hits", style="green", justify="right")
+    table.add_column("Misses", style="indian_red", justify="right")
+
+    for endpoint, entries, hits, misses in response_cache.stats():
+        table.add_row(endpoint, str(entries), str(hits), str(misses))
+
+    console.print(" ")
+    console.print(table)
+    console.print(" ")
+
+
+@app.command()
+def daemon(
+    stop: bool = typer.Option(
+        False, "--stop", "-s", help="Stop the running preview daemon"
+    ),
+):
+    """Run the preview daemon so the previews in `list` show instantly"""
+    from . import daemon as preview_daemon
+
+    if stop:
+        if preview_daemon.stop():
+            moai.says(f"[green]✓ Preview daemon [italic]stopped[/italic][/]", type="fun")
+        else:
+            moai.says(f"[yellow]The preview daemon is not running[/]", type="nerd")
+        return
+
+    if preview_daemon.start():
+        moai.says(
+            f"[green]✓ Preview daemon [italic]started[/italic] successfully[/]\n"
+            "[dim]Run [yellow]`mvw daemon --stop`[/yellow] after changing the config[/]",
+            type="fun",
+        )
+    else:
+        moai.says(f"[yellow]The preview daemon is already running[/]", type="nerd")
 
 
 # Default to interactive
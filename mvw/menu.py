@@ -1,5 +1,3 @@
-from iterfzf import iterfzf
-
 # Should be run after selected in `mvw list`
 class MenuManager:
     """Handle any features in the menu"""
@@ -16,11 +14,13 @@ class MenuManager:
 
     def run(self, imdbid: str, prompt: str = "Select an option:"):
         """Display menu and execute"""
+        from iterfzf import iterfzf
+
         options = list(self.features.keys())
         choice = iterfzf(
             options,
             prompt = f"{prompt} >",
-            preview=f"mvw preview -i {imdbid}",
+            preview=f"mvw-preview -i {imdbid}",
         )
 
         if choice and choice in self.features:
@@ -56,7 +56,7 @@ class Moai:
         moai_says_table.add_column(vertical="middle") 
         word_panel = Panel(word, box=ROUNDED, border_style=mood["color"])
 
-        if config_manager.get_config("UI", "moai").lower() == "true":
+        if config_manager.get_bool("UI", "moai"):
             if moai == "small":
                 moai_says_table.add_row(current_moai_ascii, word_panel)
             elif moai == "no":
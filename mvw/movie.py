@@ -1,30 +1,58 @@
-from os import abort
-import requests
+import hashlib
+import os
+import re
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional
+from . import transport
 from .api import API
+from .cache import ResponseCache
+from .quota import INTERACTIVE, QuotaBudget
 from rich.console import Console
 
 from .path import PathManager
 from .moai import Moai
 from .config import ConfigManager
+from .thumbnails import ThumbnailStore
 
 path = PathManager()
 console = Console()
 config_manager = ConfigManager()
 moai = Moai()
+thumbnail_store = ThumbnailStore()
+
+BOXOFFICE_MOJO_URL = "https://www.boxofficemojo.com/title/{imdbid}/"
 
 class MovieManager:
     """Manage any resources and data regarding movies"""
     def __init__(self) -> None:
         self.api_key = config_manager.get_config("API", "omdb_api_key")
-        self.api = API(self.api_key)
+        self.response_cache = ResponseCache.from_config(config_manager)
+        self.api = API(
+            self.api_key,
+            cache=self.response_cache,
+            offline=config_manager.get_bool("CACHE", "offline"),
+            budget=QuotaBudget.from_config(config_manager),
+            priority=INTERACTIVE,
+        )
 
     def test_api_key(self, api_key: str) -> bool:
         """Test the validity of the API key"""
         try:
+            # Only a hash of the key is cached, so another key can never pass using it
+            key_hash = hashlib.sha256(api_key.encode()).hexdigest()
+            parameters = {"i": "tt3896198", "key": key_hash}
+            cached = self.response_cache.get("key_check", parameters)
+            if cached is not None:
+                return True
+
             # Create a new API_KEY so not use the self key
-            api = API(api_key)
+            api = API(api_key, budget=QuotaBudget.from_config(config_manager, api_key))
             movie = api.fetch_movie_metadata("tt3896198", silent=True)
             if movie:
+                self.response_cache.set("key_check", parameters, {"Response": "True"})
                 return True
             else:
                 return False
@@ -36,76 +64,65 @@ class MovieManager:
         try:
             self.movie = self.api.fetch_movie_metadata(imdbid=imdbid)
             return self.movie
+        except transport.QuotaExhausted:
+            self.api.search_error("Request limit reached!")
+            sys.exit(1)
         except Exception as e:
             moai.says(f"[indian_red]x Sorry, Fetching movie error ({e}) occured.[/]", type="error")
 
             if e == "Movie not found!":
                 console.print("You can check the title at [underline sky_blue2]https://www.omdb.org/en/us/search[/]")
-            abort()
+            sys.exit(1)
 
     def search_movie(self, title: str):
-        """Search movies that have a close name"""
-        try:
-            return self.api.search_movie(title=title)
-        except Exception as e:
-            if str(e) == "'Movie not found!'":
-                moai.says(
-                    f"[indian_red]x Sorry, The movie could not be found![/]\n"
-                    "          [dim]Try use imdbid:[/] [yellow]tt..[/]\n\n"
-                    "If still not found..  [dim]v--search here--v[/]\n"
-                    "      [underline sky_blue2]https://www.omdb.org/en/us/search[/]",
-                    type="error"
-                )
-            else:
-                console.print("hi")
-            abort()
+        """Search movies that have a close name, yields them as the pages arrive
+
+        The local title index (`mvw index build`) answers first, without any request.
+        """
+        from .title_index import TitleIndex
+
+        if not re.match(r'^tt\d+$', title.strip().lower()):
+            movies = TitleIndex().search(title)
+            if movies:
+                return iter(movies)
+
+        max_pages = config_manager.get_int("DATA", "search_max_pages", 5)
+        return self.api.search_movie(title=title, max_pages=max_pages)
 
     def fetch_box_office_worldwide(self, imdbid: str):
         """Import the worldwide boxoffice"""
-        from bs4 import BeautifulSoup
-        url = f"https://www.boxofficemojo.com/title/{imdbid}/"
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-        }
-
         with console.status("[bold]Searching Worldwide Boxoffice Data...", spinner="earth"):
             try:
-                response = requests.get(url, headers=headers)
-                soup = BeautifulSoup(response.text, 'html.parser')
-                money_spans = soup.find_all("span", class_="money")
-                # On Box Office Mojo title pages:
-                # Index 0 is usually Domestic, Index 1 is International, Index 2 is Worldwide
-                if len(money_spans) >= 3:
-                    return money_spans[2].text.strip()
-                elif len(money_spans) > 0:
-                    # If the movie only has one total, it might be the Worldwide/Domestic total
-                    return money_spans[-1].text.strip()
-                return None
+                return scrape_box_office_worldwide(imdbid)
             except Exception as e:
                 moai.says(f"[indian_red]x Sorry, Web Scrapping Error ({e}) occured.[/]", type="error")
 
-    def fetch_poster(self):
+    def start_enrichment(self, imdbid: str) -> "MovieEnrichment":
+        """Start the slow lookups of the movie in the background (awaited when it is stored)"""
+        lookups = {}
+        if config_manager.get_bool("DATA", "worldwide_boxoffice"):
+            lookups["boxoffice"] = scrape_box_office_worldwide
+        return MovieEnrichment(imdbid, lookups)
+
+    def fetch_poster(self, prefetcher=None):
         """Fetch movie poster and store in posters in data"""
         poster_link = self.movie['poster'] # pyright: ignore
+        file_path = poster_file_path(poster_link)
 
-        filename = poster_link.split("/")[-1].split("@")[0] + ".jpg"
-        file_path = path.poster_dir / filename
+        # The poster may already be downloading since the search
+        if prefetcher:
+            prefetcher.wait(poster_link)
 
         if file_path.exists():
-            moai.says(f"[yellow]It seems like your poster already existed\n[dim]    So.. no need to fetch a new one![/dim][/]", type="nerd")
+            # A poster the prefetcher just downloaded did not exist before
+            if not (prefetcher and prefetcher.fetched(poster_link)):
+                moai.says(f"[yellow]It seems like your poster already existed\n[dim]    So.. no need to fetch a new one![/dim][/]", type="nerd")
+            thumbnail_store.refresh(file_path)
             return file_path
 
         try:
-            response = requests.get(poster_link, stream=True, timeout=10)
-            response.raise_for_status() 
-
-            with open(file_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
-
+            download_poster(poster_link, file_path)
             moai.says(f"[green]✓ Poster saved successfully[/]", type="fun")
-            return file_path
-
         except Exception:
             moai.says(
                 f"[dim]We are very sorry because the [italic]poster link[/italic] is [indian_red]broken[/indian_red].. \n"
@@ -113,6 +130,171 @@ class MovieManager:
                 "        Try.. [yellow]`mvw list` -> `Change Poster`[/yellow]",
                 type="sad"
             )
+            return None
+
+        # Decoded once now, the renders only read the thumbnails
+        thumbnail_store.refresh(file_path)
+        return file_path
+
+
+def scrape_box_office_worldwide(imdbid: str):
+    """Scrape the worldwide boxoffice from Box Office Mojo (no output, raises on errors)"""
+    from bs4 import BeautifulSoup
+    url = BOXOFFICE_MOJO_URL.format(imdbid=imdbid)
+    headers = {
+        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+    }
+
+    response = transport.get(url, headers=headers)
+    soup = BeautifulSoup(response.text, 'html.parser')
+    money_spans = soup.find_all("span", class_="money")
+    # On Box Office Mojo title pages:
+    # Index 0 is usually Domestic, Index 1 is International, Index 2 is Worldwide
+    if len(money_spans) >= 3:
+        return money_spans[2].text.strip()
+    elif len(money_spans) > 0:
+        # If the movie only has one total, it might be the Worldwide/Domestic total
+        return money_spans[-1].text.strip()
+    return None
+
+
+class MovieEnrichment:
+    """Lookups of a movie running in the background while the user writes the review"""
+
+    def __init__(self, imdbid: str, lookups: dict) -> None:
+        self.imdbid = imdbid
+        self.futures = {}
+        self.executor = None
+        if lookups:
+            self.executor = ThreadPoolExecutor(max_workers=len(lookups))
+            for name, lookup in lookups.items():
+                self.futures[name] = self.executor.submit(lookup, imdbid)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.futures
+
+    def result(self, name: str, timeout: Optional[float] = 30):
+        """Wait for the lookup (quietly) and return its value, its error is raised here"""
+        return self.futures[name].result(timeout=timeout)
+
+    def cancel(self):
+        """Drop the lookups that did not start yet
+
+        A running lookup cannot be interrupted, the interpreter joins its thread
+        at exit. Its requests go through transport.get, so that wait is bounded
+        by transport.TIMEOUT (and its retries).
+        """
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+def poster_file_path(poster_link: str) -> Path:
+    """Where the poster of this link is stored in the data dir"""
+    filename = poster_link.split("/")[-1].split("@")[0] + ".jpg"
+    return path.poster_dir / filename
+
+
+def download_poster(poster_link: str, file_path: Path, max_bytes: Optional[int] = None, stop: Optional[threading.Event] = None):
+    """Download the poster into file_path (written only once it is complete)"""
+    tmp_path = file_path.with_name(f"{file_path.name}.{os.getpid()}.{threading.get_ident()}.part")
+    try:
+        response = transport.get(poster_link, stream=True)
+        response.raise_for_status()
+
+        size = 0
+        with open(tmp_path, 'wb') as f:
+            for chunk in response.iter_content(chunk_size=8192):
+                if stop is not None and stop.is_set():
+                    raise PrefetchCancelled(poster_link)
+                size += len(chunk)
+                if max_bytes is not None and size > max_bytes:
+                    raise PrefetchCancelled(f"{poster_link} is larger than {max_bytes} bytes")
+                f.write(chunk)
+
+        os.replace(tmp_path, file_path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+
+class PrefetchCancelled(Exception):
+    """The poster prefetch was cancelled or went over the size cap"""
+
+
+class PosterPrefetcher:
+    """Download the posters of the search results while the user is still choosing"""
+
+    def __init__(self, max_workers: int = 4, max_posters: int = 20, max_bytes: int = 5 * 1024 * 1024) -> None:
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.max_posters = max_posters
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.futures = {}
+        self.stops = {}
+        self.created = set()
+
+    def submit(self, poster_link: str):
+        """Queue the poster (in result rank order), returns where it will be stored"""
+        if not poster_link or poster_link == "N/A":
+            return None
+
+        file_path = poster_file_path(poster_link)
+        if poster_link in self.futures or file_path.exists():
+            return file_path
+
+        if len(self.futures) >= self.max_posters:
+            return None
+
+        self.stops[poster_link] = threading.Event()
+        self.futures[poster_link] = self.executor.submit(self._download, poster_link, file_path)
+        return file_path
+
+    def _download(self, poster_link: str, file_path: Path):
+        stop = self.stops[poster_link]
+        if stop.is_set():
+            return
+        download_poster(poster_link, file_path, max_bytes=self.max_bytes, stop=stop)
+
+        with self.lock:
+            if stop.is_set():
+                # Cancelled while the last chunk was written
+                file_path.unlink(missing_ok=True)
+            else:
+                self.created.add(file_path)
+
+    def fetched(self, poster_link: str) -> bool:
+        """Whether this poster was saved by a prefetch (and not found on disk already)"""
+        with self.lock:
+            return poster_file_path(poster_link) in self.created
+
+    def wait(self, poster_link: str, timeout: float = 15):
+        """Wait for the prefetch of this poster (if any), cancel all the others"""
+        future = self.futures.get(poster_link)
+        self.cancel(keep=poster_link)
+        if future is None:
+            return
+        try:
+            future.result(timeout=timeout)
+        except Exception:
+            # fetch_poster will try again by itself
+            pass
+
+    def cancel(self, keep: Optional[str] = None):
+        """Cancel the abandoned prefetches and remove the posters they already saved (and their thumbnails)"""
+        kept_path = poster_file_path(keep) if keep else None
+        with self.lock:
+            for poster_link, future in self.futures.items():
+                if poster_link != keep:
+                    future.cancel()
+                    self.stops[poster_link].set()
+
+            for file_path in self.created - {kept_path}:
+                file_path.unlink(missing_ok=True)
+                # Built by the picker previews of this poster
+                thumbnail_store.remove(file_path)
+            self.created &= {kept_path}
+
+        self.executor.shutdown(wait=False)
+
 
 if __name__ == "__main__":
     print(MovieManager().fetch_box_office_worldwide("tt1877830"))
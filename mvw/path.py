@@ -1,6 +1,5 @@
 from platformdirs import user_config_dir, user_data_dir, user_pictures_dir
 from pathlib import Path
-from iterfzf import iterfzf
 import os
 
 APP_NAME = "mvw"
@@ -14,14 +13,25 @@ class PathManager:
         self.data_dir = Path(user_data_dir(APP_NAME))
         self.data_dir.mkdir(parents=True, exist_ok=True)
         self.db_path = self.data_dir / "metadata.db"
+        self.omdb_cache_path = self.data_dir / "omdb_cache.db"
+        self.omdb_quota_path = self.data_dir / "omdb_quota.db"
+        self.title_index_path = self.data_dir / "title_index.db"
 
         self.poster_dir = self.data_dir / "posters"
         self.poster_dir.mkdir(parents=True, exist_ok=True)
 
+        self.render_cache_dir = self.data_dir / "render_cache"
+        self.render_cache_dir.mkdir(parents=True, exist_ok=True)
+
+        self.thumbnail_dir = self.data_dir / "thumbnails"
+        self.thumbnail_dir.mkdir(parents=True, exist_ok=True)
+
         self.screenshot_dir = Path(user_pictures_dir())
         self.screenshot_dir.mkdir(parents=True, exist_ok=True)
 
     def image_picker(self):
+        from iterfzf import iterfzf
+
         home = Path.home()
         def images_path():
             for root, dirs, files in os.walk(home):
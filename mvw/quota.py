@@ -0,0 +1,117 @@
+import hashlib
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+
+from .path import PathManager
+
+path = PathManager()
+
+DAILY_LIMIT = 1000  # Free OMDb key
+INTERACTIVE_RESERVE = 100  # Requests background work leaves for the user
+LIMIT_REACHED_ERROR = "Request limit reached!"
+
+INTERACTIVE = "interactive"
+BACKGROUND = "background"
+
+INIT_QUOTA_TABLES = '''
+        CREATE TABLE IF NOT EXISTS usage (
+            key_hash TEXT NOT NULL,
+            day TEXT NOT NULL,
+            used INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (key_hash, day)
+        ) WITHOUT ROWID;
+    '''
+
+
+class QuotaExhausted(Exception):
+    """The request budget (daily or of a RateLimiter) is used up"""
+
+
+def key_hash(api_key: str) -> str:
+    """The key itself is never written to the data dir"""
+    return hashlib.sha256(api_key.encode()).hexdigest()[:16]
+
+
+def today() -> str:
+    """OMDb counts the requests per UTC day"""
+    return datetime.now(timezone.utc).strftime("%Y-%m-%d")
+
+
+class QuotaBudget:
+    """Daily OMDb request counter of an api key, shared by every mvw process
+
+    Interactive requests may use the whole limit, background ones (import)
+    stop `reserve` requests before it so searching still works afterwards.
+    """
+
+    def __init__(self, api_key: str, daily_limit: int = DAILY_LIMIT, reserve: int = INTERACTIVE_RESERVE, db_path: Path = path.omdb_quota_path) -> None:
+        self.key_hash = key_hash(api_key)
+        self.daily_limit = daily_limit
+        self.reserve = min(reserve, daily_limit // 10)
+        self.db_path = db_path
+        self.conn = None
+        self.lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config_manager, api_key=None):
+        """Budget of the configured key (or of api_key) with the limit set in the API section"""
+        if api_key is None:
+            api_key = config_manager.get_config("API", "omdb_api_key")
+        daily_limit = config_manager.get_int("API", "daily_limit", DAILY_LIMIT)
+        return cls(api_key, daily_limit=daily_limit)
+
+    def connect(self) -> sqlite3.Connection:
+        if self.conn is None:
+            self.conn = sqlite3.connect(self.db_path, timeout=5, check_same_thread=False)
+            self.conn.executescript(INIT_QUOTA_TABLES)
+            # Only today matters, the older days are dropped
+            self.conn.execute("DELETE FROM usage WHERE day < ?", (today(),))
+            self.conn.commit()
+        return self.conn
+
+    def limit(self, priority: str = INTERACTIVE) -> int:
+        return self.daily_limit - (self.reserve if priority == BACKGROUND else 0)
+
+    def acquire(self, priority: str = INTERACTIVE):
+        """Count one request, raises QuotaExhausted when the budget of the priority is spent"""
+        limit = self.limit(priority)
+        day = today()
+        with self.lock:
+            conn = self.connect()
+            with conn:
+                # Checked and counted in one write, so processes cannot both take the last request
+                conn.execute("INSERT OR IGNORE INTO usage (key_hash, day) VALUES (?, ?)", (self.key_hash, day))
+                counted = conn.execute(
+                    "UPDATE usage SET used = used + 1 WHERE key_hash = ? AND day = ? AND used < ?",
+                    (self.key_hash, day, limit),
+                ).rowcount
+        if not counted:
+            if priority == BACKGROUND and limit < self.daily_limit:
+                raise QuotaExhausted(f"Today's OMDb budget is used up ({self.reserve} requests are kept for searching)")
+            raise QuotaExhausted("Today's OMDb request limit is reached")
+
+    def exhaust(self):
+        """OMDb refused a request, so nothing is left today whatever the counter says"""
+        day = today()
+        with self.lock:
+            conn = self.connect()
+            with conn:
+                conn.execute(
+                    """
+                    INSERT INTO usage (key_hash, day, used) VALUES (?, ?, ?)
+                    ON CONFLICT(key_hash, day) DO UPDATE SET used = MAX(used, excluded.used)
+                    """,
+                    (self.key_hash, day, self.daily_limit),
+                )
+
+    def used(self) -> int:
+        with self.lock:
+            row = self.connect().execute(
+                "SELECT used FROM usage WHERE key_hash = ? AND day = ?", (self.key_hash, today())
+            ).fetchone()
+        return row[0] if row else 0
+
+    def remaining(self, priority: str = INTERACTIVE) -> int:
+        return max(0, self.limit(priority) - self.used())
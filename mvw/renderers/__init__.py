@@ -1,17 +1,29 @@
-from .pixel import PixelRenderer
-from .block import BlockRenderer
-from .ascii import ASCIIRenderer
+from mvw.lazy import load
+
 
 class RendererRegistry:
+    # Import paths instead of classes, so only the selected renderer
+    # (and its heavy dependencies) gets imported
     _renderers = {}
+    # Renderers whose cached ANSI is read back without Text.from_ansi
+    _readers = {}
 
     @classmethod
-    def register(cls, name: str, renderer_class):
-        cls._renderers[name] = renderer_class
+    def register(cls, name: str, renderer_path: str, reader_path: str = ""):
+        cls._renderers[name] = renderer_path
+        if reader_path:
+            cls._readers[name] = reader_path
 
     @classmethod
     def get_renderer(cls, name: str):
-        return cls._renderers.get(name, cls._renderers["pixel"])
+        return load(cls._renderers.get(name, cls._renderers["pixel"]))
+
+    @classmethod
+    def get_reader(cls, name: str):
+        """read(ansi, style) -> renderable of the renderer's cached output, None for Text.from_ansi"""
+        if name not in cls._renderers:
+            name = "pixel"
+        return load(cls._readers[name]) if name in cls._readers else None
 
     @classmethod
     def list_renderers(cls):
@@ -19,10 +31,14 @@ class RendererRegistry:
 
 
 # Auto-register all renderers
-RendererRegistry.register("pixel", PixelRenderer)
-RendererRegistry.register("block", BlockRenderer)
-RendererRegistry.register("ascii", ASCIIRenderer)
+RendererRegistry.register("pixel", "mvw.renderers.pixel:PixelRenderer", "mvw.renderers.runs:read_ansi")
+RendererRegistry.register("block", "mvw.renderers.block:BlockRenderer")
+RendererRegistry.register("ascii", "mvw.renderers.ascii:ASCIIRenderer")
 
 
 def get_renderer(name: str):
     return RendererRegistry.get_renderer(name)
+
+
+def get_reader(name: str):
+    return RendererRegistry.get_reader(name)
@@ -12,8 +12,7 @@ CHARSETS = {
         "blocks": UNICODE_BLOCKS,
         }
 
-poster_width = float(ConfigManager().get_config("UI", "poster_width"))-1
-poster_height = int(1.1 * poster_width)
+config_manager = ConfigManager()
 
 class ASCIIRenderer(BaseRenderer):
     def __rich_console__(self, console, options):
@@ -22,7 +21,10 @@ class ASCIIRenderer(BaseRenderer):
                 self.failed = True
                 return
 
-            charset_name = ConfigManager().get_config("UI", "charset")
+            poster_width = float(config_manager.get_int("UI", "poster_width", 25)) - 1
+            poster_height = int(1.1 * poster_width)
+
+            charset_name = config_manager.get_config("UI", "charset")
             charset = CHARSETS.get(charset_name)
 
             if charset is None:
@@ -1,7 +1,12 @@
+import io
 from abc import ABC, abstractmethod
 from pathlib import Path
 from typing import Iterator, Any
 
+# Image enhancement applied before quantizing the poster
+SHARPNESS = 2.5  # Increased for terminal clarity
+CONTRAST = 1.2
+
 
 class BaseRenderer(ABC):
     def __init__(self, image_path: Path, width: int):
@@ -12,3 +17,18 @@ class BaseRenderer(ABC):
     @abstractmethod
     def __rich_console__(self, console: Any, options: Any) -> Iterator[Any]:
         pass
+
+    def to_ansi(self) -> str:
+        """The poster as ANSI text (check `failed` afterwards)"""
+        from rich.console import Console
+
+        capture_console = Console(
+            file=io.StringIO(),
+            force_terminal=True,
+            color_system="truecolor",
+            legacy_windows=False,
+            width=self.width,
+        )
+        with capture_console.capture() as capture:
+            capture_console.print(self)
+        return capture.get().rstrip("\n")
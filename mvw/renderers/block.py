@@ -3,9 +3,10 @@ from rich_pixels import Pixels
 
 from .base import BaseRenderer
 from mvw.config import ConfigManager
+from mvw.thumbnails import PLAIN, ThumbnailStore
 
-poster_width = int(ConfigManager().get_config("UI", "poster_width"))
-poster_height = int(1.2 * poster_width)
+config_manager = ConfigManager()
+thumbnail_store = ThumbnailStore()
 
 class BlockRenderer(BaseRenderer):
     def __rich_console__(self, console, options):
@@ -14,8 +15,11 @@ class BlockRenderer(BaseRenderer):
                 self.failed = True
                 return
 
-            pixels = Pixels.from_image_path(
-                path=str(self.image_path),
+            poster_width = config_manager.get_int("UI", "poster_width", 25)
+            poster_height = int(1.2 * poster_width)
+
+            pixels = Pixels.from_image(
+                thumbnail_store.open(self.image_path, poster_width, PLAIN),
                 resize=[poster_width, poster_height] # pyright: ignore
             )
             yield pixels
@@ -1,38 +1,184 @@
 from pathlib import Path
-from rich.text import Text
 
 from .base import BaseRenderer
+from .runs import PosterRuns, lines_ansi
+from mvw.config import ConfigManager
+from mvw.thumbnails import ThumbnailStore
 
 # Tui poster generating
-from PIL import Image, ImageEnhance
+from PIL import Image
 import numpy as np
 
 
+QUADRANTS = [
+    " ",
+    "▘",
+    "▝",
+    "▀",
+    "▖",
+    "▌",
+    "▞",
+    "▛",
+    "▗",
+    "▚",
+    "▐",
+    "▜",
+    "▄",
+    "▙",
+    "▟",
+    "█",
+]
+
+# Bit value of each pixel inside a 2x2 block (top-left, top-right, bottom-left, bottom-right)
+QUADRANT_BITS = np.array([1, 2, 4, 8])
+
+config_manager = ConfigManager()
+thumbnail_store = ThumbnailStore()
+
+
+def _masked_mean(pixels_rgb: np.ndarray, mask: np.ndarray):
+    """Mean color of the masked pixels of every block, plus how many were picked
+
+    The pixels are summed one by one (in float32) so the result is the same
+    as calling np.mean on the selected pixels of a single block.
+    """
+    picked = np.where(mask[..., None], pixels_rgb, np.float32(0))
+    total = picked[..., 0, :] + picked[..., 1, :] + picked[..., 2, :] + picked[..., 3, :]
+    count = mask.sum(axis=-1)
+    mean = total / np.maximum(count, 1).astype(np.float32)[..., None]
+    return mean, count
+
+
+def _square_distance(pixels_rgb: np.ndarray, center: np.ndarray) -> np.ndarray:
+    """Squared distance between every pixel and the center color of its block"""
+    diff = (pixels_rgb - center[..., None, :]) ** 2
+    return diff[..., 0] + diff[..., 1] + diff[..., 2]
+
+
+def quadrant_blocks(arr: np.ndarray):
+    """Pick the quadrant glyph and the two colors for every 2x2 block at once
+
+    `arr` is a float32 RGBA array with even height and width. Returns the
+    quadrant indices, foreground and background colors, and the number of
+    opaque pixels per block.
+    """
+    height, width = arr.shape[0] // 2, arr.shape[1] // 2
+
+    # (H, W, 4) -> (H/2, W/2, 4 pixels, 4 channels)
+    blocks = (
+        arr.reshape(height, 2, width, 2, 4)
+        .transpose(0, 2, 1, 3, 4)
+        .reshape(height, width, 4, 4)
+    )
+    pixels_rgb = blocks[..., :3]
+
+    # Create a mask for opaque pixels (threshold 128)
+    mask = blocks[..., 3] > 128
+    visible, num_opaque = _masked_mean(pixels_rgb, mask)
+
+    # Two color K-Means (2 iterations) seeded with the farthest pixel and the average
+    all_pixels = np.ones(mask.shape, dtype=bool)
+    avg, _ = _masked_mean(pixels_rgb, all_pixels)
+    farthest = np.argmax(_square_distance(pixels_rgb, avg), axis=-1)
+    c1 = np.take_along_axis(pixels_rgb, farthest[..., None, None], axis=-2)[..., 0, :]
+    c2 = avg
+
+    for _ in range(2):
+        m = _square_distance(pixels_rgb, c1) > _square_distance(pixels_rgb, c2)
+        near_c1, count_c1 = _masked_mean(pixels_rgb, ~m)
+        near_c2, count_c2 = _masked_mean(pixels_rgb, m)
+        c1 = np.where((count_c1 > 0)[..., None], near_c1, c1)
+        c2 = np.where((count_c2 > 0)[..., None], near_c2, c2)
+
+    m = _square_distance(pixels_rgb, c1) > _square_distance(pixels_rgb, c2)
+
+    # Partially transparent blocks use the alpha mask for the shape
+    # and the average of the visible pixels as the color
+    partial = num_opaque < 4
+    q_vals = np.where(partial, mask @ QUADRANT_BITS, m @ QUADRANT_BITS)
+    fgs = np.where(partial[..., None], visible, c2).astype(int)
+    bgs = c1.astype(int)
+
+    return q_vals, fgs, bgs, num_opaque
+
+
+def close(color, other, tolerance: int) -> bool:
+    """Whether two colors (or two transparent ones) differ by at most tolerance per channel"""
+    if color is None or other is None:
+        return color is other
+    return max(abs(color[0] - other[0]), abs(color[1] - other[1]), abs(color[2] - other[2])) <= tolerance
+
+
+def poster_lines(q_vals, fgs, bgs, num_opaque, tolerance: int = 0) -> list:
+    """One list of (glyphs, fg, bg) runs per row, a run for every stretch of cells with the same colors
+
+    Cells within
+    tolerance of the colors of the run join it, and blank cells (no glyph to
+    color) join any run with their background.
+    """
+    lines = []
+    for q_row, fg_row, bg_row, opaque_row in zip(
+        q_vals.tolist(), fgs.tolist(), bgs.tolist(), num_opaque.tolist()
+    ):
+        runs = []
+        run_fg = run_bg = None
+        run_blank = False
+        run_glyphs = []
+        for q_val, fg, bg, opaque in zip(q_row, fg_row, bg_row, opaque_row):
+            if opaque == 0:
+                # Fully transparent
+                fg = bg = None
+            else:
+                fg = tuple(fg)
+                # Partially transparent blocks (edges) show the terminal background
+                bg = tuple(bg) if opaque == 4 else None
+
+            if run_glyphs and (bg == run_bg or (tolerance and close(bg, run_bg, tolerance))):
+                if q_val == 0 or fg == run_fg or (tolerance and close(fg, run_fg, tolerance)):
+                    run_glyphs.append(QUADRANTS[q_val])
+                    continue
+                if run_blank:
+                    # Only blank cells so far, the run takes the color of the first glyph
+                    run_fg, run_blank = fg, False
+                    run_glyphs.append(QUADRANTS[q_val])
+                    continue
+
+            if run_glyphs:
+                runs.append(("".join(run_glyphs), run_fg, run_bg))
+            run_fg, run_bg, run_blank = fg, bg, q_val == 0
+            run_glyphs = [QUADRANTS[q_val]]
+
+        if run_glyphs:
+            runs.append(("".join(run_glyphs), run_fg, run_bg))
+        lines.append(runs)
+    return lines
+
+
 class PixelRenderer(BaseRenderer):
     def __rich_console__(self, console, options):
+        lines = self.render_lines()
+        if lines is None:
+            return
+        yield PosterRuns(lines)
+
+    def to_ansi(self) -> str:
+        """Written straight from the runs instead of through a console"""
+        lines = self.render_lines()
+        return "" if lines is None else lines_ansi(lines)
+
+    def render_lines(self):
+        """The (glyphs, fg, bg) runs of every row, None when the poster cannot be rendered"""
         try:
             if not self.image_path.exists():
                 self.failed = True
-                return
+                return None
 
-            # Open as RGBA to catch transparency
-            img = Image.open(self.image_path).convert("RGBA")
+            # Already enhanced RGBA (transparency kept), at the nearest stored level
+            img = thumbnail_store.open(self.image_path, self.width * 2)
 
             if img.width == 0 or img.height == 0:
                 self.failed = True
-                return
-
-            # Enhance only the RGB content to prevent edge artifacts
-            r, g, b, a = img.split()
-            rgb_img = Image.merge("RGB", (r, g, b))
-
-            enhancer = ImageEnhance.Sharpness(rgb_img)
-            rgb_img = enhancer.enhance(2.5)  # Increased for terminal clarity
-            enhancer = ImageEnhance.Contrast(rgb_img)
-            rgb_img = enhancer.enhance(1.2)
-
-            # Re-merge with Alpha
-            img = Image.merge("RGBA", (*rgb_img.split(), a))
+                return None
 
             # Calculate Dimensions
             target_width = self.width * 2
@@ -48,112 +194,17 @@ class PixelRenderer(BaseRenderer):
 
             if new_width <= 0 or new_height <= 0:
                 self.failed = True
-                return
+                return None
 
             # Resize - BILINEAR is often crisper than LANCZOS for pixel art/icons
             img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
             arr = np.array(img, dtype=np.float32)
 
-            quadrants = [
-                " ",
-                "▘",
-                "▝",
-                "▀",
-                "▖",
-                "▌",
-                "▞",
-                "▛",
-                "▗",
-                "▚",
-                "▐",
-                "▜",
-                "▄",
-                "▙",
-                "▟",
-                "█",
-            ]
-            output_lines = []
-
-            for y in range(0, new_height, 2):
-                line_parts = []
-                for x in range(0, new_width, 2):
-                    block = arr[y : y + 2, x : x + 2]
-
-                    # Flatten block into 4 pixels
-                    pixels_rgba = block.reshape(-1, 4)
-                    pixels_rgb = pixels_rgba[:, :3]
-                    pixels_a = pixels_rgba[:, 3]
-
-                    # Create a mask for opaque pixels (threshold 128)
-                    mask = pixels_a > 128
-                    num_opaque = np.sum(mask)
-
-                    if num_opaque == 0:
-                        # Case 1: Fully Transparent
-                        char = " "
-                        fg_ansi = ""  # Not needed for space
-                        bg_ansi = "\033[49m"  # Reset to terminal default
-
-                    elif num_opaque < 4:
-                        # Case 2: Partially Transparent (Edges)
-                        # Use the alpha mask to choose the quadrant shape
-                        q_val = 0
-                        if mask[0]:
-                            q_val += 1
-                        if mask[1]:
-                            q_val += 2
-                        if mask[2]:
-                            q_val += 4
-                        if mask[3]:
-                            q_val += 8
-
-                        char = quadrants[q_val]
-                        # Avg color of only the visible pixels
-                        fg = np.mean(pixels_rgb[mask], axis=0).astype(int)
-                        fg_ansi = f"\033[38;2;{fg[0]};{fg[1]};{fg[2]}m"
-                        bg_ansi = "\033[49m"  # Let terminal background show through
-
-                    else:
-                        # Case 3: Fully Opaque - Use your original K-Means logic
-                        avg = np.mean(pixels_rgb, axis=0)
-                        dists = np.sum((pixels_rgb - avg) ** 2, axis=1)
-                        c1 = pixels_rgb[np.argmax(dists)]
-                        c2 = avg
-
-                        for _ in range(2):
-                            d1 = np.sum((pixels_rgb - c1) ** 2, axis=1)
-                            d2 = np.sum((pixels_rgb - c2) ** 2, axis=1)
-                            m = d1 > d2
-                            if np.any(~m):
-                                c1 = np.mean(pixels_rgb[~m], axis=0)
-                            if np.any(m):
-                                c2 = np.mean(pixels_rgb[m], axis=0)
-
-                        d1 = np.sum((pixels_rgb - c1) ** 2, axis=1)
-                        d2 = np.sum((pixels_rgb - c2) ** 2, axis=1)
-                        m = d1 > d2
-
-                        fg, bg = c2.astype(int), c1.astype(int)
-                        q_val = 0
-                        if m[0]:
-                            q_val += 1
-                        if m[1]:
-                            q_val += 2
-                        if m[2]:
-                            q_val += 4
-                        if m[3]:
-                            q_val += 8
-
-                        char = quadrants[q_val]
-                        fg_ansi = f"\033[38;2;{fg[0]};{fg[1]};{fg[2]}m"
-                        bg_ansi = f"\033[48;2;{bg[0]};{bg[1]};{bg[2]}m"
-
-                    line_parts.append(f"{fg_ansi}{bg_ansi}{char}")
-
-                line_parts.append("\033[0m")
-                output_lines.append("".join(line_parts))
-
-            yield Text.from_ansi("\n".join(output_lines))
+            q_vals, fgs, bgs, num_opaque = quadrant_blocks(arr)
+
+            tolerance = config_manager.get_int("UI", "color_tolerance", 0)
+            return poster_lines(q_vals, fgs, bgs, num_opaque, tolerance)
 
         except Exception:
             self.failed = True
+            return None
@@ -0,0 +1,114 @@
+import re
+from functools import lru_cache
+from typing import Optional
+
+from rich.color import Color
+from rich.measure import Measurement
+from rich.segment import Segment
+from rich.style import Style
+
+# Runs are (glyphs, fg, bg) with (r, g, b) colors or None for transparent. Kept apart
+# from the pixel renderer, so showing a cached poster imports neither numpy nor Pillow
+
+TRANSPARENT = Color.default()
+ESCAPE = re.compile(r"\033\[([0-9;]*)m")
+
+
+@lru_cache(maxsize=4096)
+def cell_style(fg, bg) -> Style:
+    """Style of a color pair (None is transparent), shared so rich compares them cheaply"""
+    return Style(
+        color=None if fg is None else Color.from_rgb(*fg),
+        bgcolor=TRANSPARENT if bg is None else Color.from_rgb(*bg),
+    )
+
+
+def color_code(color, layer: int) -> str:
+    """SGR parameters of a foreground (layer 3) or background (layer 4) color"""
+    if color is None:
+        return f"{layer}9"
+    return f"{layer}8;2;{color[0]};{color[1]};{color[2]}"
+
+
+def lines_ansi(lines: list) -> str:
+    """ANSI text of the runs, the colors are only written when they change"""
+    output_lines = []
+    for runs in lines:
+        parts = []
+        fg = bg = ()  # Nothing set yet at the start of a line
+        for glyphs, run_fg, run_bg in runs:
+            codes = []
+            if run_fg != fg and not (run_fg is None and fg == ()):
+                codes.append(color_code(run_fg, 3))
+            if run_bg != bg and not (run_bg is None and bg == ()):
+                codes.append(color_code(run_bg, 4))
+            if codes:
+                parts.append(f"\033[{';'.join(codes)}m")
+            parts.append(glyphs)
+            fg, bg = run_fg, run_bg
+        parts.append("\033[0m")
+        output_lines.append("".join(parts))
+    return "\n".join(output_lines)
+
+
+def ansi_lines(ansi: str) -> list:
+    """The runs of every row back from the output of lines_ansi"""
+    lines = []
+    for line in ansi.split("\n"):
+        runs = []
+        fg = bg = None
+        parts = ESCAPE.split(line)
+        # parts alternates text and the parameters of the escape before the next text
+        for index in range(0, len(parts), 2):
+            if index:
+                codes = parts[index - 1].split(";")
+                position = 0
+                while position < len(codes):
+                    code = codes[position]
+                    if code in ("38", "48") and position + 4 < len(codes):
+                        color = (int(codes[position + 2]), int(codes[position + 3]), int(codes[position + 4]))
+                        fg, bg = (color, bg) if code == "38" else (fg, color)
+                        position += 5
+                        continue
+                    if code in ("0", ""):
+                        fg = bg = None
+                    elif code == "39":
+                        fg = None
+                    elif code == "49":
+                        bg = None
+                    position += 1
+            if parts[index]:
+                runs.append((parts[index], fg, bg))
+        lines.append(runs)
+    return lines
+
+
+@lru_cache(maxsize=4096)
+def run_style(fg, bg, base: Optional[Style]) -> Style:
+    style = cell_style(fg, bg)
+    return style if base is None else base + style
+
+
+class PosterRuns:
+    """Renderable of the runs, one Segment each (no ANSI parsing or Text spans in between)"""
+
+    def __init__(self, lines: list, style: Optional[Style] = None) -> None:
+        self.lines = lines
+        self.style = style
+        self.width = max((sum(len(glyphs) for glyphs, _, _ in runs) for runs in lines), default=0)
+
+    def __rich_console__(self, console, options):
+        for runs in self.lines:
+            segments = [Segment(glyphs, run_style(fg, bg, self.style)) for glyphs, fg, bg in runs]
+            if self.width > options.max_width:
+                segments = Segment.adjust_line_length(segments, options.max_width)
+            yield from segments
+            yield Segment.line()
+
+    def __rich_measure__(self, console, options) -> Measurement:
+        return Measurement(self.width, self.width)
+
+
+def read_ansi(ansi: str, style: Optional[Style] = None) -> PosterRuns:
+    """Cached output of the pixel renderer as a renderable"""
+    return PosterRuns(ansi_lines(ansi), style)
@@ -0,0 +1,273 @@
+import base64
+import io
+import zlib
+from html import escape
+from math import ceil
+from pathlib import Path
+from typing import Optional
+
+from rich.cells import cell_len
+from rich.color import blend_rgb
+from rich.style import Style
+from rich.terminal_theme import TerminalTheme
+
+from .thumbnails import ThumbnailStore
+
+thumbnail_store = ThumbnailStore()
+
+# Same geometry as rich's Console.save_svg, so the cards look the same
+CHAR_HEIGHT = 20
+FONT_ASPECT_RATIO = 0.61  # Fira Code
+CHAR_WIDTH = CHAR_HEIGHT * FONT_ASPECT_RATIO
+LINE_HEIGHT = CHAR_HEIGHT * 1.22
+MARGIN = 1
+PADDING_TOP = 40
+PADDING = 8
+
+# Style meta of the poster cells, they are replaced by one image when the poster is embedded
+POSTER_META = "mvw_poster"
+POSTER_CELL_PIXELS = 2  # The pixel renderer draws 2x2 pixels per cell
+
+CHROME_BUTTONS = """
+            <g transform="translate(26,22)">
+            <circle cx="0" cy="0" r="7" fill="#ff5f57"/>
+            <circle cx="22" cy="0" r="7" fill="#febc2e"/>
+            <circle cx="44" cy="0" r="7" fill="#28c840"/>
+            </g>
+        """
+
+
+def number(value: float) -> str:
+    return format(value, "g")
+
+
+def escape_text(text: str) -> str:
+    """HTML escape text and replace spaces with nbsp"""
+    return escape(text).replace(" ", "&#160;")
+
+
+def poster_image(poster_path: Path, columns: int, rows: int) -> Optional[str]:
+    """The poster at the resolution of its cells (2x2 pixels each) as a PNG data URI
+
+    None when the poster cannot be read.
+    """
+    from PIL import Image
+
+    size = (columns * POSTER_CELL_PIXELS, rows * POSTER_CELL_PIXELS)
+    try:
+        # The stored level is enhanced like the renderers, so the colors match the cells
+        image = thumbnail_store.open(poster_path, size[0]).resize(size, Image.LANCZOS)
+    except Exception:
+        return None
+
+    if image.getchannel("A").getextrema()[0] == 255:
+        image = image.convert("RGB")
+
+    buffer = io.BytesIO()
+    image.save(buffer, "PNG", optimize=True)
+    return f"data:image/png;base64,{base64.b64encode(buffer.getvalue()).decode()}"
+
+
+class CardSVG:
+    """SVG of rendered lines that stays small with truecolor posters
+
+    Rich's save_svg writes a rect and a text element for every segment. Here
+    the backgrounds of adjacent cells with the same color become one rect,
+    adjacent text with the same style becomes one text element, and every line
+    is clipped once. The poster cells can be replaced by one raster image.
+    """
+
+    def __init__(self, theme: TerminalTheme, width: int, poster_path: Optional[Path] = None) -> None:
+        self.theme = theme
+        self.width = width
+        self.poster_path = poster_path
+        self.style_cache = {}
+        self.classes = {}
+
+    def style_info(self, style: Style):
+        """(css rules, background color or None, poster cell) of a style"""
+        info = self.style_cache.get(style)
+        if info is not None:
+            return info
+
+        theme = self.theme
+        color = theme.foreground_color if style.color is None or style.color.is_default else style.color.get_truecolor(theme)
+        bgcolor = theme.background_color if style.bgcolor is None or style.bgcolor.is_default else style.bgcolor.get_truecolor(theme)
+        if style.reverse:
+            color, bgcolor = bgcolor, color
+        if style.dim:
+            color = blend_rgb(color, bgcolor, 0.4)
+        rules = [f"fill: {color.hex}"]
+        if style.bold:
+            rules.append("font-weight: bold")
+        if style.italic:
+            rules.append("font-style: italic;")
+        if style.underline:
+            rules.append("text-decoration: underline;")
+        if style.strike:
+            rules.append("text-decoration: line-through;")
+
+        if style.reverse:
+            background = theme.foreground_color.hex if style.color is None else style.color.get_truecolor(theme).hex
+        elif style.bgcolor is not None and not style.bgcolor.is_default:
+            background = style.bgcolor.get_truecolor(theme).hex
+        else:
+            background = None
+
+        info = (";".join(rules), background, bool(self.poster_path and style.meta.get(POSTER_META)))
+        self.style_cache[style] = info
+        return info
+
+    def class_name(self, rules: str) -> str:
+        if rules not in self.classes:
+            self.classes[rules] = f"r{len(self.classes) + 1}"
+        return self.classes[rules]
+
+    def render(self, lines: list, title: str, code_format: str) -> str:
+        """The SVG document of the lines (lists of segments) in the code_format template"""
+        unique_id = "terminal-" + str(
+            zlib.adler32("".join(repr(segment) for line in lines for segment in line).encode("utf-8", "ignore") + title.encode("utf-8", "ignore"))
+        )
+        backgrounds, matrix, clip_paths = [], [], []
+        poster_box = None  # [first column, first line, last column, last line]
+
+        def flush_background():
+            if background_run:
+                color, x, cells = background_run
+                backgrounds.append(
+                    f'<rect fill="{color}" x="{number(x * CHAR_WIDTH)}" y="{number(line_y + 1.5)}" '
+                    f'width="{number(cells * CHAR_WIDTH)}" height="{number(LINE_HEIGHT + 0.25)}"/>'
+                )
+
+        def flush_text():
+            if text_run:
+                class_name, x, text, cells = text_run
+                texts.append(
+                    f'<text class="{unique_id}-{class_name}" x="{number(x * CHAR_WIDTH)}" y="{number(line_y + CHAR_HEIGHT)}" '
+                    f'textLength="{number(cells * CHAR_WIDTH)}">{escape_text(text)}</text>'
+                )
+
+        for y, line in enumerate(lines):
+            line_y = y * LINE_HEIGHT
+            texts = []
+            background_run = None  # [color, x, cells]
+            text_run = None  # [class, x, text, cells]
+            pending_spaces = 0
+
+            x = 0
+            for text, style, control in line:
+                if control:
+                    continue
+                cells = cell_len(text)
+                rules, background, is_poster = self.style_info(style or Style())
+
+                if is_poster:
+                    if poster_box is None:
+                        poster_box = [x, y, x + cells, y]
+                    else:
+                        poster_box = [min(poster_box[0], x), poster_box[1], max(poster_box[2], x + cells), y]
+                    flush_background()
+                    flush_text()
+                    background_run = text_run = None
+                    pending_spaces = 0
+                    x += cells
+                    continue
+
+                if background is None:
+                    flush_background()
+                    background_run = None
+                elif background_run and background_run[0] == background and background_run[1] + background_run[2] == x:
+                    background_run[2] += cells
+                else:
+                    flush_background()
+                    background_run = [background, x, cells]
+
+                if not text.strip(" "):
+                    # Blank cells only need a background, they may sit inside a text run
+                    if text_run:
+                        pending_spaces += cells
+                    x += cells
+                    continue
+
+                class_name = self.class_name(rules)
+                # Wide characters keep their own element, like rich does, so the next cells stay aligned
+                single_width = cells == len(text)
+                if (
+                    text_run
+                    and single_width
+                    and text_run[0] == class_name
+                    and text_run[1] + text_run[3] + pending_spaces == x
+                ):
+                    text_run[2] += " " * pending_spaces + text
+                    text_run[3] += pending_spaces + cells
+                else:
+                    flush_text()
+                    text_run = [class_name, x, text, cells] if single_width else None
+                    if not single_width:
+                        texts.append(
+                            f'<text class="{unique_id}-{class_name}" x="{number(x * CHAR_WIDTH)}" y="{number(line_y + CHAR_HEIGHT)}" '
+                            f'textLength="{number(len(text) * CHAR_WIDTH)}">{escape_text(text)}</text>'
+                        )
+                pending_spaces = 0
+                x += cells
+
+            flush_background()
+            flush_text()
+            if texts:
+                clip_paths.append(
+                    f'<clipPath id="{unique_id}-line-{y}">\n'
+                    f'    <rect x="0" y="{number(line_y + 1.5)}" width="{number(CHAR_WIDTH * self.width)}" height="{number(LINE_HEIGHT + 0.25)}"/>\n'
+                    f"            </clipPath>"
+                )
+                matrix.append(f'<g clip-path="url(#{unique_id}-line-{y})">{"".join(texts)}</g>')
+
+        if poster_box:
+            first_x, first_y, last_x, last_y = poster_box
+            image_width = (last_x - first_x) * CHAR_WIDTH
+            image_height = (last_y - first_y + 1) * LINE_HEIGHT
+            href = poster_image(self.poster_path, last_x - first_x, last_y - first_y + 1)
+            if href is None:
+                # The poster cannot be read, draw its cells after all
+                return CardSVG(self.theme, self.width).render(lines, title, code_format)
+            backgrounds.append(
+                f'<image x="{number(first_x * CHAR_WIDTH)}" y="{number(first_y * LINE_HEIGHT + 1.5)}" '
+                f'width="{number(image_width)}" height="{number(image_height)}" preserveAspectRatio="none" '
+                f'style="image-rendering: pixelated" href="{href}"/>'
+            )
+
+        last_line = max(len(lines) - 1, 0)
+        terminal_width = ceil(self.width * CHAR_WIDTH + PADDING * 2)
+        terminal_height = (last_line + 1) * LINE_HEIGHT + PADDING_TOP + PADDING
+        chrome = (
+            f'<rect fill="{self.theme.background_color.hex}" stroke="rgba(255,255,255,0.35)" stroke-width="1" '
+            f'x="{MARGIN}" y="{MARGIN}" width="{terminal_width}" height="{number(terminal_height)}" rx="8"/>'
+        )
+        if title:
+            chrome += (
+                f'<text class="{unique_id}-title" fill="{self.theme.foreground_color.hex}" text-anchor="middle" '
+                f'x="{terminal_width // 2}" y="{MARGIN + CHAR_HEIGHT + 6}">{escape_text(title)}</text>'
+            )
+        chrome += CHROME_BUTTONS
+
+        return code_format.format(
+            unique_id=unique_id,
+            char_width=CHAR_WIDTH,
+            char_height=CHAR_HEIGHT,
+            line_height=LINE_HEIGHT,
+            terminal_width=CHAR_WIDTH * self.width - 1,
+            terminal_height=(last_line + 1) * LINE_HEIGHT - 1,
+            width=terminal_width + MARGIN * 2,
+            height=terminal_height + MARGIN * 2,
+            terminal_x=MARGIN + PADDING,
+            terminal_y=MARGIN + PADDING_TOP,
+            styles="\n".join(f".{unique_id}-{class_name} {{ {rules} }}" for rules, class_name in self.classes.items()),
+            chrome=chrome,
+            backgrounds=f'<g shape-rendering="crispEdges">{"".join(backgrounds)}</g>',
+            matrix="".join(matrix),
+            lines="\n".join(clip_paths),
+        )
+
+    def save(self, svg_path: Path, lines: list, title: str, code_format: str):
+        svg = self.render(lines, title, code_format)
+        with open(svg_path, "w", encoding="utf-8") as f:
+            f.write(svg)
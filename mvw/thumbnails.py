@@ -0,0 +1,172 @@
+import contextlib
+import hashlib
+import os
+import shutil
+from pathlib import Path
+from typing import Optional
+
+from .path import PathManager
+from .renderers.base import CONTRAST, SHARPNESS
+
+path = PathManager()
+
+# Widths in pixels of the stored levels, never wider than the poster itself. The pixel
+# renderer needs 2 per column, so they cover poster widths up to 32 and 64
+LEVELS = (64, 128)
+# Huge JPEGs are decoded at the smallest scale still this wide. Sharpening works per pixel,
+# so the enhancement has to run near the size of an ordinary (300 pixels wide) poster
+DECODE_WIDTH = 512
+
+ENHANCED = "enhanced"  # Sharpness and contrast of the pixel renderer already applied
+PLAIN = "plain"
+
+# Off while a poster is only previewed, the levels of a poster not chosen yet are not stored
+_build_missing = True
+
+
+def poster_name(poster_path: Path) -> str:
+    """Name of the poster's levels dir, it follows the path (the file may be gone)"""
+    return hashlib.blake2b(str(Path(poster_path).resolve()).encode(), digest_size=10).hexdigest()
+
+
+def poster_key(poster_path: Path):
+    """(name, stamp) of a poster, the name follows its path and the stamp changes with the file"""
+    stat = Path(poster_path).resolve().stat()
+    return poster_name(poster_path), f"{stat.st_size:x}-{stat.st_mtime_ns:x}"
+
+
+@contextlib.contextmanager
+def without_building():
+    """Renders inside read the stored levels, but decode the original instead of building missing ones"""
+    global _build_missing
+    _build_missing = False
+    try:
+        yield
+    finally:
+        _build_missing = True
+
+
+def decode(poster_path: Path, width: int = DECODE_WIDTH):
+    """The poster as RGBA, huge JPEGs are decoded at a reduced scale that still covers width"""
+    from PIL import Image
+
+    with Image.open(poster_path) as image:
+        if image.width > width:
+            image.draft("RGB", (width, max(1, width * image.height // image.width)))
+        return image.convert("RGBA")
+
+
+def enhance(image):
+    """Same enhancement the pixel renderer did on every render, on the RGB content only"""
+    from PIL import Image, ImageEnhance
+
+    r, g, b, a = image.split()
+    rgb_image = Image.merge("RGB", (r, g, b))
+    rgb_image = ImageEnhance.Sharpness(rgb_image).enhance(SHARPNESS)
+    rgb_image = ImageEnhance.Contrast(rgb_image).enhance(CONTRAST)
+    return Image.merge("RGBA", (*rgb_image.split(), a))
+
+
+class ThumbnailStore:
+    """Small copies of every poster (a pyramid of levels), so renders never decode the original again
+
+    The levels are built once when the poster is fetched or changed (or on the
+    first render of an older poster). Renderers take the smallest level at least
+    as wide as they need, so a new poster_width only resizes a thumbnail.
+    """
+
+    def __init__(self, thumbnail_dir: Path = path.thumbnail_dir) -> None:
+        self.thumbnail_dir = thumbnail_dir
+
+    def levels(self, poster_path: Path, variant: str = ENHANCED) -> dict:
+        """{width: level path} already built for the current poster file"""
+        name, stamp = poster_key(poster_path)
+        prefix = f"{stamp}.{variant}."
+        try:
+            entries = os.listdir(self.thumbnail_dir / name)
+        except OSError:
+            return {}
+        return {
+            int(entry[len(prefix):-4]): self.thumbnail_dir / name / entry
+            for entry in entries
+            if entry.startswith(prefix) and entry.endswith(".png")
+        }
+
+    def build(self, poster_path: Path, variant: str = ENHANCED) -> dict:
+        """Decode the poster once and store its levels, returns {width: level path}"""
+        from PIL import Image
+
+        found = self.levels(poster_path, variant)
+        if found:
+            return found
+
+        name, stamp = poster_key(poster_path)
+        poster_dir = self.thumbnail_dir / name
+        poster_dir.mkdir(parents=True, exist_ok=True)
+        # Levels of the file this path pointed to before are dropped
+        for entry in os.listdir(poster_dir):
+            if not entry.startswith(f"{stamp}."):
+                (poster_dir / entry).unlink(missing_ok=True)
+
+        image = decode(poster_path)
+        if variant == ENHANCED:
+            image = enhance(image)
+
+        widths = [level for level in LEVELS if level < image.width]
+        if image.width <= LEVELS[-1]:
+            widths.append(image.width)
+        # Largest first, so a render racing the build never has to upscale
+        for width in reversed(widths):
+            height = max(1, round(width * image.height / image.width))
+            level = image if width == image.width else image.resize((width, height), Image.Resampling.LANCZOS)
+            # PNG, JPEG artifacts of the sharpened image would move the quadrant colors
+            level_path = poster_dir / f"{stamp}.{variant}.{width}.png"
+            tmp_path = poster_dir / f"{stamp}.{variant}.{width}.{os.getpid()}.tmp"
+            try:
+                level.save(tmp_path, "PNG")
+                os.replace(tmp_path, level_path)
+            finally:
+                tmp_path.unlink(missing_ok=True)
+            found[width] = level_path
+        return found
+
+    def nearest(self, poster_path: Path, width: int, variant: str = ENHANCED) -> Optional[Path]:
+        """The smallest level at least `width` pixels wide, built when missing
+
+        None when the poster is wider than every level but the width asks for more,
+        or when the levels are missing inside `without_building()`.
+        """
+        found = self.levels(poster_path, variant)
+        if not found and not _build_missing:
+            return None
+        found = found or self.build(poster_path, variant)
+        wide_enough = [level for level in found if level >= width]
+        if wide_enough:
+            return found[min(wide_enough)]
+        if max(found) < LEVELS[-1]:
+            # The largest level is the whole poster, there is nothing sharper
+            return found[max(found)]
+        return None
+
+    def open(self, poster_path: Path, width: int, variant: str = ENHANCED):
+        """The nearest level as an RGBA image (the original decoded again when no level is wide enough)"""
+        from PIL import Image
+
+        level_path = self.nearest(poster_path, width, variant)
+        if level_path is None:
+            image = decode(poster_path, max(width, DECODE_WIDTH))
+            return enhance(image) if variant == ENHANCED else image
+        with Image.open(level_path) as image:
+            return image.convert("RGBA")
+
+    def remove(self, poster_path: Path):
+        """Drop every level of a poster (replaced or deleted)"""
+        shutil.rmtree(self.thumbnail_dir / poster_name(poster_path), ignore_errors=True)
+
+    def refresh(self, poster_path: Path) -> bool:
+        """Build the levels of a new or changed poster, False when it cannot be read"""
+        try:
+            self.build(poster_path)
+        except Exception:
+            return False
+        return True
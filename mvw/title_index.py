@@ -0,0 +1,182 @@
+import gzip
+import io
+import os
+import queue
+import re
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Callable, Optional
+
+from .path import PathManager
+
+path = PathManager()
+
+CHUNK_SIZE = 20000  # Rows handed from the reader thread to the writer at once
+QUEUE_CHUNKS = 4  # Chunks waiting at most, this bounds the memory of a build
+TITLE_TYPES = {"movie"}  # Same as the `type=movie` OMDb search
+
+SCHEMA = '''
+    CREATE TABLE titles (
+        id INTEGER PRIMARY KEY,
+        title TEXT NOT NULL,
+        original_title TEXT,
+        year INTEGER,
+        rating REAL,
+        votes INTEGER NOT NULL DEFAULT 0
+    );
+    CREATE VIRTUAL TABLE titles_fts USING fts5(
+        title, original_title,
+        content='titles', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+    );
+'''
+
+# The most voted movies first, they are the ones people search for
+SEARCH_QUERY = '''
+    SELECT t.id, t.title, t.year
+    FROM titles_fts
+    JOIN titles t ON t.id = titles_fts.rowid
+    WHERE titles_fts MATCH ?
+    ORDER BY t.votes DESC, bm25(titles_fts)
+    LIMIT ?
+'''
+
+
+def title_id(tconst: str) -> int:
+    return int(tconst[2:])
+
+
+def imdbid(title_id: int) -> str:
+    return f"tt{title_id:07d}"
+
+
+def basics_rows(line: str):
+    """title.basics.tsv: tconst, titleType, primaryTitle, originalTitle, isAdult, startYear.."""
+    fields = line.rstrip("\n").split("\t")
+    if len(fields) < 6 or fields[1] not in TITLE_TYPES or fields[4] == "1":
+        return None
+    year = int(fields[5]) if fields[5].isdigit() else None
+    original_title = fields[3] if fields[3] != fields[2] else None
+    return (title_id(fields[0]), fields[2], original_title, year)
+
+
+def ratings_rows(line: str):
+    """title.ratings.tsv: tconst, averageRating, numVotes"""
+    fields = line.rstrip("\n").split("\t")
+    if len(fields) < 3:
+        return None
+    return (float(fields[1]), int(fields[2]), title_id(fields[0]))
+
+
+def read_chunks(file_path: Path, parse: Callable, chunks: queue.Queue, progress: Optional[Callable] = None):
+    """Reader thread: decompress and parse the dataset, hand it over in chunks"""
+    try:
+        with open(file_path, "rb") as raw:
+            # raw.tell() is how far into the (compressed) file the reader is
+            stream = gzip.open(raw) if file_path.suffix == ".gz" else raw
+            with io.TextIOWrapper(stream, encoding="utf-8", newline="") as f:
+                next(f, None)  # Header
+                chunk = []
+                for line in f:
+                    row = parse(line)
+                    if row is not None:
+                        chunk.append(row)
+                    if len(chunk) >= CHUNK_SIZE:
+                        chunks.put(chunk)
+                        chunk = []
+                        if progress:
+                            progress(raw.tell())
+                chunks.put(chunk)
+                if progress:
+                    progress(raw.tell())
+        chunks.put(None)
+    except Exception as e:
+        chunks.put(e)
+
+
+def load(conn, file_path: Path, parse: Callable, sql: str, progress: Optional[Callable] = None) -> int:
+    """Insert a dataset, decompressing in a thread while this one writes"""
+    chunks = queue.Queue(maxsize=QUEUE_CHUNKS)
+    reader = threading.Thread(target=read_chunks, args=(file_path, parse, chunks, progress), daemon=True)
+    reader.start()
+    count = 0
+    while True:
+        chunk = chunks.get()
+        if chunk is None:
+            break
+        if isinstance(chunk, Exception):
+            raise chunk
+        with conn:
+            conn.executemany(sql, chunk)
+        count += len(chunk)
+    reader.join()
+    return count
+
+
+class TitleIndex:
+    """Local movie title search built from IMDb's title.basics / title.ratings datasets"""
+
+    def __init__(self, index_path: Optional[Path] = None) -> None:
+        self.index_path = Path(index_path or path.title_index_path)
+
+    def exists(self) -> bool:
+        return self.index_path.exists()
+
+    def build(self, basics_path: Path, ratings_path: Optional[Path] = None, progress: Optional[Callable] = None) -> int:
+        """Build the index next to the old one and swap it in, returns how many titles it has
+
+        progress(dataset, bytes_read, total_bytes) is called while the datasets are read.
+        """
+        tmp_path = self.index_path.with_name(f"{self.index_path.name}.{os.getpid()}.tmp")
+        tmp_path.unlink(missing_ok=True)
+        conn = sqlite3.connect(tmp_path)
+        try:
+            # Nothing to protect until the file is swapped in
+            conn.execute("PRAGMA journal_mode = OFF")
+            conn.execute("PRAGMA synchronous = OFF")
+            conn.executescript(SCHEMA)
+
+            def reporter(dataset: Path):
+                total = dataset.stat().st_size
+                return (lambda done: progress(dataset.name, done, total)) if progress else None
+
+            count = load(
+                conn, basics_path, basics_rows,
+                "INSERT OR REPLACE INTO titles (id, title, original_title, year) VALUES (?, ?, ?, ?)",
+                reporter(basics_path),
+            )
+            if ratings_path:
+                load(conn, ratings_path, ratings_rows, "UPDATE titles SET rating = ?, votes = ? WHERE id = ?", reporter(ratings_path))
+
+            with conn:
+                conn.execute("INSERT INTO titles_fts(titles_fts) VALUES ('rebuild')")
+                conn.execute("INSERT INTO titles_fts(titles_fts) VALUES ('optimize')")
+            conn.execute("VACUUM")
+            conn.close()
+            os.replace(tmp_path, self.index_path)
+            return count
+        finally:
+            conn.close()
+            tmp_path.unlink(missing_ok=True)
+
+    def remove(self) -> bool:
+        if not self.exists():
+            return False
+        self.index_path.unlink()
+        return True
+
+    def search(self, text: str, limit: int = 50) -> list:
+        """Movies matching every word of the text, in the shape of the OMDb search results"""
+        words = re.findall(r"\w+", text)
+        if not words or not self.exists():
+            return []
+        query = " ".join(f'"{word}"' for word in words)
+        conn = sqlite3.connect(f"{self.index_path.as_uri()}?mode=ro", uri=True)
+        try:
+            rows = conn.execute(SEARCH_QUERY, (query, limit)).fetchall()
+        finally:
+            conn.close()
+        return [
+            {"Title": title, "Year": str(year or "N/A"), "imdbID": imdbid(id), "Type": "movie", "Poster": "N/A"}
+            for id, title, year in rows
+        ]
@@ -0,0 +1,82 @@
+import threading
+import time
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .quota import QuotaExhausted  # Lives with the daily budget, so the config does not import requests
+
+# (connect, read) in seconds
+TIMEOUT = (3.05, 10)
+RETRIES = 3
+BACKOFF_FACTOR = 0.5  # First retry at once, then 1s, 2s (urllib3 2 backoff)
+RETRY_STATUS = (429, 500, 502, 503, 504)
+POOL_CONNECTIONS = 4  # Number of hosts kept (OMDb, posters, Box Office Mojo)
+POOL_MAXSIZE = 8  # Keep-alive connections per host
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def build_session(retries: int = RETRIES, backoff_factor: float = BACKOFF_FACTOR) -> requests.Session:
+    """Session with per-host keep-alive pools and bounded retries"""
+    retry = Retry(
+        total=retries,
+        connect=retries,
+        read=retries,
+        status=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=RETRY_STATUS,
+        allowed_methods=frozenset({"GET", "HEAD"}),
+        raise_on_status=False,
+        respect_retry_after_header=True,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE, max_retries=retry
+    )
+
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def get_session() -> requests.Session:
+    """The shared session used by every request mvw makes"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = build_session()
+    return _session
+
+
+def get(url: str, **kwargs) -> requests.Response:
+    """`requests.get` through the shared session, with the default timeouts"""
+    kwargs.setdefault("timeout", TIMEOUT)
+    return get_session().get(url, **kwargs)
+
+
+class RateLimiter:
+    """Space the requests of every thread out to `rate` per second, at most `budget` of them"""
+
+    def __init__(self, rate: float, budget: Optional[int] = None) -> None:
+        self.interval = 1 / rate
+        self.budget = budget
+        self.used = 0
+        self.next_slot = 0.0
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Wait for the next slot, raises QuotaExhausted once the budget is spent"""
+        with self.lock:
+            if self.budget is not None and self.used >= self.budget:
+                raise QuotaExhausted(f"The budget of {self.budget} requests is used up")
+            self.used += 1
+            now = time.monotonic()
+            slot = max(now, self.next_slot)
+            self.next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)